@@ -0,0 +1 @@
+# 이 파일은 비어 있어도 됩니다. benchmarks 폴더를 패키지로 만들어줍니다.
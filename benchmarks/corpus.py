@@ -0,0 +1,75 @@
+# benchmarks/corpus.py
+import csv
+import random
+
+# 벤치마크 말뭉치 크기 (줄 수)
+CORPUS_SIZES = (1_000, 10_000, 100_000, 500_000)
+
+_ID_PREFIXES = ("str_", "qstr_", "dlga_", "itm_", "trp_", "party_", "fac_", "ip_", "pt_")
+_PLACES = ("Swadia", "Rhodoks", "Vaegirs", "Nords", "Khergit Khanate", "Sarranid Sultanate",
+           "Praven", "Suno", "Jelkala", "Tihr", "Sargoth", "Reyvadin", "Uxkhal", "Dhirim")
+_SYLLABLES = ("ka", "lor", "dun", "mir", "ath", "vel", "gar", "rhen", "sul", "tor", "ish", "bar")
+_TEMPLATES = (
+    "{s1} has joined your party.",
+    "The lord of {place} asks for {reg3} denars.",
+    "{reg4?She:He} is waiting at the gates of {place}.",
+    "Welcome, {playername}.^What brings you to {place}?",
+    "I have heard rumours of bandits near {place}.",
+    "Your troops in {place} demand {reg0} denars in wages.",
+    "{s0} of {place} has declared war on {s2}!",
+    "Take this sword, {playername}. May it serve you well in {place}.",
+    "We will ride to {place} at dawn.^Prepare the men.",
+    "The merchants of {place} pay well for {term}.",
+    "A {term} from {place}",
+    "Sell your {term} in {place} for a good price.",
+)
+
+
+def make_term(index):
+    """합성 고유명사 (용어집 용어). 같은 index는 항상 같은 이름."""
+    parts = []
+    value = index
+    for _ in range(3):
+        parts.append(_SYLLABLES[value % len(_SYLLABLES)])
+        value //= len(_SYLLABLES)
+    return "".join(parts).capitalize() + (str(value) if value else "")
+
+
+def generate_corpus(line_count, seed=0, duplicate_ratio=0.3, term_count=500):
+    """
+    M&B 번역 파일 형식("ID|텍스트")의 합성 말뭉치를 줄 목록(줄바꿈 포함)으로 만듭니다.
+    태그({s0}, {reg4?She:He}, {playername}, ^), 번역하지 않는 {!} 줄, 빈 본문, 다른 ID로 반복되는 본문을 섞습니다.
+    duplicate_ratio: 이미 나온 본문을 다시 쓰는 비율 (중복 제거/번역 메모리 경로 측정용)
+    """
+    rng = random.Random(seed)
+    bodies = []
+    lines = []
+    for i in range(line_count):
+        roll = rng.random()
+        if roll < 0.01:
+            body = ""
+        elif roll < 0.03:
+            body = "{!}" + f"debug_{i}"
+        elif bodies and roll < 0.03 + duplicate_ratio:
+            body = rng.choice(bodies)
+        else:
+            # 태그와 같은 중괄호 문법이므로 str.format 대신 치환
+            body = (rng.choice(_TEMPLATES).replace("{place}", rng.choice(_PLACES))
+                    .replace("{term}", make_term(rng.randrange(term_count))))
+            if rng.random() < 0.5:
+                body += f" ({i})" # 고유한 본문 (중복 제거되지 않는 줄)
+            bodies.append(body)
+        lines.append(f"{rng.choice(_ID_PREFIXES)}{i}|{body}\n")
+    return lines
+
+
+def generate_glossary_terms(term_count):
+    """(원문 용어, 번역 용어) 목록. 말뭉치의 지명과 합성 용어를 포함합니다."""
+    terms = [(place, f"<{place}>") for place in _PLACES]
+    terms.extend((make_term(i), f"<{make_term(i)}>") for i in range(term_count))
+    return terms
+
+
+def write_glossary_csv(path, terms):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        csv.writer(f).writerows(terms)
@@ -0,0 +1,168 @@
+# benchmarks/fake_backend.py
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+import google.api_core.exceptions as google_exceptions
+
+LATENCY_CONSTANT = "constant"
+LATENCY_UNIFORM = "uniform"
+LATENCY_LOGNORMAL = "lognormal"
+
+_TOKEN_PATTERN = re.compile(r"\[#\d+\]")
+TRANSLATED_PREFIX = "KO "
+
+
+class FakeGeminiBackend:
+    """
+    API 할당량을 쓰지 않고 번역 파이프라인을 측정하기 위한 가짜 Gemini 백엔드.
+    TextProcessor(client_factory=backend.client_factory)로 연결하며, GeminiClient와 같은 메서드를 제공합니다.
+
+    지연 시간: latency(LATENCY_CONSTANT/UNIFORM/LOGNORMAL), latency_median(초), latency_sigma(로그정규 분포의 폭,
+              균등 분포에서는 중앙값 대비 ±비율), tail_rate 확률로 tail_latency(초)만큼 더 걸리는 꼬리 지연.
+    오류 주입: throttle_rate(429 ResourceExhausted), unavailable_rate(503 ServiceUnavailable),
+              max_in_flight(동시 요청이 이 값을 넘으면 429, None이면 제한 없음).
+    응답 형태: misalign_rate(두 줄을 합쳐 줄 수 불일치, JSON 모드는 항목 하나 누락),
+              damage_rate(한 줄의 플레이스홀더 토큰 제거), empty_rate(빈 응답).
+    번역은 원문 줄 앞에 TRANSLATED_PREFIX를 붙이며, prompt_template으로 프롬프트에서 원문 부분을 찾습니다.
+    """
+    def __init__(self, prompt_template, latency=LATENCY_LOGNORMAL, latency_median=0.05, latency_sigma=0.5,
+                 tail_rate=0.0, tail_latency=5.0, throttle_rate=0.0, unavailable_rate=0.0, max_in_flight=None,
+                 misalign_rate=0.0, damage_rate=0.0, empty_rate=0.0, seed=0):
+        prefix, _, suffix = prompt_template.partition("{text_to_translate}")
+        self.prompt_prefix = prefix
+        self.prompt_suffix = suffix
+        self.latency = latency
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.throttle_rate = throttle_rate
+        self.unavailable_rate = unavailable_rate
+        self.max_in_flight = max_in_flight
+        self.misalign_rate = misalign_rate
+        self.damage_rate = damage_rate
+        self.empty_rate = empty_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.stats = {"requests": 0, "throttled": 0, "unavailable": 0, "timeouts": 0,
+                      "misaligned": 0, "damaged": 0, "empty": 0, "max_in_flight_seen": 0}
+
+    def client_factory(self, api_key):
+        return FakeGeminiClient(self)
+
+    def _sample_latency(self):
+        if self.latency == LATENCY_CONSTANT:
+            latency = self.latency_median
+        elif self.latency == LATENCY_UNIFORM:
+            spread = self.latency_median * self.latency_sigma
+            latency = self._random.uniform(self.latency_median - spread, self.latency_median + spread)
+        else:
+            latency = self._random.lognormvariate(math.log(self.latency_median), self.latency_sigma)
+        if self.tail_rate and self._random.random() < self.tail_rate:
+            latency += self.tail_latency
+        return max(0.0, latency)
+
+    def _begin_request(self, request_options):
+        """요청 하나의 (지연 시간, 주입할 예외 또는 None, 응답 변형 종류)를 정하고 진행 중 요청 수를 늘립니다."""
+        with self._lock:
+            self.stats["requests"] += 1
+            self._in_flight += 1
+            self.stats["max_in_flight_seen"] = max(self.stats["max_in_flight_seen"], self._in_flight)
+            latency = self._sample_latency()
+            roll = self._random.random()
+            error = None
+            if self.max_in_flight is not None and self._in_flight > self.max_in_flight:
+                self.stats["throttled"] += 1
+                error = google_exceptions.ResourceExhausted("fake backend: too many concurrent requests")
+                latency = min(latency, self.latency_median)
+            elif roll < self.throttle_rate:
+                self.stats["throttled"] += 1
+                error = google_exceptions.ResourceExhausted("fake backend: quota exceeded")
+            elif roll < self.throttle_rate + self.unavailable_rate:
+                self.stats["unavailable"] += 1
+                error = google_exceptions.ServiceUnavailable("fake backend: model overloaded")
+            timeout = (request_options or {}).get("timeout")
+            if error is None and timeout and latency > timeout:
+                self.stats["timeouts"] += 1
+                error = google_exceptions.DeadlineExceeded("fake backend: deadline exceeded")
+                latency = timeout
+            shape = self._random.random()
+            if shape < self.empty_rate:
+                shape = "empty"
+            elif shape < self.empty_rate + self.misalign_rate:
+                shape = "misaligned"
+            elif shape < self.empty_rate + self.misalign_rate + self.damage_rate:
+                shape = "damaged"
+            else:
+                shape = None
+            if error is None and shape:
+                self.stats[shape] += 1
+            return latency, error, shape
+
+    def _end_request(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def _respond(self, prompt, shape):
+        start = prompt.find(self.prompt_prefix)
+        payload = prompt[start + len(self.prompt_prefix):len(prompt) - len(self.prompt_suffix)] if start != -1 else prompt
+        if shape == "empty":
+            text = ""
+        elif payload.startswith("[{"): # JSON 요청 모드
+            items = [{"id": item["id"], "text": TRANSLATED_PREFIX + item["text"]} for item in json.loads(payload)]
+            if shape == "misaligned" and len(items) > 1:
+                del items[len(items) // 2]
+            elif shape == "damaged" and items:
+                items[0]["text"] = _TOKEN_PATTERN.sub("", items[0]["text"], count=1)
+            text = json.dumps(items, ensure_ascii=False)
+        else:
+            lines = [TRANSLATED_PREFIX + line for line in payload.split("\n")]
+            if shape == "misaligned" and len(lines) > 1:
+                middle = len(lines) // 2
+                lines[middle - 1:middle + 1] = [lines[middle - 1] + " " + lines[middle]]
+            elif shape == "damaged":
+                for i, line in enumerate(lines):
+                    damaged = _TOKEN_PATTERN.sub("", line, count=1)
+                    if damaged != line:
+                        lines[i] = damaged
+                        break
+            text = "\n".join(lines)
+        usage = SimpleNamespace(prompt_token_count=max(1, len(prompt) // 4),
+                                candidates_token_count=len(text) // 4)
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+
+class FakeGeminiClient:
+    """GeminiClient 대체. 모든 워커가 공유하는 FakeGeminiBackend로 요청을 보냅니다."""
+    def __init__(self, backend):
+        self.backend = backend
+
+    def generate_content(self, model_name, prompt, request_options=None, **kwargs):
+        latency, error, shape = self.backend._begin_request(request_options)
+        try:
+            time.sleep(latency)
+            if error is not None:
+                raise error
+            return self.backend._respond(prompt, shape)
+        finally:
+            self.backend._end_request()
+
+    async def generate_content_async(self, model_name, prompt, request_options=None, **kwargs):
+        latency, error, shape = self.backend._begin_request(request_options)
+        try:
+            await asyncio.sleep(latency)
+            if error is not None:
+                raise error
+            return self.backend._respond(prompt, shape)
+        finally:
+            self.backend._end_request()
+
+    def close(self):
+        pass
@@ -0,0 +1,210 @@
+# benchmarks/run_benchmarks.py
+"""
+API 할당량 없이 번역 파이프라인(청크 분할, 동시 요청, 재시도, 검증, 용어집)의 처리량을 측정합니다.
+
+    python -m benchmarks.run_benchmarks [--scenario baseline --scenario throttled] [--sizes 1000,10000,100000,500000]
+
+가짜 Gemini 백엔드(benchmarks.fake_backend)로 TextProcessor.translate_by_chunks를 실행하고,
+번역 결과에 GlossaryManager.apply_glossary_to_text를 적용하는 시간을 따로 잽니다.
+결과는 user_data/benchmarks/history.jsonl에 한 줄씩 쌓이며, 같은 시나리오/크기/엔진의 직전 결과와 비교합니다.
+종료 코드: 0 정상, 1 처리량이 --regression-threshold 이상 떨어진 실행이 있음
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+
+from core.config_manager import USER_DATA_DIR, ENGINE_THREADS, ENGINE_ASYNCIO, REQUEST_FORMAT_JSON
+from core.translator import TextProcessor, MSG_TYPE_ERROR
+from core.glossary_manager import GlossaryManager
+from core.prompt_manager import PromptManager
+from core.job_metrics import JobMetrics
+from benchmarks.corpus import CORPUS_SIZES, generate_corpus, generate_glossary_terms, write_glossary_csv
+from benchmarks.fake_backend import FakeGeminiBackend
+
+HISTORY_PATH = os.path.join(USER_DATA_DIR, "benchmarks", "history.jsonl")
+DEFAULT_SIZES = (1_000, 10_000)
+DEFAULT_GLOSSARY_TERMS = 2_000
+DEFAULT_REGRESSION_THRESHOLD = 0.2 # 직전 결과 대비 처리량(줄/초)이 이 비율 이상 떨어지면 회귀로 봄
+
+# 시나리오: 가짜 백엔드 설정과 translate_by_chunks 추가 인자
+SCENARIOS = {
+    "baseline": {"backend": {}, "translate": {}},
+    "throttled": {"backend": {"throttle_rate": 0.02, "unavailable_rate": 0.01, "max_in_flight": 8}, "translate": {}},
+    "tail": {"backend": {"tail_rate": 0.01, "tail_latency": 3.0}, "translate": {}},
+    "messy": {"backend": {"misalign_rate": 0.05, "damage_rate": 0.02, "empty_rate": 0.005}, "translate": {}},
+    "json": {"backend": {"misalign_rate": 0.05}, "translate": {"request_format": REQUEST_FORMAT_JSON}},
+}
+
+
+class BenchmarkReporter:
+    """put_message_in_queue 인터페이스 구현. 오류 수만 세고, verbose이면 메시지를 출력합니다."""
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+        self.error_count = 0
+        self._lock = threading.Lock()
+
+    def put_message_in_queue(self, msg_type, data=None):
+        with self._lock:
+            if msg_type == MSG_TYPE_ERROR:
+                self.error_count += 1
+            if self.verbose:
+                print(f"  [{msg_type}] {data}", file=sys.stderr)
+
+
+def run_scenario(scenario_name, line_count, engine, glossary_terms=DEFAULT_GLOSSARY_TERMS, latency_scale=1.0,
+                 seed=0, verbose=False):
+    """시나리오 하나를 실행하고 결과 기록(딕셔너리)을 반환합니다."""
+    scenario = SCENARIOS[scenario_name]
+    prompt_manager = PromptManager()
+    prompt_template = prompt_manager.get_prompt_template_by_id(prompt_manager.get_default_prompt_id())
+    backend_options = dict(scenario["backend"])
+    backend_options["latency_median"] = backend_options.get("latency_median", 0.05) * latency_scale
+    backend_options["tail_latency"] = backend_options.get("tail_latency", 5.0) * latency_scale
+    backend = FakeGeminiBackend(prompt_template, seed=seed, **backend_options)
+    reporter = BenchmarkReporter(verbose)
+
+    # 동시성 컨트롤러/리미터는 모델 ID별로 프로세스 전체에서 공유되므로 실행마다 다른 ID를 사용
+    model_id = f"bench-{scenario_name}-{engine}-{line_count}-{time.monotonic_ns()}"
+    lines = generate_corpus(line_count, seed=seed)
+    text_processor = TextProcessor(reporter, client_factory=backend.client_factory)
+    metrics = JobMetrics(label=scenario_name)
+    translated = text_processor.translate_by_chunks(
+        lines, "benchmark",
+        prompt_template=prompt_template,
+        model_name_override=model_id,
+        rate_limit_overrides={model_id: {"rpm": None, "tpm": None}},
+        engine=engine,
+        metrics=metrics,
+        **scenario["translate"]
+    )
+
+    glossary_seconds = glossary_compile_seconds = None
+    if translated and translated != "CANCELLED_BY_TRANSLATOR" and glossary_terms:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            glossary_path = os.path.join(temp_dir, "benchmark_glossary.csv")
+            write_glossary_csv(glossary_path, generate_glossary_terms(glossary_terms))
+            glossary_manager = GlossaryManager(reporter, cache_path=None)
+            glossary_manager.set_active_glossary_files([glossary_path])
+            started_at = time.perf_counter()
+            glossary_manager.get_compiled_matcher()
+            glossary_compile_seconds = time.perf_counter() - started_at
+            started_at = time.perf_counter()
+            glossary_manager.apply_glossary_to_text(translated)
+            glossary_seconds = time.perf_counter() - started_at
+        metrics.add_stage_time("glossary", glossary_seconds)
+
+    summary = metrics.summary()
+    return {
+        "time": int(time.time()),
+        "scenario": scenario_name,
+        "lines": line_count,
+        "engine": engine,
+        "status": summary["status"],
+        "python": platform.python_version(),
+        "wall_seconds": summary["wall_seconds"],
+        "lines_per_second": summary["lines_per_second"],
+        "chunks": summary["chunks"],
+        "retries": summary["retries"],
+        "errors": reporter.error_count,
+        "api_latency": summary["api_latency"],
+        "queue_wait": summary["queue_wait"],
+        "postprocess": summary["postprocess"],
+        "glossary_terms": glossary_terms,
+        "glossary_compile_seconds": round(glossary_compile_seconds, 4) if glossary_compile_seconds is not None else None,
+        "glossary_seconds": round(glossary_seconds, 4) if glossary_seconds is not None else None,
+        "glossary_lines_per_second": round(line_count / glossary_seconds, 1) if glossary_seconds else None,
+        "backend": dict(backend.stats),
+    }
+
+
+def load_history(path):
+    if not path or not os.path.exists(path):
+        return []
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue # 기록 중 중단된 줄은 무시
+    return records
+
+
+def previous_record(history, record):
+    """같은 시나리오/크기/엔진의 가장 최근 기록."""
+    for old in reversed(history):
+        if (old.get("scenario"), old.get("lines"), old.get("engine")) == (record["scenario"], record["lines"], record["engine"]):
+            return old
+    return None
+
+
+def append_history(path, record):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def format_record(record, previous=None):
+    api = record["api_latency"]
+    text = (f"{record['scenario']:<10} {record['engine']:<8} {record['lines']:>7}줄  "
+            f"{record['wall_seconds']:>8.2f}초  {record['lines_per_second'] or 0:>9.1f}줄/초  "
+            f"청크 {record['chunks']:>5}  재시도 {record['retries']:>4}  "
+            f"API p50/p95/p99 {api['p50'] or 0:.3f}/{api['p95'] or 0:.3f}/{api['p99'] or 0:.3f}초")
+    if record["glossary_seconds"] is not None:
+        text += f"  용어집 {record['glossary_seconds']:.3f}초"
+    if previous and previous.get("lines_per_second") and record["lines_per_second"]:
+        change = record["lines_per_second"] / previous["lines_per_second"] - 1
+        text += f"  (직전 대비 {change:+.1%})"
+    return text
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="가짜 Gemini 백엔드로 번역 파이프라인 처리량 측정")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="실행할 시나리오 (여러 번 지정 가능, 기본: baseline)")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help=f"말뭉치 줄 수 목록 (쉼표 구분, 전체: {','.join(str(size) for size in CORPUS_SIZES)})")
+    parser.add_argument("--engine", action="append", choices=[ENGINE_THREADS, ENGINE_ASYNCIO],
+                        help="번역 실행 엔진 (여러 번 지정 가능, 기본: threads)")
+    parser.add_argument("--glossary-terms", type=int, default=DEFAULT_GLOSSARY_TERMS, help="합성 용어집 용어 수 (0이면 생략)")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="가짜 백엔드 지연 시간 배율")
+    parser.add_argument("--seed", type=int, default=0, help="말뭉치/백엔드 난수 시드")
+    parser.add_argument("--history", default=HISTORY_PATH, help="결과 기록 파일 (JSON 줄)")
+    parser.add_argument("--no-history", action="store_true", help="결과를 기록하지 않음")
+    parser.add_argument("--regression-threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="직전 결과 대비 처리량 감소가 이 비율 이상이면 종료 코드 1")
+    parser.add_argument("--verbose", action="store_true", help="번역기 상태 메시지 출력")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    history = load_history(args.history)
+    regressions = []
+    for scenario_name in args.scenario or ["baseline"]:
+        for engine in args.engine or [ENGINE_THREADS]:
+            for line_count in sizes:
+                record = run_scenario(scenario_name, line_count, engine, args.glossary_terms,
+                                      args.latency_scale, args.seed, args.verbose)
+                previous = previous_record(history, record)
+                print(format_record(record, previous), flush=True)
+                if (previous and previous.get("lines_per_second") and record["lines_per_second"] and
+                        record["lines_per_second"] < previous["lines_per_second"] * (1 - args.regression_threshold)):
+                    regressions.append(record)
+                if not args.no_history:
+                    append_history(args.history, record)
+                history.append(record)
+    if regressions:
+        print(f"처리량 회귀 {len(regressions)}건 (기준: 직전 대비 -{args.regression_threshold:.0%})", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
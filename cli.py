@@ -0,0 +1,294 @@
+# cli.py
+"""
+GUI 없이 폴더 단위로 번역하는 명령줄 도구.
+
+    python cli.py <입력 폴더> [-o 출력 폴더] [--model 모델 ID] [--glossary 용어집.csv ...]
+
+폴더 안의 .csv/.txt 파일을 모두 읽어 하나의 작업으로 번역합니다 (파일 간 청크 대기열 공유).
+진행 상황은 한 줄에 하나씩 JSON으로 표준 출력에 기록됩니다.
+종료 코드: 0 성공, 1 일부 청크/파일 오류(원문 유지), 2 설정 오류 또는 번역 중단, 130 사용자 취소
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+from core.config_manager import (
+    load_config, USER_DATA_DIR, DEFAULT_MODEL_ID, AVAILABLE_MODELS, DEFAULT_CHUNK_SIZE,
+    API_KEY_NAME_IN_CONFIG, CHUNK_SIZE_NAME_IN_CONFIG, SELECTED_PROMPT_ID_NAME_IN_CONFIG,
+    ACTIVE_GLOSSARY_FILES_NAME_IN_CONFIG, SELECTED_MODEL_ID_NAME_IN_CONFIG,
+    TRANSLATION_MEMORY_ENABLED_NAME_IN_CONFIG, TRANSLATION_MEMORY_MAX_ENTRIES_NAME_IN_CONFIG,
+    DEFAULT_TRANSLATION_MEMORY_MAX_ENTRIES, CHUNK_MODE_NAME_IN_CONFIG, CHUNK_TOKEN_BUDGET_NAME_IN_CONFIG,
+    MODEL_RATE_LIMITS_NAME_IN_CONFIG, TRANSLATION_ENGINE_NAME_IN_CONFIG, REQUEST_FORMAT_NAME_IN_CONFIG,
+    REQUEST_TIMEOUT_NAME_IN_CONFIG, HEDGE_BUDGET_NAME_IN_CONFIG, DEFAULT_REQUEST_TIMEOUT, DEFAULT_HEDGE_BUDGET,
+    MODEL_FALLBACK_CHAINS_NAME_IN_CONFIG, PROFILING_NAME_IN_CONFIG,
+    CHUNK_MODE_TOKENS, CHUNK_MODE_LINES, DEFAULT_CHUNK_MODE,
+    ENGINE_THREADS, ENGINE_ASYNCIO, DEFAULT_TRANSLATION_ENGINE,
+    REQUEST_FORMAT_TEXT, REQUEST_FORMAT_JSON, DEFAULT_REQUEST_FORMAT
+)
+from core.translator import TextProcessor, MSG_TYPE_PROGRESS, MSG_TYPE_ERROR, MSG_TYPE_CONCURRENCY
+from core.glossary_manager import GlossaryManager
+from core.prompt_manager import PromptManager
+from core.file_handler import FileHandler
+from core.translation_memory import TranslationMemory
+from core.job_journal import JobJournal
+from core.job_metrics import JobMetrics
+from core.profiler import get_profiler, configure_profiler
+
+EXIT_OK = 0
+EXIT_PARTIAL = 1    # 일부 청크/파일 오류 (해당 부분은 원문 유지)
+EXIT_FAILED = 2     # 설정 오류 또는 API 키/권한 문제 등으로 번역 중단
+EXIT_CANCELLED = 130
+
+SUPPORTED_EXTENSIONS = (".csv", ".txt")
+API_KEY_ENV_NAME = "GEMINI_API_KEY"
+
+
+class JsonProgressReporter:
+    """
+    TextProcessor/GlossaryManager/FileHandler가 사용하는 put_message_in_queue 인터페이스 구현.
+    메시지를 JSON 한 줄로 바로 출력하고 오류 수를 셉니다. (여러 워커 스레드에서 호출됨)
+    """
+    def __init__(self, stream=None, show_concurrency=False):
+        self.stream = stream or sys.stdout
+        self.show_concurrency = show_concurrency
+        self.error_count = 0
+        self._lock = threading.Lock()
+
+    def put_message_in_queue(self, msg_type, data=None):
+        if msg_type == MSG_TYPE_CONCURRENCY and not self.show_concurrency:
+            return
+        event = {"type": msg_type}
+        if msg_type == MSG_TYPE_PROGRESS and isinstance(data, tuple):
+            event["done"], event["total"] = data
+        elif msg_type == MSG_TYPE_CONCURRENCY:
+            event["limit"], event["in_flight"] = data
+        else:
+            event["message"] = data
+        with self._lock:
+            if msg_type == MSG_TYPE_ERROR:
+                self.error_count += 1
+        self.emit(event)
+
+    def emit(self, event):
+        event.setdefault("time", round(time.time(), 3))
+        with self._lock:
+            self.stream.write(json.dumps(event, ensure_ascii=False) + "\n")
+            self.stream.flush()
+
+
+def find_input_files(input_dir, recursive=False):
+    """입력 폴더에서 번역 대상 파일 경로 목록을 정렬하여 반환합니다."""
+    found = []
+    if recursive:
+        for root, _dirs, files in os.walk(input_dir):
+            found.extend(os.path.join(root, name) for name in files)
+    else:
+        found = [os.path.join(input_dir, name) for name in os.listdir(input_dir)]
+    return sorted(path for path in found
+                  if os.path.isfile(path) and path.lower().endswith(SUPPORTED_EXTENSIONS))
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="M&B 번역 파일 폴더를 GUI 없이 일괄 번역합니다.")
+    parser.add_argument("input_dir", help="번역할 .csv/.txt 파일이 있는 폴더")
+    parser.add_argument("-o", "--output-dir", help="번역 결과를 저장할 폴더 (기본: <입력 폴더>_translated)")
+    parser.add_argument("--api-key", help=f"Gemini API 키 (기본: 환경 변수 {API_KEY_ENV_NAME} 또는 설정 파일)")
+    parser.add_argument("--model", help=f"모델 ID ({', '.join(AVAILABLE_MODELS)})")
+    parser.add_argument("--prompt-id", help="프롬프트 ID (data/default_prompts.json)")
+    parser.add_argument("--glossary", action="append", help="용어집 CSV (여러 번 지정 가능, 기본: 설정 파일의 활성 용어집)")
+    parser.add_argument("--chunk-mode", choices=[CHUNK_MODE_TOKENS, CHUNK_MODE_LINES], help="청크 분할 방식")
+    parser.add_argument("--chunk-size", type=int, help="줄 수 기준 모드의 청크당 줄 수")
+    parser.add_argument("--token-budget", type=int, help="토큰 기준 모드의 청크당 토큰 예산")
+    parser.add_argument("--engine", choices=[ENGINE_THREADS, ENGINE_ASYNCIO], help="번역 실행 엔진")
+    parser.add_argument("--request-format", choices=[REQUEST_FORMAT_TEXT, REQUEST_FORMAT_JSON],
+                        help="청크 요청 형식 (json: {id, text} 배열로 보내고 줄 단위로 결과 매핑)")
+    parser.add_argument("--request-timeout", type=float, help="요청 하나의 제한 시간(초)")
+    parser.add_argument("--hedge-budget", type=float,
+                        help="느린 마지막 청크에 보낼 중복 요청 예산 (전체 청크 수 대비 비율, 0이면 사용 안 함)")
+    parser.add_argument("--no-model-fallback", action="store_true",
+                        help="재시도를 소진한 청크를 다음 모델로 다시 보내지 않음 (원본 사용)")
+    parser.add_argument("--metrics-report",
+                        help="작업 통계 보고서 경로 (.json 또는 .csv, 기본: user_data/reports/job_<시각>.json)")
+    parser.add_argument("--profile",
+                        help="단계별 프로파일링 (예: spans, spans,cprofile,tracemalloc). 기본: 환경 변수 MNB_PROFILE 또는 설정 파일")
+    parser.add_argument("--recursive", action="store_true", help="하위 폴더까지 포함")
+    parser.add_argument("--overwrite", action="store_true", help="이미 있는 출력 파일도 다시 번역")
+    parser.add_argument("--no-translation-memory", action="store_true", help="번역 메모리 사용 안 함")
+    parser.add_argument("--show-concurrency", action="store_true", help="동시 요청 한도 변경도 출력")
+    return parser
+
+
+def run_batch(args, reporter):
+    config = load_config()
+    profiler = configure_profiler(config.get(PROFILING_NAME_IN_CONFIG))
+    if args.profile:
+        profiler.configure(args.profile)
+    api_key = args.api_key or os.environ.get(API_KEY_ENV_NAME) or config.get(API_KEY_NAME_IN_CONFIG)
+    if not api_key:
+        reporter.put_message_in_queue(MSG_TYPE_ERROR, f"API 키가 없습니다. --api-key 또는 환경 변수 {API_KEY_ENV_NAME}를 지정하세요.")
+        return EXIT_FAILED
+    if not os.path.isdir(args.input_dir):
+        reporter.put_message_in_queue(MSG_TYPE_ERROR, f"입력 폴더를 찾을 수 없습니다: {args.input_dir}")
+        return EXIT_FAILED
+    if args.model and args.model not in AVAILABLE_MODELS: # 오타를 청크마다의 API 실패로 알게 되지 않도록 미리 확인
+        reporter.put_message_in_queue(
+            MSG_TYPE_ERROR, f"알 수 없는 모델 ID입니다: {args.model} (사용 가능: {', '.join(AVAILABLE_MODELS)})")
+        return EXIT_FAILED
+
+    input_dir = os.path.abspath(args.input_dir)
+    output_dir = os.path.abspath(args.output_dir or input_dir.rstrip(os.sep) + "_translated")
+    model_id = args.model or config.get(SELECTED_MODEL_ID_NAME_IN_CONFIG, DEFAULT_MODEL_ID)
+
+    prompt_manager = PromptManager()
+    prompt_id = args.prompt_id or config.get(SELECTED_PROMPT_ID_NAME_IN_CONFIG) or prompt_manager.get_default_prompt_id()
+    prompt_template = prompt_manager.get_prompt_template_by_id(prompt_id)
+
+    glossary_manager = GlossaryManager(reporter)
+    glossary_manager.set_active_glossary_files(args.glossary or config.get(ACTIVE_GLOSSARY_FILES_NAME_IN_CONFIG, []))
+
+    text_processor = TextProcessor(reporter)
+    if not args.no_translation_memory and config.get(TRANSLATION_MEMORY_ENABLED_NAME_IN_CONFIG, True):
+        text_processor.translation_memory = TranslationMemory(
+            max_entries=config.get(TRANSLATION_MEMORY_MAX_ENTRIES_NAME_IN_CONFIG, DEFAULT_TRANSLATION_MEMORY_MAX_ENTRIES)
+        )
+    file_handler = FileHandler(reporter)
+
+    # 입력 파일 읽기 (이미 번역된 출력이 있으면 건너뜀)
+    files = []
+    for path in find_input_files(input_dir, args.recursive):
+        relative_path = os.path.relpath(path, input_dir)
+        output_path = os.path.join(output_dir, relative_path)
+        if os.path.exists(output_path) and not args.overwrite:
+            reporter.emit({"type": "file_skipped", "file": relative_path, "reason": "output_exists"})
+            continue
+        _fp, content, _is_csv = file_handler.load_file_core(None, path)
+        if content is None:
+            continue # 오류는 FileHandler가 보고함
+        files.append((relative_path, output_path, content))
+    if not files:
+        reporter.emit({"type": "summary", "files": 0, "message": "번역할 파일이 없습니다."})
+        return EXIT_PARTIAL if reporter.error_count else EXIT_OK
+
+    texts = [content for _rel, _out, content in files]
+    reporter.emit({"type": "batch_start", "files": len(files), "lines": sum(len(t.splitlines()) for t in texts),
+                   "model": model_id, "output_dir": output_dir})
+
+    # 같은 파일 묶음/모델/프롬프트로 중단된 작업이 있으면 자동으로 이어서 번역
+    journal = JobJournal(JobJournal.job_id_for("\x00".join(texts), model_id, prompt_template))
+    if journal.exists():
+        reporter.emit({"type": "resume", "journal": journal.path})
+
+    cancel_event = threading.Event()
+    outcome = {}
+    metrics = JobMetrics(label=input_dir)
+
+    def _translate():
+        try:
+            with profiler.capture("translate"):
+                outcome["result"] = text_processor.translate_texts(
+                    texts, api_key,
+                    chunk_size_lines=args.chunk_size or config.get(CHUNK_SIZE_NAME_IN_CONFIG, DEFAULT_CHUNK_SIZE),
+                    cancel_event=cancel_event,
+                    prompt_template=prompt_template,
+                    model_name_override=model_id,
+                    chunk_mode=args.chunk_mode or config.get(CHUNK_MODE_NAME_IN_CONFIG, DEFAULT_CHUNK_MODE),
+                    token_budget=args.token_budget or config.get(CHUNK_TOKEN_BUDGET_NAME_IN_CONFIG),
+                    rate_limit_overrides=config.get(MODEL_RATE_LIMITS_NAME_IN_CONFIG),
+                    engine=args.engine or config.get(TRANSLATION_ENGINE_NAME_IN_CONFIG, DEFAULT_TRANSLATION_ENGINE),
+                    request_format=args.request_format or config.get(REQUEST_FORMAT_NAME_IN_CONFIG, DEFAULT_REQUEST_FORMAT),
+                    request_timeout=args.request_timeout or config.get(REQUEST_TIMEOUT_NAME_IN_CONFIG, DEFAULT_REQUEST_TIMEOUT),
+                    hedge_budget=args.hedge_budget if args.hedge_budget is not None else config.get(HEDGE_BUDGET_NAME_IN_CONFIG, DEFAULT_HEDGE_BUDGET),
+                    model_fallback_overrides={model_id: []} if args.no_model_fallback else config.get(MODEL_FALLBACK_CHAINS_NAME_IN_CONFIG),
+                    journal=journal,
+                    metrics=metrics
+                )
+        except Exception as e:
+            reporter.put_message_in_queue(MSG_TYPE_ERROR, f"번역 중 예외 발생: {e}")
+            outcome["result"] = None
+
+    started_at = time.monotonic()
+    worker = threading.Thread(target=_translate, daemon=True)
+    worker.start()
+    try:
+        while worker.is_alive():
+            worker.join(0.5)
+    except KeyboardInterrupt: # Ctrl+C: 취소 후 진행 중인 요청이 정리될 때까지 대기 (완료분은 작업 기록에 남음)
+        cancel_event.set()
+        reporter.emit({"type": "cancelling"})
+        worker.join()
+    finally:
+        if text_processor.translation_memory is not None:
+            text_processor.translation_memory.close()
+
+    results = outcome.get("result")
+    if cancel_event.is_set() or results == "CANCELLED_BY_TRANSLATOR":
+        emit_job_metrics(metrics, args.metrics_report, reporter)
+        emit_profile(reporter)
+        reporter.emit({"type": "summary", "status": "cancelled", "elapsed": round(time.monotonic() - started_at, 2)})
+        return EXIT_CANCELLED
+    if results is None:
+        emit_job_metrics(metrics, args.metrics_report, reporter)
+        emit_profile(reporter)
+        reporter.emit({"type": "summary", "status": "failed", "elapsed": round(time.monotonic() - started_at, 2)})
+        return EXIT_FAILED
+
+    saved_count = 0
+    for (relative_path, output_path, _content), translated in zip(files, results):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        glossary_started = time.monotonic()
+        translated = glossary_manager.apply_glossary_to_text(translated)
+        metrics.add_stage_time("glossary", time.monotonic() - glossary_started)
+        if not translated: # 빈 파일은 FileHandler.save_file이 저장하지 않으므로 그대로 만듦
+            open(output_path, "w", encoding="utf-8").close()
+            saved_count += 1
+            continue
+        if file_handler.save_file(translated, os.path.basename(output_path), output_path):
+            saved_count += 1
+            reporter.emit({"type": "file_done", "file": relative_path, "output": output_path})
+
+    exit_code = EXIT_PARTIAL if reporter.error_count or saved_count < len(files) else EXIT_OK
+    emit_job_metrics(metrics, args.metrics_report, reporter)
+    emit_profile(reporter)
+    reporter.emit({"type": "summary", "status": "completed", "files": saved_count, "errors": reporter.error_count,
+                   "elapsed": round(time.monotonic() - started_at, 2), "exit_code": exit_code})
+    return exit_code
+
+
+def emit_job_metrics(metrics, report_path, reporter):
+    """작업 통계 요약을 metrics 이벤트로 출력하고 보고서를 저장합니다."""
+    event = {"type": "metrics", "summary": metrics.summary()}
+    try:
+        event["report"] = metrics.write_report(report_path)
+    except OSError as e:
+        reporter.put_message_in_queue(MSG_TYPE_ERROR, f"작업 통계 보고서 저장 실패: {e}")
+    reporter.emit(event)
+
+
+def emit_profile(reporter):
+    """프로파일링이 켜져 있으면 구간별 집계를 profile 이벤트로 출력하고 보고서를 저장합니다."""
+    profiler = get_profiler()
+    if not profiler.enabled:
+        return
+    event = {"type": "profile", "spans": [
+        {"name": name, "count": count, "total_seconds": round(total, 4), "max_seconds": round(longest, 4)}
+        for name, count, total, longest in profiler.snapshot()
+    ]}
+    try:
+        event["report"] = profiler.write_report("cli")
+    except OSError as e:
+        reporter.put_message_in_queue(MSG_TYPE_ERROR, f"프로파일 보고서 저장 실패: {e}")
+    reporter.emit(event)
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    os.makedirs(USER_DATA_DIR, exist_ok=True)
+    reporter = JsonProgressReporter(show_concurrency=args.show_concurrency)
+    return run_batch(args, reporter)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
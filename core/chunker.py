@@ -0,0 +1,71 @@
+# core/chunker.py
+import math
+import threading
+
+DEFAULT_CHARS_PER_TOKEN = 4.0 # 보정 전 기본값 (영어 기준 대략 4자 = 1토큰)
+MIN_CHARS_PER_TOKEN = 1.0
+MAX_CHARS_PER_TOKEN = 8.0
+CALIBRATION_WEIGHT = 0.2 # 새 관측값 반영 비율 (지수 이동 평균)
+
+
+class TokenEstimator:
+    """
+    문자 수 기반 토큰 수 추정기.
+    API 응답의 usage_metadata(prompt_token_count)로 모델별 '토큰당 문자 수'를 보정합니다.
+    여러 워커 스레드에서 observe를 호출하므로 잠금으로 보호합니다.
+    """
+    def __init__(self, default_chars_per_token=DEFAULT_CHARS_PER_TOKEN):
+        self.default_chars_per_token = default_chars_per_token
+        self._chars_per_token = {} # {model_id: 보정된 토큰당 문자 수}
+        self._lock = threading.Lock()
+
+    def chars_per_token(self, model_id=None):
+        return self._chars_per_token.get(model_id, self.default_chars_per_token)
+
+    def estimate(self, text, model_id=None):
+        if not text:
+            return 0
+        return int(math.ceil(len(text) / self.chars_per_token(model_id)))
+
+    def observe(self, model_id, char_count, token_count):
+        """실제 요청의 문자 수와 API가 보고한 토큰 수로 추정치를 보정합니다."""
+        if not char_count or not token_count or token_count <= 0:
+            return
+        observed = min(MAX_CHARS_PER_TOKEN, max(MIN_CHARS_PER_TOKEN, char_count / token_count))
+        with self._lock:
+            current = self._chars_per_token.get(model_id)
+            if current is None:
+                self._chars_per_token[model_id] = observed
+            else:
+                self._chars_per_token[model_id] = current + CALIBRATION_WEIGHT * (observed - current)
+
+
+def chunk_by_line_count(item_ids, chunk_size_lines):
+    """고정 줄 수 단위로 나눕니다 (기존 방식, 대체 모드)."""
+    chunk_size_lines = max(1, int(chunk_size_lines))
+    return [item_ids[i:i + chunk_size_lines] for i in range(0, len(item_ids), chunk_size_lines)]
+
+
+def chunk_by_token_budget(item_ids, texts, token_budget, estimator, model_id=None, max_lines=None):
+    """
+    추정 토큰 수가 token_budget을 넘지 않도록 줄을 채워 넣습니다.
+    한 줄은 절대 나누지 않으며, 예산보다 큰 줄은 단독 청크가 됩니다.
+    texts: item_id -> 줄 텍스트 (리스트 또는 딕셔너리)
+    max_lines: 청크당 최대 줄 수 (짧은 줄이 아주 많이 묶이는 것을 방지, None이면 제한 없음)
+    """
+    chunks = []
+    current = []
+    current_tokens = 0
+    for item_id in item_ids:
+        line_tokens = estimator.estimate(texts[item_id], model_id) + 1 # 줄바꿈 몫
+        over_budget = current and current_tokens + line_tokens > token_budget
+        over_lines = max_lines is not None and len(current) >= max_lines
+        if over_budget or over_lines:
+            chunks.append(current)
+            current = []
+            current_tokens = 0
+        current.append(item_id)
+        current_tokens += line_tokens
+    if current:
+        chunks.append(current)
+    return chunks
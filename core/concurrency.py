@@ -0,0 +1,129 @@
+# core/concurrency.py
+import threading
+import time
+
+# AIMD (가산 증가 / 승법 감소) 파라미터
+DECREASE_FACTOR = 0.5        # 429/503 발생 시 한도에 곱하는 값
+DECREASE_COOLDOWN = 2.0      # 같은 혼잡 구간에서 연속으로 줄이지 않도록 하는 최소 간격 (초)
+LATENCY_TOLERANCE = 2.5      # 최소 관측 지연의 이 배수를 넘으면 '느려짐'으로 보고 한도를 늘리지 않음
+LATENCY_EMA_WEIGHT = 0.2
+# 지연 시간은 요청 크기(입력+출력 토큰)로 나눈 값으로 비교. 작은 요청(한 줄 작업, 재번역 하위 청크,
+# JSON 누락 ID 재요청)이 기준값을 낮추지 않도록 이 토큰 수보다 작은 요청은 이 크기로 봄
+LATENCY_MIN_TOKENS = 500
+# 최소 지연 기준값이 성공마다 현재 평균 쪽으로 이 비율만큼 올라감 (한 번 낮아진 기준값에 영원히 묶이지 않도록)
+BASELINE_RECOVERY_WEIGHT = 0.02
+
+OUTCOME_SUCCESS = "success"
+OUTCOME_THROTTLED = "throttled" # 429 / 503: 한도 감소
+OUTCOME_ERROR = "error"         # 그 외 오류: 한도 유지
+
+
+class AdaptiveConcurrencyController:
+    """
+    동시 진행 중인 API 요청 수를 AIMD 방식으로 조절합니다.
+    - 지연 시간이 안정적이고 성공이 이어지면 한 '라운드'(현재 한도만큼의 성공)마다 한도 +1
+      (지연 시간은 토큰당 값으로 비교하며, 최소 기준값은 천천히 현재 평균 쪽으로 회복됨)
+    - 429/503 이 오면 한도를 절반으로 (쿨다운 내 중복 감소 없음)
+    워커는 요청 직전에 acquire(), 응답(또는 오류) 직후 release()를 호출합니다.
+    """
+    def __init__(self, initial_limit, min_limit=1, max_limit=16):
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self._limit = float(min(self.max_limit, max(self.min_limit, int(initial_limit))))
+        self._in_flight = 0
+        self._success_streak = 0
+        self._last_decrease = 0.0
+        self._latency_ema = None
+        self._min_latency_ema = None
+        self._cond = threading.Condition()
+        self.on_change = None # 한도가 바뀔 때 호출되는 콜백 (limit, in_flight)
+
+    @property
+    def limit(self):
+        return int(self._limit)
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def acquire(self, cancel_event=None, poll_interval=0.2):
+        """슬롯이 생길 때까지 대기합니다. 취소되면 False를 반환합니다."""
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                if cancel_event and cancel_event.is_set():
+                    return False
+                self._cond.wait(poll_interval)
+            self._in_flight += 1
+            return True
+
+    def try_acquire(self):
+        """대기 없이 슬롯을 얻어 봅니다 (asyncio 엔진용). 성공하면 True."""
+        with self._cond:
+            if self._in_flight >= int(self._limit):
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self, outcome, latency=None, tokens=None):
+        """tokens: 성공한 요청의 입력+출력 토큰 수 (지연 시간을 요청 크기로 나누는 데 사용, 없으면 크기 보정 없음)"""
+        changed = False
+        with self._cond:
+            self._in_flight = max(0, self._in_flight - 1)
+            if outcome == OUTCOME_SUCCESS:
+                if latency is not None and tokens:
+                    latency = latency / max(tokens, LATENCY_MIN_TOKENS)
+                changed = self._on_success_locked(latency)
+            elif outcome == OUTCOME_THROTTLED:
+                changed = self._on_throttled_locked()
+            self._cond.notify_all()
+            limit, in_flight = int(self._limit), self._in_flight
+        if changed and self.on_change:
+            self.on_change(limit, in_flight)
+
+    def _on_success_locked(self, latency):
+        if latency is not None:
+            if self._latency_ema is None:
+                self._latency_ema = latency
+            else:
+                self._latency_ema += LATENCY_EMA_WEIGHT * (latency - self._latency_ema)
+            if self._min_latency_ema is None or self._latency_ema < self._min_latency_ema:
+                self._min_latency_ema = self._latency_ema
+            else:
+                self._min_latency_ema += BASELINE_RECOVERY_WEIGHT * (self._latency_ema - self._min_latency_ema)
+            if self._latency_ema > self._min_latency_ema * LATENCY_TOLERANCE:
+                # 서버 쪽 대기열이 쌓이는 신호: 늘리지 않고 유지
+                self._success_streak = 0
+                return False
+
+        self._success_streak += 1
+        if self._success_streak >= int(self._limit) and self._limit < self.max_limit:
+            self._success_streak = 0
+            self._limit = min(self.max_limit, self._limit + 1)
+            return True
+        return False
+
+    def _on_throttled_locked(self):
+        self._success_streak = 0
+        now = time.monotonic()
+        if now - self._last_decrease < DECREASE_COOLDOWN:
+            return False
+        self._last_decrease = now
+        new_limit = max(self.min_limit, int(self._limit * DECREASE_FACTOR))
+        if new_limit == int(self._limit):
+            return False
+        self._limit = float(new_limit)
+        return True
+
+
+# 모델별 컨트롤러 (프로세스 전체에서 공유하여 작업 간에 학습된 한도를 유지)
+_controllers = {}
+_controllers_lock = threading.Lock()
+
+
+def get_concurrency_controller(model_id, initial_limit, max_limit):
+    with _controllers_lock:
+        controller = _controllers.get(model_id)
+        if controller is None:
+            controller = AdaptiveConcurrencyController(initial_limit, max_limit=max_limit)
+            _controllers[model_id] = controller
+        return controller
@@ -24,9 +24,40 @@ CHUNK_SIZE_NAME_IN_CONFIG = "chunk_size_lines"
 SELECTED_PROMPT_ID_NAME_IN_CONFIG = "selected_prompt_id"
 ACTIVE_GLOSSARY_FILES_NAME_IN_CONFIG = "active_glossary_files"
 SELECTED_MODEL_ID_NAME_IN_CONFIG = "selected_model_id"
+TRANSLATION_MEMORY_ENABLED_NAME_IN_CONFIG = "translation_memory_enabled"
+TRANSLATION_MEMORY_MAX_ENTRIES_NAME_IN_CONFIG = "translation_memory_max_entries"
+CHUNK_MODE_NAME_IN_CONFIG = "chunk_mode"
+CHUNK_TOKEN_BUDGET_NAME_IN_CONFIG = "chunk_token_budget" # None이면 모델별 기본 예산 사용
+MODEL_RATE_LIMITS_NAME_IN_CONFIG = "model_rate_limits" # {모델 ID: {"rpm": 숫자, "tpm": 숫자}}, MODEL_RATE_LIMITS를 덮어씀
+TRANSLATION_ENGINE_NAME_IN_CONFIG = "translation_engine"
+REQUEST_FORMAT_NAME_IN_CONFIG = "request_format"
+REQUEST_TIMEOUT_NAME_IN_CONFIG = "request_timeout"
+HEDGE_BUDGET_NAME_IN_CONFIG = "hedge_budget"
+MODEL_FALLBACK_CHAINS_NAME_IN_CONFIG = "model_fallback_chains" # {모델 ID: [폴백 모델 ID, ...]}, MODEL_FALLBACK_CHAINS를 덮어씀
+PROFILING_NAME_IN_CONFIG = "profiling" # 예: "spans", "spans,cprofile,tracemalloc" (환경 변수 MNB_PROFILE이 우선)
 
 # --- 기본값 ---
 DEFAULT_CHUNK_SIZE = 50
+DEFAULT_TRANSLATION_MEMORY_MAX_ENTRIES = 500000 # 번역 메모리 최대 항목 수 (초과 시 오래된 항목부터 제거)
+
+# 청크 분할 방식: 토큰 예산 기준(기본) 또는 고정 줄 수 기준(대체 모드)
+CHUNK_MODE_TOKENS = "tokens"
+CHUNK_MODE_LINES = "lines"
+DEFAULT_CHUNK_MODE = CHUNK_MODE_TOKENS
+# 번역 실행 엔진: 스레드 풀(기본) 또는 asyncio (generate_content_async, 요청당 스레드 없음)
+ENGINE_THREADS = "threads"
+ENGINE_ASYNCIO = "asyncio"
+DEFAULT_TRANSLATION_ENGINE = ENGINE_THREADS
+# 청크 요청 형식: 줄바꿈으로 이은 텍스트(기본) 또는 {id, text} JSON 배열 (응답을 줄 ID로 매핑, 누락된 ID만 재요청)
+REQUEST_FORMAT_TEXT = "text"
+REQUEST_FORMAT_JSON = "json"
+DEFAULT_REQUEST_FORMAT = REQUEST_FORMAT_TEXT
+# 요청 하나의 제한 시간(초). 넘으면 DeadlineExceeded로 재시도하여 멈춘 요청 하나가 작업 전체를 붙잡지 않게 함
+DEFAULT_REQUEST_TIMEOUT = 120
+# 꼬리 지연 청크의 중복 요청 예산 (전체 청크 수 대비 비율, 0이면 중복 요청 안 함)
+DEFAULT_HEDGE_BUDGET = 0.05
+DEFAULT_PROFILING = "" # 단계별 프로파일링 끔
+MAX_LINES_PER_TOKEN_CHUNK = 200 # 토큰 기준 모드에서도 한 청크에 넣을 최대 줄 수 (줄 정렬 안정성)
 
 # --- 사용 가능한 모델 및 모델별 스레드 설정 ---
 # (모델 ID: 사용자 표시 이름)
@@ -47,7 +78,7 @@ DEFAULT_MODEL_ID = next(iter(AVAILABLE_MODELS)) if AVAILABLE_MODELS else "gemini
 
 
 # 모델별 권장 스레드 수 (키는 AVAILABLE_MODELS의 키와 일치)
-# 실제 RPM과 테스트를 통해 최적의 값으로 조정해야 합니다.
+# 적응형 동시성 제어(core/concurrency.py)의 시작 한도로 사용됩니다.
 MODEL_THREAD_CONFIG = {
     # "gemini-1.5-flash-latest": 6,
     # "gemini-1.5-pro-latest": 3,
@@ -60,6 +91,66 @@ MODEL_THREAD_CONFIG = {
     "default": 3  # MODEL_THREAD_CONFIG에 명시되지 않은 모델의 기본 스레드 수
 }
 
+# 모델별 청크당 입력 토큰 예산 (원문 기준, 프롬프트 템플릿 제외)
+# 한국어 출력은 입력보다 토큰이 많으므로 모델의 최대 출력 토큰을 넘지 않게 여유 있게 잡습니다.
+MODEL_TOKEN_BUDGET = {
+    "gemini-2.0-flash-lite": 1500,
+    "gemini-2.5-flash-preview-05-20": 3000,
+    "gemini-2.5-pro-preview-05-06": 3000,
+    "gemini-2.0-flash-preview-image-generation": 1500,
+    "default": 1500
+}
+
+# 모델별 최대 동시 요청 수 (적응형 동시성 제어의 상한)
+# MODEL_THREAD_CONFIG 값에서 시작해 429/503이 없으면 이 값까지 늘어납니다.
+MODEL_MAX_CONCURRENCY = {
+    "gemini-2.0-flash-lite": 32,
+    "gemini-2.5-flash-preview-05-20": 24,
+    "gemini-2.5-pro-preview-05-06": 8,
+    "gemini-2.0-flash-preview-image-generation": 16,
+    "default": 16
+}
+
+# 모델별 분당 요청 수(RPM) / 분당 입력 토큰 수(TPM) 한도 (core/rate_limiter.py)
+# 기본값은 API 요금제 기준 대략적인 값이므로 실제 할당량에 맞게 config.json의 model_rate_limits로 조정하세요.
+# 값이 None 또는 0이면 해당 한도는 적용하지 않습니다.
+MODEL_RATE_LIMITS = {
+    "gemini-2.0-flash-lite": {"rpm": 4000, "tpm": 4000000},
+    "gemini-2.5-flash-preview-05-20": {"rpm": 1000, "tpm": 1000000},
+    "gemini-2.5-pro-preview-05-06": {"rpm": 150, "tpm": 2000000},
+    "gemini-2.0-flash-preview-image-generation": {"rpm": 10, "tpm": 200000}, # 무료 등급
+    "default": {"rpm": 15, "tpm": 1000000}
+}
+
+# 모델별 폴백 경로: 할당량 소진(429)이나 반복되는 5xx/타임아웃으로 재시도를 모두 소진한 청크는 다음 모델로 다시 보냄
+# 빈 목록이면 폴백하지 않음
+MODEL_FALLBACK_CHAINS = {
+    "gemini-2.5-pro-preview-05-06": ["gemini-2.5-flash-preview-05-20", "gemini-2.0-flash-lite"],
+    "gemini-2.5-flash-preview-05-20": ["gemini-2.0-flash-preview-image-generation", "gemini-2.0-flash-lite"],
+    "gemini-2.0-flash-preview-image-generation": ["gemini-2.0-flash-lite"],
+    "gemini-2.0-flash-lite": [],
+    "default": []
+}
+
+def get_model_fallback_chain(model_id, overrides=None):
+    """model_id부터 시작하는 폴백 순서 목록을 반환합니다. overrides(설정 파일 값)가 기본값보다 우선합니다."""
+    if overrides and isinstance(overrides.get(model_id), list):
+        fallbacks = overrides[model_id]
+    else:
+        fallbacks = MODEL_FALLBACK_CHAINS.get(model_id, MODEL_FALLBACK_CHAINS["default"])
+    chain = [model_id]
+    for fallback_model_id in fallbacks:
+        if fallback_model_id and fallback_model_id not in chain:
+            chain.append(fallback_model_id)
+    return chain
+
+def get_model_rate_limits(model_id, overrides=None):
+    """모델의 (rpm, tpm)을 반환합니다. overrides(설정 파일 값)가 기본값보다 우선합니다."""
+    limits = dict(MODEL_RATE_LIMITS.get(model_id, MODEL_RATE_LIMITS["default"]))
+    if overrides and isinstance(overrides.get(model_id), dict):
+        limits.update(overrides[model_id])
+    return limits.get("rpm"), limits.get("tpm")
+
 def load_config():
     # 기본 설정값 구조
     config = {
@@ -67,7 +158,18 @@ def load_config():
         CHUNK_SIZE_NAME_IN_CONFIG: DEFAULT_CHUNK_SIZE,
         SELECTED_PROMPT_ID_NAME_IN_CONFIG: None, # GUI에서 기본 프롬프트 ID로 초기화
         ACTIVE_GLOSSARY_FILES_NAME_IN_CONFIG: [],
-        SELECTED_MODEL_ID_NAME_IN_CONFIG: DEFAULT_MODEL_ID
+        SELECTED_MODEL_ID_NAME_IN_CONFIG: DEFAULT_MODEL_ID,
+        TRANSLATION_MEMORY_ENABLED_NAME_IN_CONFIG: True,
+        TRANSLATION_MEMORY_MAX_ENTRIES_NAME_IN_CONFIG: DEFAULT_TRANSLATION_MEMORY_MAX_ENTRIES,
+        CHUNK_MODE_NAME_IN_CONFIG: DEFAULT_CHUNK_MODE,
+        CHUNK_TOKEN_BUDGET_NAME_IN_CONFIG: None,
+        MODEL_RATE_LIMITS_NAME_IN_CONFIG: {},
+        TRANSLATION_ENGINE_NAME_IN_CONFIG: DEFAULT_TRANSLATION_ENGINE,
+        REQUEST_FORMAT_NAME_IN_CONFIG: DEFAULT_REQUEST_FORMAT,
+        REQUEST_TIMEOUT_NAME_IN_CONFIG: DEFAULT_REQUEST_TIMEOUT,
+        HEDGE_BUDGET_NAME_IN_CONFIG: DEFAULT_HEDGE_BUDGET,
+        MODEL_FALLBACK_CHAINS_NAME_IN_CONFIG: {},
+        PROFILING_NAME_IN_CONFIG: DEFAULT_PROFILING
     }
     if not os.path.exists(USER_DATA_DIR):
         try:
@@ -1,17 +1,60 @@
 # core/file_handler.py
+import codecs
 import os
+
+from core.mapped_lines import MappedLineFile, BYTE_LINE_ENCODINGS
+from core.profiler import profiled
 # from tkinter import filedialog, messagebox # GUI 종속성은 app_instance.put_message_in_queue 로 전달
-import time
 
 MSG_TYPE_STATUS = "status" # main_window 와 동일한 메시지 타입 사용
 MSG_TYPE_ERROR = "error"
 
+ENCODING_SAMPLE_SIZE = 64 * 1024 # 인코딩 판별에 쓰는 앞부분 크기
+READ_BLOCK_SIZE = 1024 * 1024    # 점진 디코딩 블록 크기 (블록 사이에서 취소 확인)
+LARGE_FILE_THRESHOLD = 4 * 1024 * 1024 # 이보다 큰 파일은 메모리 매핑 줄 보기로 엶
+HANGUL_RATIO_THRESHOLD = 0.5     # cp949로 읽은 비ASCII 문자 중 한글 음절 비율이 이 이상이면 한국어 파일로 판단
+
+# BOM -> 인코딩 (긴 BOM부터 확인: UTF-32 LE BOM은 UTF-16 LE BOM으로 시작함)
+_BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+
+def _decodes_cleanly(sample, encoding):
+    """샘플이 오류 없이 디코딩되는지 확인 (샘플 끝에서 잘린 멀티바이트 문자는 허용)"""
+    try:
+        codecs.getincrementaldecoder(encoding)(errors="strict").decode(sample, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def _hangul_ratio(sample, encoding):
+    """샘플을 encoding으로 읽었을 때 비ASCII 문자 중 한글 음절(가-힣)의 비율. 디코딩 실패 시 0."""
+    try:
+        text = codecs.getincrementaldecoder(encoding)(errors="strict").decode(sample, final=False)
+    except UnicodeDecodeError:
+        return 0.0
+    non_ascii = [ch for ch in text if ord(ch) > 127]
+    if not non_ascii:
+        return 0.0
+    return sum(1 for ch in non_ascii if "\uac00" <= ch <= "\ud7a3") / len(non_ascii)
+
 class FileHandler:
     def __init__(self, app_instance):
         self.app = app_instance
+        self.last_loaded_encoding = None # 마지막으로 읽은 파일의 인코딩
 
+    @profiled("load")
     def load_file_core(self, cancel_event=None, filepath_from_gui=None):
-        """실제 파일 로딩 로직 (스레드에서 호출 가능)"""
+        """
+        실제 파일 로딩 로직 (스레드에서 호출 가능).
+        BOM과 앞부분 샘플로 인코딩을 정한 뒤, 블록 단위 점진 디코딩으로 한 번에 읽습니다 (블록 사이에서 취소 확인).
+        """
         if not filepath_from_gui: # GUI에서 파일 경로를 받지 못했다면 (예: 테스트용)
             # 이 부분은 GUI의 filedialog를 대체할 수 없음. GUI에서 경로를 받아 전달해야 함.
             # 여기서는 filepath_from_gui가 항상 제공된다고 가정.
@@ -19,45 +62,34 @@ class FileHandler:
             return None, None, False
         
         filepath = filepath_from_gui
-
-        # file_extension = os.path.splitext(filepath)[1].lower() # GUI에서 이미 처리 가능
-        encodings_to_try = ['utf-8', 'cp1252', 'latin-1', 'euc-kr', 'cp949']
-        content_to_display = None
         is_csv_mode = filepath.lower().endswith(".csv")
 
         try:
-            loaded_encoding = None
             self.app.put_message_in_queue(MSG_TYPE_STATUS, f"파일 읽는 중: {os.path.basename(filepath)}...")
-            
-            # 파일을 조금씩 읽으면서 cancel_event 확인 (매우 큰 파일의 경우)
-            # 여기서는 일단 한 번에 읽는 방식 유지, GUI가 멈추지 않도록 스레드에서 실행
             with open(filepath, "rb") as f_bytes:
-                raw_content_bytes = f_bytes.read() # 이 부분이 블로킹
-            
-            if cancel_event and cancel_event.is_set():
-                self.app.put_message_in_queue(MSG_TYPE_STATUS, "파일 로드 취소됨 (읽기 중).")
-                return None, None, False
+                sample = f_bytes.read(ENCODING_SAMPLE_SIZE)
 
             self.app.put_message_in_queue(MSG_TYPE_STATUS, "인코딩 확인 중...")
-            for i, enc in enumerate(encodings_to_try):
-                if cancel_event and cancel_event.is_set():
-                    self.app.put_message_in_queue(MSG_TYPE_STATUS, "파일 로드 취소됨 (인코딩 중).")
-                    return None, None, False
+            candidates = self.detect_encoding_candidates(sample)
+            del sample
+
+            # 샘플로 고른 인코딩이 파일 뒷부분에서 실패하면 다음 후보로 다시 읽음 (latin-1은 항상 성공)
+            for enc in candidates:
                 try:
-                    content_to_display = raw_content_bytes.decode(enc)
-                    loaded_encoding = enc
-                    self.app.put_message_in_queue(MSG_TYPE_STATUS, f"인코딩 감지: {loaded_encoding}")
-                    break 
+                    content_to_display = self._decode_file_streamed(filepath, enc, cancel_event)
                 except UnicodeDecodeError:
                     self.app.put_message_in_queue(MSG_TYPE_STATUS, f"인코딩 시도 실패: {enc}")
-                time.sleep(0.01) # 아주 짧은 딜레이로 취소 감지 기회
-
-            if loaded_encoding is None:
-                self.app.put_message_in_queue(MSG_TYPE_ERROR, f"파일 인코딩을 확인할 수 없습니다: {filepath}")
-                return None, None, False
+                    continue
+                if content_to_display is None:
+                    self.app.put_message_in_queue(MSG_TYPE_STATUS, "파일 로드 취소됨 (읽기 중).")
+                    return None, None, False
+                self.last_loaded_encoding = enc
+                self.app.put_message_in_queue(MSG_TYPE_STATUS, f"인코딩 감지: {enc}")
+                # self.app.unsaved_translation = False # 이건 GUI 로직에서 처리
+                return filepath, content_to_display, is_csv_mode
 
-            # self.app.unsaved_translation = False # 이건 GUI 로직에서 처리
-            return filepath, content_to_display, is_csv_mode
+            self.app.put_message_in_queue(MSG_TYPE_ERROR, f"파일 인코딩을 확인할 수 없습니다: {filepath}")
+            return None, None, False
 
         except FileNotFoundError:
             self.app.put_message_in_queue(MSG_TYPE_ERROR, f"파일을 찾을 수 없습니다: {filepath}")
@@ -66,6 +98,66 @@ class FileHandler:
             self.app.put_message_in_queue(MSG_TYPE_ERROR, f"파일 처리 중 알 수 없는 오류 발생: {e}")
             return None, None, False
 
+    @profiled("load.line_view")
+    def open_line_view(self, filepath, cancel_event=None):
+        """
+        파일을 메모리 매핑 줄 보기(MappedLineFile)로 엽니다. 인코딩 판별은 load_file_core와 같습니다.
+        줄 보기를 쓸 수 없는 인코딩(UTF-16/32)이거나 취소되면 None을 반환합니다 (호출 측은 load_file_core 사용).
+        """
+        with open(filepath, "rb") as f_bytes:
+            sample = f_bytes.read(ENCODING_SAMPLE_SIZE)
+        for enc in self.detect_encoding_candidates(sample):
+            if enc not in BYTE_LINE_ENCODINGS:
+                return None
+            try:
+                view = MappedLineFile(filepath, enc, cancel_event)
+            except UnicodeDecodeError:
+                self.app.put_message_in_queue(MSG_TYPE_STATUS, f"인코딩 시도 실패: {enc}")
+                continue
+            except InterruptedError:
+                return None
+            self.last_loaded_encoding = enc
+            self.app.put_message_in_queue(MSG_TYPE_STATUS, f"인코딩 감지: {enc} (줄 {len(view)}개, 메모리 매핑)")
+            return view
+        return None
+
+    @staticmethod
+    def detect_encoding_candidates(sample):
+        """
+        파일 앞부분(sample)으로 인코딩 후보를 우선순위 순서로 반환합니다.
+        BOM이 있으면 그 인코딩만, 없으면 utf-8 → cp949(한글 비율이 높을 때) → cp1252 → latin-1 순.
+        """
+        for bom, enc in _BOMS:
+            if sample.startswith(bom):
+                return [enc]
+
+        candidates = []
+        if _decodes_cleanly(sample, "utf-8"):
+            candidates.append("utf-8")
+        # cp1252/latin-1은 거의 항상 디코딩에 성공하므로, 한국어 파일은 cp949 결과에 한글이 많은지로 판별
+        if _hangul_ratio(sample, "cp949") >= HANGUL_RATIO_THRESHOLD:
+            candidates.append("cp949")
+        for enc in ("utf-8", "cp949", "cp1252", "latin-1"):
+            if enc not in candidates:
+                candidates.append(enc)
+        return candidates
+
+    def _decode_file_streamed(self, filepath, encoding, cancel_event=None):
+        """블록 단위로 읽으며 점진적으로 디코딩합니다. 취소되면 None. 디코딩 실패 시 UnicodeDecodeError."""
+        decoder = codecs.getincrementaldecoder(encoding)(errors="strict")
+        parts = []
+        with open(filepath, "rb") as f_bytes:
+            while True:
+                if cancel_event and cancel_event.is_set():
+                    return None
+                block = f_bytes.read(READ_BLOCK_SIZE)
+                if not block:
+                    break
+                parts.append(decoder.decode(block))
+        parts.append(decoder.decode(b"", final=True))
+        return "".join(parts)
+
+    @profiled("save")
     def save_file(self, content_to_save, initial_filename_suggestion, filepath_from_gui=None):
         """실제 파일 저장 로직. filepath_from_gui는 filedialog 결과를 받음."""
         if not content_to_save:
@@ -79,8 +171,16 @@ class FileHandler:
         filepath = filepath_from_gui
         self.app.put_message_in_queue(MSG_TYPE_STATUS, f"파일 저장 중: {os.path.basename(filepath)}...")
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(content_to_save)
+            # 줄바꿈 변환은 끄고 줄마다 처리: 원본 파일에서 온 줄은 원래 줄바꿈("\r\n" 등)을 그대로 두고,
+            # "\n"으로만 끝나는 줄(편집한 줄 등)만 플랫폼 줄바꿈으로 바꿈 (텍스트 모드 변환은 "\r\n"을 "\r\r\n"으로 만듦)
+            if isinstance(content_to_save, str): # 문자열(CLI 출력 등)도 같은 규칙으로 줄 단위 저장
+                content_to_save = content_to_save.splitlines(keepends=True)
+            lines = content_to_save # 줄 시퀀스 (GUI 텍스트 모델 등): 통째로 합치지 않고 줄 단위로 씀
+            if os.linesep != "\n":
+                lines = (line[:-1] + os.linesep if line.endswith("\n") and not line.endswith("\r\n") else line
+                         for line in content_to_save)
+            with open(filepath, "w", encoding="utf-8", newline="") as f:
+                f.writelines(lines)
             # self.app.unsaved_translation = False # GUI에서 처리
             self.app.put_message_in_queue(MSG_TYPE_STATUS, f"파일 저장 완료: {os.path.basename(filepath)}")
             return True
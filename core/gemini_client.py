@@ -0,0 +1,42 @@
+# core/gemini_client.py
+import threading
+import google.generativeai as genai
+
+# genai.configure는 모듈 전역 상태를 바꾸고 호출할 때마다 내부 클라이언트(연결)를 새로 만들므로
+# 프로세스 전체에서 잠금으로 보호하고, 같은 키로는 다시 설정하지 않음
+_configure_lock = threading.Lock()
+_configured_api_key = None
+
+
+class GeminiClient:
+    """
+    작업 단위로 한 번만 만드는 Gemini 클라이언트.
+    API 키 설정은 생성 시 한 번만 하고, GenerativeModel은 모델 이름별로 캐시하여 워커 스레드들이 공유합니다.
+    (같은 기본 클라이언트를 쓰므로 gRPC 채널/HTTP 연결이 청크마다 새로 만들어지지 않음)
+    """
+    def __init__(self, api_key):
+        global _configured_api_key
+        with _configure_lock:
+            if _configured_api_key != api_key:
+                genai.configure(api_key=api_key)
+                _configured_api_key = api_key
+        self._models = {}
+        self._models_lock = threading.Lock()
+
+    def get_model(self, model_name):
+        with self._models_lock:
+            model = self._models.get(model_name)
+            if model is None:
+                model = genai.GenerativeModel(model_name)
+                self._models[model_name] = model
+            return model
+
+    def generate_content(self, model_name, prompt, **kwargs):
+        return self.get_model(model_name).generate_content(prompt, **kwargs)
+
+    async def generate_content_async(self, model_name, prompt, **kwargs):
+        return await self.get_model(model_name).generate_content_async(prompt, **kwargs)
+
+    def close(self):
+        with self._models_lock:
+            self._models.clear()
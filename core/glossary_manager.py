@@ -1,16 +1,35 @@
 import csv
+import hashlib
+import json
 import os
-import re
+
+from core.config_manager import USER_DATA_DIR
+from core.glossary_matcher import GlossaryMatcher
+from core.profiler import profiled
 
 # 메시지 타입 (main_window와 공유 또는 여기서 정의)
 MSG_TYPE_STATUS = "status"
 MSG_TYPE_ERROR = "error"
 
+# 파싱된 용어집과 컴파일된 패턴을 저장하는 디스크 캐시
+GLOSSARY_CACHE_FILE_NAME = "glossary_cache.json"
+GLOSSARY_CACHE_PATH = os.path.join(USER_DATA_DIR, GLOSSARY_CACHE_FILE_NAME)
+GLOSSARY_CACHE_VERSION = 1
+MAX_CACHED_PATTERNS = 4 # 디스크에 보관할 컴파일 패턴 수 (활성 용어집 조합/옵션별)
+
 class GlossaryManager:
-    def __init__(self, app_instance=None):
+    def __init__(self, app_instance=None, cache_path=GLOSSARY_CACHE_PATH):
         self.app = app_instance # GUI 앱 인스턴스 (선택적, 상태 업데이트용)
         self.glossaries = {}  # {filepath: {original: translated}} 형태의 딕셔너리
         self.active_glossary_files = [] # 활성화된 용어집 파일 경로 목록
+        self.glossary_hashes = {} # {filepath: 파일 내용 sha256} (컴파일 캐시 서명용)
+
+        # 컴파일된 용어집: 활성 목록/용어집 내용이 바뀔 때만 다시 만듦
+        self._compiled_matchers = {} # {(use_exact_match, case_sensitive): GlossaryMatcher}
+
+        self.cache_path = cache_path
+        self._disk_cache = self._load_disk_cache()
+        self._disk_cache_dirty = False
 
     def _send_status(self, message):
         if self.app and hasattr(self.app, 'put_message_in_queue'):
@@ -25,39 +44,118 @@ class GlossaryManager:
             print(f"Error (GlossaryManager): {message}")
 
 
+    def _load_disk_cache(self):
+        empty_cache = {"version": GLOSSARY_CACHE_VERSION, "files": {}, "patterns": {}}
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return empty_cache
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get("version") != GLOSSARY_CACHE_VERSION:
+                return empty_cache
+            cache.setdefault("files", {})
+            cache.setdefault("patterns", {})
+            return cache
+        except Exception as e:
+            print(f"경고: 용어집 캐시를 읽을 수 없습니다 ({self.cache_path}): {e}")
+            return empty_cache
+
+    def _save_disk_cache(self):
+        if not self.cache_path or not self._disk_cache_dirty:
+            return
+        try:
+            cache_dir = os.path.dirname(self.cache_path)
+            if cache_dir and not os.path.exists(cache_dir):
+                os.makedirs(cache_dir)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._disk_cache, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path) # 저장 도중 종료되어도 기존 캐시가 깨지지 않도록
+            self._disk_cache_dirty = False
+        except Exception as e:
+            print(f"경고: 용어집 캐시 저장 실패 ({self.cache_path}): {e}")
+
+    def _get_cached_terms(self, filepath, stat_result):
+        """
+        디스크 캐시에서 용어 목록을 찾습니다.
+        수정 시각과 크기가 같으면 그대로 사용하고, 다르면 파일 내용 해시를 비교합니다.
+        반환: (term_map 또는 None, 파일 내용 sha256 또는 None)
+        """
+        entry = self._disk_cache["files"].get(os.path.abspath(filepath))
+        if not entry:
+            return None, None
+        if entry.get("mtime_ns") == stat_result.st_mtime_ns and entry.get("size") == stat_result.st_size:
+            return entry.get("terms"), entry.get("sha256")
+        with open(filepath, 'rb') as f:
+            file_hash = hashlib.sha256(f.read()).hexdigest()
+        if file_hash == entry.get("sha256"):
+            # 내용은 같고 수정 시각만 바뀐 경우 (복사, 저장만 다시 한 경우 등)
+            entry["mtime_ns"] = stat_result.st_mtime_ns
+            entry["size"] = stat_result.st_size
+            self._disk_cache_dirty = True
+            return entry.get("terms"), file_hash
+        return None, file_hash
+
+    def _parse_glossary_csv(self, filepath):
+        term_map = {}
+        with open(filepath, 'r', encoding='utf-8-sig') as f: # utf-8-sig for BOM
+            reader = csv.reader(f)
+            for i, row in enumerate(reader):
+                if len(row) == 2:
+                    original, translated = row[0].strip(), row[1].strip()
+                    if original: # 원본 용어가 비어있지 않아야 함
+                        term_map[original] = translated
+                elif row: # 빈 행이 아니지만 형식이 잘못된 경우
+                    self._send_status(f"경고: 용어집 파일 '{os.path.basename(filepath)}'의 {i+1}번째 줄 형식이 잘못되었습니다 (원본,번역 필요). 무시합니다.")
+        return term_map
+
     def load_glossary_file(self, filepath):
-        """지정된 CSV 용어집 파일을 로드하여 self.glossaries에 추가/갱신합니다."""
+        """
+        지정된 CSV 용어집 파일을 로드하여 self.glossaries에 추가/갱신합니다.
+        파일이 바뀌지 않았으면 디스크 캐시에 저장된 파싱 결과를 사용합니다.
+        """
         if not os.path.exists(filepath):
             self._send_error(f"용어집 파일을 찾을 수 없습니다: {filepath}")
             return False
-        
-        term_map = {}
+
         try:
-            with open(filepath, 'r', encoding='utf-8-sig') as f: # utf-8-sig for BOM
-                reader = csv.reader(f)
-                for i, row in enumerate(reader):
-                    if len(row) == 2:
-                        original, translated = row[0].strip(), row[1].strip()
-                        if original: # 원본 용어가 비어있지 않아야 함
-                            term_map[original] = translated
-                    elif row: # 빈 행이 아니지만 형식이 잘못된 경우
-                        self._send_status(f"경고: 용어집 파일 '{os.path.basename(filepath)}'의 {i+1}번째 줄 형식이 잘못되었습니다 (원본,번역 필요). 무시합니다.")
-            
+            stat_result = os.stat(filepath)
+            term_map, file_hash = self._get_cached_terms(filepath, stat_result)
+            from_cache = term_map is not None
+            if not from_cache:
+                if file_hash is None:
+                    with open(filepath, 'rb') as f:
+                        file_hash = hashlib.sha256(f.read()).hexdigest()
+                term_map = self._parse_glossary_csv(filepath)
+                self._disk_cache["files"][os.path.abspath(filepath)] = {
+                    "mtime_ns": stat_result.st_mtime_ns, "size": stat_result.st_size,
+                    "sha256": file_hash, "terms": term_map,
+                }
+                self._disk_cache_dirty = True
+            self._save_disk_cache()
+
             self.glossaries[filepath] = term_map
-            self._send_status(f"용어집 로드 완료: {os.path.basename(filepath)} ({len(term_map)}개 용어)")
+            self.glossary_hashes[filepath] = file_hash
+            self._invalidate_compiled()
+            cache_note = ", 캐시 사용" if from_cache else ""
+            self._send_status(f"용어집 로드 완료: {os.path.basename(filepath)} ({len(term_map)}개 용어{cache_note})")
             return True
         except Exception as e:
             self._send_error(f"용어집 파일 로드 중 오류 발생 ({os.path.basename(filepath)}): {e}")
             if filepath in self.glossaries: # 로드 중 오류 시 해당 용어집 제거
                 del self.glossaries[filepath]
+                self.glossary_hashes.pop(filepath, None)
+                self._invalidate_compiled()
             return False
 
     def remove_glossary_file(self, filepath):
         """로드된 용어집에서 특정 파일을 제거합니다."""
         if filepath in self.glossaries:
             del self.glossaries[filepath]
+            self.glossary_hashes.pop(filepath, None)
             if filepath in self.active_glossary_files:
                 self.active_glossary_files.remove(filepath)
+            self._invalidate_compiled()
             self._send_status(f"용어집 제거됨: {os.path.basename(filepath)}")
             return True
         return False
@@ -75,21 +173,17 @@ class GlossaryManager:
             elif fp not in self.active_glossary_files: # 이미 로드되었지만 활성 목록에 없다면 추가
                  self.active_glossary_files.append(fp)
 
+        self._invalidate_compiled()
         if newly_loaded_files:
             self._send_status(f"새 용어집 파일 로드 및 활성화: {', '.join(newly_loaded_files)}")
         # self._send_status(f"활성 용어집 업데이트됨: {len(self.active_glossary_files)}개 파일")
 
 
-    def apply_glossary_to_text(self, text, use_exact_match=True, case_sensitive=False):
-        """
-        활성화된 모든 용어집을 텍스트에 적용합니다 (후처리 방식).
-        가장 긴 용어부터 매칭하여 오적용을 줄이도록 시도합니다.
-        use_exact_match: True이면 단어 단위 매칭 (\b), False이면 부분 문자열 매칭.
-        case_sensitive: True이면 대소문자 구분.
-        """
-        if not self.active_glossary_files or not self.glossaries:
-            return text
+    def _invalidate_compiled(self):
+        self._compiled_matchers = {}
 
+    def _build_matcher(self, use_exact_match, case_sensitive):
+        """활성 용어집을 합쳐 GlossaryMatcher를 만듭니다. 디스크에 저장된 패턴이 있으면 재사용합니다."""
         combined_terms = {}
         for filepath in self.active_glossary_files:
             if filepath in self.glossaries:
@@ -97,38 +191,56 @@ class GlossaryManager:
                 combined_terms.update(self.glossaries[filepath]) 
         
         if not combined_terms:
+            return None
+
+        signature = self._compiled_signature(use_exact_match, case_sensitive)
+        cached_pattern = self._disk_cache["patterns"].get(signature) if signature else None
+        matcher = GlossaryMatcher(combined_terms, use_exact_match=use_exact_match,
+                                  case_sensitive=case_sensitive, pattern=cached_pattern)
+        if signature and cached_pattern is None and matcher.regex is not None:
+            patterns = self._disk_cache["patterns"]
+            patterns[signature] = matcher.regex.pattern
+            while len(patterns) > MAX_CACHED_PATTERNS: # 가장 오래된 패턴부터 제거 (삽입 순서)
+                del patterns[next(iter(patterns))]
+            self._disk_cache_dirty = True
+            self._save_disk_cache()
+        return matcher
+
+    def _compiled_signature(self, use_exact_match, case_sensitive):
+        """활성 용어집의 내용 해시와 옵션으로 컴파일 결과의 서명을 만듭니다."""
+        parts = []
+        for filepath in self.active_glossary_files:
+            if filepath in self.glossaries:
+                file_hash = self.glossary_hashes.get(filepath)
+                if file_hash is None:
+                    return None
+                parts.append(file_hash)
+        parts.append(f"exact={use_exact_match};cs={case_sensitive}")
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    def get_compiled_matcher(self, use_exact_match=True, case_sensitive=False):
+        """현재 활성 용어집의 컴파일된 매처를 반환합니다. 활성 상태가 바뀌기 전까지 재사용됩니다."""
+        options = (use_exact_match, case_sensitive)
+        if options not in self._compiled_matchers:
+            self._compiled_matchers[options] = self._build_matcher(use_exact_match, case_sensitive)
+        return self._compiled_matchers[options]
+
+    @profiled("glossary")
+    def apply_glossary_to_text(self, text, use_exact_match=True, case_sensitive=False):
+        """
+        활성화된 모든 용어집을 텍스트에 적용합니다 (후처리 방식).
+        모든 용어를 트라이 기반 정규식 하나로 컴파일하여 한 번의 패스로 치환하며,
+        같은 위치에서는 가장 긴 용어부터 매칭하여 오적용을 줄이도록 시도합니다.
+        use_exact_match: True이면 단어 단위 매칭 (\b), False이면 부분 문자열 매칭.
+        case_sensitive: True이면 대소문자 구분.
+        """
+        if not self.active_glossary_files or not self.glossaries:
             return text
-
-        # 가장 긴 용어부터 처리하기 위해 길이순으로 정렬 (내림차순)
-        # 동일 길이 내에서는 순서가 중요하지 않거나, 원래 순서 유지 가능
-        sorted_originals = sorted(combined_terms.keys(), key=len, reverse=True)
-
-        processed_text = text
-        for original_term in sorted_originals:
-            translated_term = combined_terms[original_term]
-            
-            # 정규식 패턴 생성
-            # M&B 태그 내부의 내용은 치환 대상이 아님.
-            # 예: {player_name}은 용어지만, 다른 태그 {s0} 내부의 player_name은 치환 안 함.
-            # 이는 매우 복잡해질 수 있으므로, 초기에는 단순 치환.
-            # 태그 보호는 mnb_preprocess_text/mnb_postprocess_text에서 이미 처리되었다고 가정.
-
-            pattern_str = re.escape(original_term) # 정규식 특수문자 이스케이프
-            if use_exact_match:
-                pattern_str = r'\b' + pattern_str + r'\b' # 단어 경계
-
-            try:
-                if case_sensitive:
-                    regex = re.compile(pattern_str)
-                else:
-                    regex = re.compile(pattern_str, re.IGNORECASE)
-                
-                processed_text = regex.sub(translated_term, processed_text)
-            except re.error as e:
-                self._send_error(f"용어집 정규식 오류 ('{original_term}'): {e}")
-                continue # 다음 용어로 넘어감
-        
-        return processed_text
+        # 태그 보호는 mnb_preprocess_text/mnb_postprocess_text에서 이미 처리되었다고 가정.
+        matcher = self.get_compiled_matcher(use_exact_match, case_sensitive)
+        if matcher is None:
+            return text
+        return matcher.apply(text)
 
     def get_loaded_glossary_paths(self):
         return list(self.glossaries.keys())
\ No newline at end of file
@@ -0,0 +1,82 @@
+# core/glossary_matcher.py
+import re
+
+
+def _build_trie(keys):
+    """키 목록으로 문자 단위 트라이를 만듭니다. 빈 문자열 키("")는 단어 끝 표시입니다."""
+    root = {}
+    for key in keys:
+        node = root
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[""] = True
+    return root
+
+
+def _trie_to_pattern(node):
+    """
+    트라이를 정규식으로 변환합니다.
+    자식이 하나뿐인 구간은 그룹 없이 이어 붙이고, 단어 끝이면서 더 긴 용어가 있는 지점은
+    탐욕적 (?:...)? 로 만들어 같은 위치에서 가장 긴 용어를 먼저 시도하게 합니다.
+    """
+    terminal = "" in node
+    branches = [re.escape(ch) + _trie_to_pattern(child)
+                for ch, child in sorted(node.items(), key=lambda item: item[0]) if ch != ""]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not terminal:
+        return branches[0]
+    pattern = "(?:" + "|".join(branches) + ")"
+    if terminal:
+        pattern += "?"
+    return pattern
+
+
+class GlossaryMatcher:
+    """
+    용어집 전체를 하나의 정규식(트라이 기반)으로 컴파일하여 텍스트를 한 번의 패스로 치환합니다.
+    같은 위치에서는 가장 긴 용어가 우선하며, use_exact_match/case_sensitive 옵션은
+    기존 용어별 re.sub 방식과 같은 의미를 가집니다.
+    pattern: 같은 용어/옵션으로 이전에 만든 정규식 문자열 (디스크 캐시). 주어지면 트라이 구성을 건너뜁니다.
+    """
+    def __init__(self, terms, use_exact_match=True, case_sensitive=False, pattern=None):
+        self.use_exact_match = use_exact_match
+        self.case_sensitive = case_sensitive
+        self.replacements = {}
+        for original, translated in terms.items():
+            if not original:
+                continue
+            key = original if case_sensitive else original.lower()
+            # 대소문자 무시 시 같은 키가 여럿이면 먼저 나온 용어가 적용됨 (기존 동작과 동일)
+            self.replacements.setdefault(key, translated)
+        self.regex = self._compile(pattern) if self.replacements else None
+
+    def _compile(self, pattern=None):
+        flags = 0 if self.case_sensitive else re.IGNORECASE
+        if pattern:
+            try:
+                return re.compile(pattern, flags)
+            except re.error:
+                pass # 캐시된 패턴이 손상된 경우 새로 만듦
+        boundary = r"\b" if self.use_exact_match else ""
+        try:
+            body = _trie_to_pattern(_build_trie(self.replacements))
+            return re.compile(f"{boundary}(?:{body}){boundary}", flags)
+        except (re.error, RecursionError, OverflowError):
+            # 트라이 패턴이 너무 깊거나 큰 경우: 길이 내림차순 단순 교대식으로 대체
+            sorted_keys = sorted(self.replacements, key=len, reverse=True)
+            body = "|".join(re.escape(k) for k in sorted_keys)
+            return re.compile(f"{boundary}(?:{body}){boundary}", flags)
+
+    def _replace_match(self, match):
+        matched = match.group(0)
+        key = matched if self.case_sensitive else matched.lower()
+        return self.replacements.get(key, matched)
+
+    def apply(self, text):
+        if self.regex is None or not text:
+            return text
+        return self.regex.sub(self._replace_match, text)
+
+    def __len__(self):
+        return len(self.replacements)
@@ -0,0 +1,58 @@
+# core/hedging.py
+import math
+
+# 작업의 마지막 HEDGE_TAIL_FRACTION 구간에 남은 청크만 중복 요청 대상
+HEDGE_TAIL_FRACTION = 0.05
+# 완료된 청크 지연 시간의 이 백분위수를 넘겨 실행 중인 청크를 느린 청크로 봄
+HEDGE_LATENCY_PERCENTILE = 0.95
+HEDGE_MIN_SAMPLES = 5       # 백분위수를 믿을 수 있을 만큼 완료된 청크 수
+HEDGE_MIN_DELAY = 2.0       # 초. 이보다 빨리 중복 요청하지 않음 (짧은 작업에서 불필요한 중복 방지)
+HEDGE_CHECK_INTERVAL = 0.25 # 초. 결과 대기 중 느린 청크를 확인하는 간격
+
+
+def percentile(sorted_values, fraction):
+    """정렬된 값 목록의 백분위수 (최근접 순위 방식). 값이 없으면 None."""
+    if not sorted_values:
+        return None
+    rank = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class HedgeTracker:
+    """
+    꼬리 지연(tail latency) 청크의 중복(hedged) 요청 여부를 판단합니다.
+    작업이 거의 끝나 남은 청크가 적을 때, 완료된 청크 지연 시간의 백분위수보다 오래 실행 중인 청크에
+    한 번만 같은 요청을 더 보내고 먼저 도착한 응답을 사용합니다.
+    추가 비용은 budget_fraction(전체 청크 수 대비 중복 요청 비율)으로 제한됩니다. 0이면 사용 안 함.
+    결과 처리 루프 한 곳에서만 사용하므로 잠금이 없습니다.
+    """
+    def __init__(self, total_chunks, budget_fraction):
+        self.max_hedges = math.ceil(total_chunks * budget_fraction) if budget_fraction and budget_fraction > 0 else 0
+        self.hedges_sent = 0
+        self._latencies = []
+        self._hedged_chunks = set()
+
+    @property
+    def enabled(self):
+        return self.max_hedges > 0
+
+    def record_latency(self, seconds):
+        self._latencies.append(seconds)
+
+    def threshold(self):
+        """중복 요청을 보낼 실행 시간 기준(초). 표본이 부족하면 None."""
+        if len(self._latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        return max(HEDGE_MIN_DELAY, percentile(sorted(self._latencies), HEDGE_LATENCY_PERCENTILE))
+
+    def should_hedge(self, chunk_index, running_seconds, remaining_chunks, total_chunks):
+        if self.hedges_sent >= self.max_hedges or chunk_index in self._hedged_chunks:
+            return False
+        if remaining_chunks > max(1, math.ceil(total_chunks * HEDGE_TAIL_FRACTION)):
+            return False
+        threshold = self.threshold()
+        return threshold is not None and running_seconds >= threshold
+
+    def note_hedge(self, chunk_index):
+        self.hedges_sent += 1
+        self._hedged_chunks.add(chunk_index)
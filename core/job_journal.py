@@ -0,0 +1,143 @@
+# core/job_journal.py
+import hashlib
+import json
+import os
+import threading
+import time
+
+from core.config_manager import USER_DATA_DIR
+
+JOURNALS_DIR = os.path.join(USER_DATA_DIR, "journals")
+JOURNAL_VERSION = 1
+
+# 완료된 청크 기록은 메모리에 모았다가 일정 개수/시간마다 한 번에 디스크에 씀 (핫 패스에서 매번 fsync하지 않음)
+JOURNAL_FLUSH_EVERY_CHUNKS = 20
+JOURNAL_FLUSH_INTERVAL = 2.0 # 초
+
+
+def _sha256(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class JobJournal:
+    """
+    번역 작업 하나의 체크포인트 기록 (JSONL, USER_DATA_DIR/journals/<job_id>.jsonl).
+    첫 줄은 작업 정보(헤더), 이후 완료된 청크마다 한 줄:
+        {"chunk": 청크 번호, "source_hash": 청크 원문 해시, "lines": [[줄 해시, 번역 줄], ...], "model": 번역한 모델}
+    번역 줄은 태그 토큰 상태(복원 전)이며, 이어하기 시 청크 경계가 달라져도 줄 해시로 적용됩니다.
+    프로그램이 도중에 종료되어 마지막 줄이 잘려 있으면 그 줄만 무시합니다.
+    """
+    def __init__(self, job_id, journals_dir=JOURNALS_DIR):
+        self.job_id = job_id
+        self.path = os.path.join(journals_dir, f"{job_id}.jsonl")
+        self._file = None
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def job_id_for(full_text, model_id, prompt_template):
+        """
+        같은 원문/모델/프롬프트의 작업은 같은 ID를 가지므로 다시 번역할 때 기록을 찾을 수 있습니다.
+        full_text는 문자열 또는 줄 시퀀스(줄 보기 등, 통째로 합치지 않고 줄 단위로 해시)입니다.
+        """
+        digest = hashlib.sha256(f"{model_id}\x00{prompt_template or ''}\x00".encode("utf-8"))
+        if isinstance(full_text, str):
+            digest.update(full_text.encode("utf-8"))
+        else:
+            for line in full_text:
+                digest.update(line.encode("utf-8"))
+        return digest.hexdigest()[:24]
+
+    @staticmethod
+    def line_key(preprocessed_text):
+        return _sha256(preprocessed_text)[:20]
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        """기록된 번역 줄을 {줄 해시: 번역 줄}로 반환합니다. 기록이 없거나 읽을 수 없으면 빈 딕셔너리."""
+        completed = {}
+        if not self.exists():
+            return completed
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                header = f.readline()
+                if not header or json.loads(header).get("version") != JOURNAL_VERSION:
+                    return completed
+                for raw_line in f:
+                    try:
+                        record = json.loads(raw_line)
+                    except ValueError:
+                        break # 기록 도중 종료되어 잘린 마지막 줄
+                    for key, translation in record.get("lines", []):
+                        completed[key] = translation
+        except (OSError, ValueError) as e:
+            print(f"경고: 작업 기록을 읽을 수 없습니다 ({self.path}): {e}")
+        return completed
+
+    def start(self, header_info=None):
+        """기록 파일을 추가 모드로 엽니다. 새 파일이면 헤더를 씁니다."""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            is_new = not self.exists()
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if is_new:
+                header = {"version": JOURNAL_VERSION, "job_id": self.job_id, "created": int(time.time())}
+                header.update(header_info or {})
+                self._file.write(json.dumps(header, ensure_ascii=False) + "\n")
+                self._file.flush()
+        except OSError as e:
+            print(f"경고: 작업 기록 파일을 열 수 없습니다 ({self.path}): {e}. 기록 없이 진행합니다.")
+            self._file = None
+
+    def record_chunk(self, chunk_index, source_text, line_pairs, model_id=None):
+        """완료된 청크를 기록합니다. line_pairs: [(줄 해시, 번역 줄), ...], model_id: 청크를 번역한 모델 (폴백 포함)"""
+        if self._file is None:
+            return
+        record = {"chunk": chunk_index, "source_hash": _sha256(source_text)[:20], "lines": line_pairs}
+        if model_id:
+            record["model"] = model_id
+        with self._lock:
+            self._buffer.append(json.dumps(record, ensure_ascii=False))
+            if (len(self._buffer) >= JOURNAL_FLUSH_EVERY_CHUNKS or
+                    time.monotonic() - self._last_flush >= JOURNAL_FLUSH_INTERVAL):
+                self._flush_locked()
+
+    def _flush_locked(self):
+        self._last_flush = time.monotonic()
+        if not self._buffer or self._file is None:
+            return
+        try:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            print(f"경고: 작업 기록 저장 실패 ({self.path}): {e}")
+        self._buffer = []
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        """남은 기록을 쓰고 파일을 닫습니다 (기록은 이어하기를 위해 남겨 둠)."""
+        with self._lock:
+            self._flush_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def discard(self):
+        """작업이 끝까지 완료되면 기록을 삭제합니다."""
+        with self._lock:
+            self._buffer = []
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        try:
+            if self.exists():
+                os.remove(self.path)
+        except OSError as e:
+            print(f"경고: 작업 기록 삭제 실패 ({self.path}): {e}")
@@ -0,0 +1,135 @@
+# core/job_metrics.py
+import csv
+import json
+import os
+import threading
+import time
+
+from core.config_manager import USER_DATA_DIR
+from core.hedging import percentile
+
+REPORTS_DIR = os.path.join(USER_DATA_DIR, "reports")
+
+# 청크별로 기록하는 값 (CSV 보고서의 열 순서)
+CHUNK_FIELDS = ("chunk", "model", "lines", "outcome", "queue_wait", "api_latency", "retries",
+                "prompt_tokens", "response_tokens", "postprocess")
+# 백분위수를 계산하는 시간 값 (초)
+TIMING_FIELDS = ("queue_wait", "api_latency", "postprocess")
+PERCENTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+
+
+class JobMetrics:
+    """
+    번역 작업 하나의 성능 지표.
+    청크마다 대기열 대기 시간(제출 → 첫 API 호출), API 지연 시간(모든 시도의 합), 재시도 횟수,
+    usage_metadata의 프롬프트/응답 토큰, 후처리 시간(검증/분배/번역 메모리/기록)을 모으고,
+    용어집 적용 같은 작업 밖 단계의 시간은 add_stage_time으로 더합니다.
+    summary()는 p50/p95/p99와 초당 줄 수를 계산하며, write_report()는 JSON 또는 CSV(확장자 기준)로 저장합니다.
+    """
+    def __init__(self, label=""):
+        self.label = label
+        self.model_id = None
+        self.total_lines = 0
+        self.unique_lines = 0
+        self.status = None
+        self._chunks = []
+        self._stage_times = {}
+        self._started_at = time.monotonic()
+        self._started_wall = time.time()
+        self._finished_at = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        self._started_at = time.monotonic()
+        self._started_wall = time.time()
+        self._finished_at = None
+
+    def set_job_info(self, model_id, total_lines, unique_lines):
+        self.model_id = model_id
+        self.total_lines = total_lines
+        self.unique_lines = unique_lines
+
+    def record_chunk(self, **values):
+        """CHUNK_FIELDS의 값을 키워드 인자로 받습니다 (없는 값은 None)."""
+        row = {field: values.get(field) for field in CHUNK_FIELDS}
+        for field in TIMING_FIELDS:
+            if row[field] is not None:
+                row[field] = round(row[field], 4)
+        with self._lock:
+            self._chunks.append(row)
+
+    def add_stage_time(self, stage, seconds):
+        with self._lock:
+            self._stage_times[stage] = self._stage_times.get(stage, 0.0) + seconds
+
+    def finish(self, status):
+        self.status = status
+        self._finished_at = time.monotonic()
+
+    def summary(self):
+        with self._lock:
+            chunks = list(self._chunks)
+            stage_times = dict(self._stage_times)
+        wall_seconds = (self._finished_at or time.monotonic()) - self._started_at
+        result = {
+            "label": self.label,
+            "model": self.model_id,
+            "status": self.status,
+            "started": int(self._started_wall),
+            "wall_seconds": round(wall_seconds, 3),
+            "total_lines": self.total_lines,
+            "unique_lines": self.unique_lines,
+            "lines_per_second": round(self.total_lines / wall_seconds, 1) if wall_seconds > 0 else None,
+            "chunks": len(chunks),
+            "retries": sum(row["retries"] or 0 for row in chunks),
+            "prompt_tokens": sum(row["prompt_tokens"] or 0 for row in chunks),
+            "response_tokens": sum(row["response_tokens"] or 0 for row in chunks),
+            "models": {},
+            "stage_seconds": {stage: round(seconds, 3) for stage, seconds in stage_times.items()},
+        }
+        for row in chunks:
+            if row["model"]:
+                result["models"][row["model"]] = result["models"].get(row["model"], 0) + 1
+        for field in TIMING_FIELDS:
+            values = sorted(row[field] for row in chunks if row[field] is not None)
+            result[field] = {name: (round(percentile(values, fraction), 3) if values else None)
+                             for name, fraction in PERCENTILES}
+            result[field]["total"] = round(sum(values), 3)
+        return result
+
+    def format_summary(self, summary=None):
+        """요약 패널/상태 표시용 짧은 문자열."""
+        s = summary or self.summary()
+
+        def _p(field):
+            values = s[field]
+            if values["p50"] is None:
+                return "-"
+            return f"{values['p50']:.2f}/{values['p95']:.2f}/{values['p99']:.2f}초"
+
+        stage_text = ", ".join(f"{stage} {seconds:.2f}초" for stage, seconds in s["stage_seconds"].items())
+        return (
+            f"{s['total_lines']}줄 {s['wall_seconds']:.1f}초 ({s['lines_per_second'] or 0}줄/초), "
+            f"청크 {s['chunks']}개, 재시도 {s['retries']}회, 토큰 입력 {s['prompt_tokens']} / 출력 {s['response_tokens']}\n"
+            f"p50/p95/p99 — API {_p('api_latency')}, 대기 {_p('queue_wait')}, 후처리 {_p('postprocess')}"
+            + (f"\n{stage_text}" if stage_text else "")
+        )
+
+    def write_report(self, path=None):
+        """보고서를 저장하고 경로를 반환합니다. path가 없으면 REPORTS_DIR에 JSON으로 저장합니다."""
+        if path is None:
+            path = os.path.join(REPORTS_DIR, time.strftime("job_%Y%m%d_%H%M%S.json", time.localtime(self._started_wall)))
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            chunks = list(self._chunks)
+        if path.lower().endswith(".csv"):
+            with open(path, "w", encoding="utf-8-sig", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=CHUNK_FIELDS)
+                writer.writeheader()
+                writer.writerows(chunks)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"summary": self.summary(), "chunks": chunks}, f, ensure_ascii=False, indent=2)
+        return path
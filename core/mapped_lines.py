@@ -0,0 +1,92 @@
+# core/mapped_lines.py
+import codecs
+import mmap
+from array import array
+
+# 줄바꿈 바이트(0x0A)가 멀티바이트 문자 안에 나타나지 않는 인코딩만 바이트 단위로 줄을 나눌 수 있음
+# (cp949의 두 번째 바이트는 0x41 이상, utf-8의 연속 바이트는 0x80 이상)
+BYTE_LINE_ENCODINGS = ("utf-8", "utf-8-sig", "cp949", "euc-kr", "cp1252", "latin-1")
+
+SCAN_BLOCK_SIZE = 1024 * 1024
+
+
+class MappedLineFile:
+    """
+    파일을 메모리 매핑하여 줄 단위로 접근하는 읽기 전용 시퀀스.
+    처음 열 때 한 번 훑어 줄 시작 오프셋만 만들고(디코딩 검증 포함), 줄 텍스트는 요청할 때 디코딩합니다.
+    각 줄은 줄바꿈 문자를 포함하며(str.splitlines(keepends=True)와 같은 모양), 줄은 '\\n' 기준으로 나눕니다.
+    """
+    def __init__(self, filepath, encoding, cancel_event=None):
+        if encoding.lower() not in BYTE_LINE_ENCODINGS:
+            raise ValueError(f"메모리 매핑 줄 보기를 지원하지 않는 인코딩입니다: {encoding}")
+        self.filepath = filepath
+        self.encoding = "utf-8" if encoding.lower() == "utf-8-sig" else encoding
+        self._file = open(filepath, "rb")
+        self._mm = None
+        self._offsets = array("Q")
+        self._end = 0
+        try:
+            self._index(encoding.lower() == "utf-8-sig", cancel_event)
+        except BaseException:
+            self.close()
+            raise
+
+    def _index(self, skip_bom, cancel_event):
+        size = self._file.seek(0, 2)
+        if size == 0: # 빈 파일은 mmap할 수 없음
+            return
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._end = size
+        start = len(codecs.BOM_UTF8) if skip_bom and self._mm[:3] == codecs.BOM_UTF8 else 0
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="strict")
+        offsets = self._offsets
+        offsets.append(start)
+        block_start = start
+        while block_start < size:
+            if cancel_event and cancel_event.is_set():
+                raise InterruptedError("줄 색인 중 취소됨")
+            block_end = min(size, block_start + SCAN_BLOCK_SIZE)
+            decoder.decode(self._mm[block_start:block_end]) # 인코딩 검증만 하고 결과는 버림 (메모리 일정)
+            pos = self._mm.find(b"\n", block_start, block_end)
+            while pos != -1:
+                offsets.append(pos + 1)
+                pos = self._mm.find(b"\n", pos + 1, block_end)
+            block_start = block_end
+        decoder.decode(b"", final=True)
+        if offsets[-1] == size: # 마지막 줄이 줄바꿈으로 끝나면 빈 마지막 줄은 만들지 않음
+            offsets.pop()
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def _line_at(self, index):
+        start = self._offsets[index]
+        end = self._offsets[index + 1] if index + 1 < len(self._offsets) else self._end
+        return self._mm[start:end].decode(self.encoding)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._line_at(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("줄 번호가 범위를 벗어났습니다.")
+        return self._line_at(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._line_at(index)
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
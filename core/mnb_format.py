@@ -0,0 +1,31 @@
+# core/mnb_format.py
+import re
+
+# Warband 번역 파일의 "ID|텍스트" 줄 (예: dlga_start:close_window|Farewell., qstr_Hello|Hello, itm_sword_pl|Swords)
+# ID는 영문자로 시작하고 '_'를 포함하며 공백/파이프가 없음. 첫 번째 파이프까지를 ID 필드로 봄
+ID_FIELD_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9]*_[^|\s]*\|")
+
+# 게임이 번역하지 않는 문자열 표시 ({!}로 시작하는 텍스트)
+NO_TRANSLATE_MARKER = "{!}"
+
+
+def split_line(line, parse_id_fields=True):
+    """
+    한 줄을 (ID 필드, 본문, 줄바꿈)으로 나눕니다. 세 부분을 이어 붙이면 원래 줄과 정확히 같습니다.
+    parse_id_fields가 False이거나 ID 필드가 없으면 ID 필드는 빈 문자열입니다.
+    """
+    body = line.rstrip("\r\n")
+    line_ending = line[len(body):]
+    prefix = ""
+    if parse_id_fields:
+        match = ID_FIELD_PATTERN.match(body)
+        if match:
+            prefix = body[:match.end()]
+            body = body[match.end():]
+    return prefix, body, line_ending
+
+
+def is_translatable(body):
+    """빈 본문이나 {!}로 시작하는 본문은 번역하지 않습니다."""
+    stripped = body.strip()
+    return bool(stripped) and not stripped.startswith(NO_TRANSLATE_MARKER)
@@ -0,0 +1,60 @@
+# core/model_router.py
+import threading
+
+# 한 모델에서 재시도를 모두 소진한 청크가 연속으로 이만큼 나오면 작업이 끝날 때까지 그 모델을 건너뜀
+MODEL_TRIP_FAILURES = 3
+
+
+class ModelRouter:
+    """
+    작업 하나의 모델 폴백 경로 (예: 2.5 Flash → 2.0 Flash → 2.0 Flash Lite).
+    청크는 자신의 단계(chunk_info["model_level"])와 차단되지 않은 첫 단계 중 더 뒤쪽 모델을 사용합니다.
+    모델은 요청을 실제로 시작할 때 정하므로, 한 모델이 차단되면 아직 시작하지 않은 청크도 바로 다음 모델로 갑니다.
+    component_factory(model_id) -> (동시성 컨트롤러, 레이트 리미터)는 모델별로 한 번만 호출됩니다.
+    """
+    def __init__(self, chain, component_factory):
+        self.chain = list(chain)
+        self._component_factory = component_factory
+        self._components = {}
+        self._floor = 0 # 이 단계 앞의 모델은 차단됨
+        self._consecutive_failures = {}
+        self._lock = threading.Lock()
+
+    @property
+    def primary_model(self):
+        return self.chain[0]
+
+    def model_for(self, chunk_info):
+        with self._lock:
+            return self.chain[max(chunk_info.get("model_level", 0), self._floor)]
+
+    def components(self, model_id):
+        with self._lock:
+            components = self._components.get(model_id)
+            if components is None:
+                components = self._component_factory(model_id)
+                self._components[model_id] = components
+            return components
+
+    def next_level(self, model_id):
+        """model_id 다음 폴백 단계 번호. 더 없으면 None."""
+        level = self.chain.index(model_id) + 1 if model_id in self.chain else len(self.chain)
+        return level if level < len(self.chain) else None
+
+    def report_success(self, model_id):
+        with self._lock:
+            self._consecutive_failures[model_id] = 0
+
+    def report_failure(self, model_id):
+        """
+        재시도를 모두 소진한 실패를 기록합니다.
+        이번 실패로 모델이 차단되었으면 다음 모델 ID를 반환합니다 (그 외에는 None).
+        """
+        with self._lock:
+            failures = self._consecutive_failures.get(model_id, 0) + 1
+            self._consecutive_failures[model_id] = failures
+            level = self.chain.index(model_id) if model_id in self.chain else -1
+            if failures < MODEL_TRIP_FAILURES or level != self._floor or level + 1 >= len(self.chain):
+                return None
+            self._floor = level + 1
+            return self.chain[self._floor]
@@ -0,0 +1,195 @@
+# core/profiler.py
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+from core.config_manager import USER_DATA_DIR
+
+PROFILE_ENV_NAME = "MNB_PROFILE" # 설정 파일보다 우선 (예: MNB_PROFILE=spans,cprofile)
+PROFILE_SPANS = "spans"             # 단계별 실행 시간만 집계
+PROFILE_CPROFILE = "cprofile"       # capture 구간을 cProfile로 기록 (.prof, snakeviz/pstats로 열기)
+PROFILE_TRACEMALLOC = "tracemalloc" # capture 구간의 메모리 할당 상위 위치 기록
+PROFILES_DIR = os.path.join(USER_DATA_DIR, "reports")
+TRACEMALLOC_TOP_LINES = 25
+
+
+class _NullSpan:
+    """프로파일링이 꺼져 있을 때의 구간 (아무것도 하지 않음)."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "started_at")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.started_at = None
+
+    def __enter__(self):
+        self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.name, time.perf_counter() - self.started_at)
+        return False
+
+
+class Profiler:
+    """
+    이름 있는 구간(span)의 실행 시간을 단조 시계로 재서 이름별로 (횟수, 합계, 최대)를 모읍니다.
+    꺼져 있으면 span()은 빈 구간을 돌려주므로 호출 비용만 남습니다.
+    capture()로 감싼 구간은 설정에 따라 cProfile/tracemalloc 결과를 PROFILES_DIR에 저장합니다.
+    (cProfile은 capture를 호출한 스레드만 기록하므로, 워커 스레드의 시간은 구간 집계로 확인)
+    여러 워커 스레드에서 호출되므로 잠금으로 보호합니다.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.use_cprofile = False
+        self.use_tracemalloc = False
+        self._spans = {} # 이름 -> [횟수, 합계(초), 최대(초)]
+        self._lock = threading.Lock()
+
+    def configure(self, mode):
+        """mode: 쉼표로 구분한 PROFILE_SPANS/PROFILE_CPROFILE/PROFILE_TRACEMALLOC (빈 값이면 끔)."""
+        options = {option.strip().lower() for option in (mode or "").split(",") if option.strip()}
+        options.discard("0")
+        self.use_cprofile = PROFILE_CPROFILE in options
+        self.use_tracemalloc = PROFILE_TRACEMALLOC in options
+        self.enabled = bool(options)
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, seconds):
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                self._spans[name] = [1, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                if seconds > stats[2]:
+                    stats[2] = seconds
+
+    def snapshot(self):
+        """[(이름, 횟수, 합계, 최대)]를 합계가 큰 순서로 반환합니다."""
+        with self._lock:
+            rows = [(name, count, total, longest) for name, (count, total, longest) in self._spans.items()]
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._spans = {}
+
+    def format_report(self):
+        rows = self.snapshot()
+        if not rows:
+            return "프로파일: 기록된 구간 없음"
+        return "프로파일 (구간별 합계):\n" + "\n".join(
+            f"  {name}: {total:.3f}초 ({count}회, 최대 {longest:.3f}초)" for name, count, total, longest in rows)
+
+    def write_report(self, label="job"):
+        """구간 집계를 JSON으로 저장하고 경로를 반환합니다."""
+        path = os.path.join(PROFILES_DIR, f"profile_{label}_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        os.makedirs(PROFILES_DIR, exist_ok=True)
+        spans = [{"name": name, "count": count, "total_seconds": round(total, 4), "max_seconds": round(longest, 4)}
+                 for name, count, total, longest in self.snapshot()]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"label": label, "spans": spans}, f, ensure_ascii=False, indent=2)
+        return path
+
+    def capture(self, label):
+        """감싼 구간의 cProfile(.prof)/tracemalloc(상위 할당 위치) 결과를 저장합니다. 둘 다 꺼져 있으면 아무것도 하지 않음."""
+        if not self.enabled or not (self.use_cprofile or self.use_tracemalloc):
+            return _NULL_SPAN
+        return _Capture(self, label)
+
+
+class _Capture:
+    def __init__(self, profiler, label):
+        self.profiler = profiler
+        self.label = label
+        self._cprofile = None
+        self._started_tracemalloc = False
+        self.output_paths = []
+
+    def __enter__(self):
+        if self.profiler.use_tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.profiler.use_cprofile:
+            self._cprofile = cProfile.Profile()
+            try:
+                self._cprofile.enable()
+            except ValueError: # 다른 프로파일러가 이미 동작 중 (capture 중첩 등)
+                self._cprofile = None
+        return self
+
+    def __exit__(self, *exc_info):
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        try:
+            if self._cprofile is not None:
+                self._cprofile.disable()
+                os.makedirs(PROFILES_DIR, exist_ok=True)
+                path = os.path.join(PROFILES_DIR, f"profile_{self.label}_{stamp}.prof")
+                self._cprofile.dump_stats(path)
+                self.output_paths.append(path)
+            if tracemalloc.is_tracing() and self.profiler.use_tracemalloc:
+                statistics = tracemalloc.take_snapshot().statistics("lineno")[:TRACEMALLOC_TOP_LINES]
+                _current, peak = tracemalloc.get_traced_memory()
+                os.makedirs(PROFILES_DIR, exist_ok=True)
+                path = os.path.join(PROFILES_DIR, f"memory_{self.label}_{stamp}.txt")
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(f"최대 추적 메모리: {peak / (1024 * 1024):.1f} MiB\n")
+                    f.writelines(f"{stat}\n" for stat in statistics)
+                self.output_paths.append(path)
+        except OSError as e:
+            print(f"경고: 프로파일 결과 저장 실패: {e}")
+        finally:
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+        return False
+
+
+_profiler = Profiler()
+_profiler.configure(os.environ.get(PROFILE_ENV_NAME))
+
+
+def get_profiler():
+    """프로세스 전체에서 공유하는 Profiler."""
+    return _profiler
+
+
+def configure_profiler(config_mode=None):
+    """환경 변수 PROFILE_ENV_NAME이 있으면 그 값을, 없으면 설정 파일 값을 사용합니다."""
+    _profiler.configure(os.environ.get(PROFILE_ENV_NAME) or config_mode)
+    return _profiler
+
+
+def profile_span(name):
+    return _profiler.span(name)
+
+
+def profiled(name):
+    """함수 전체를 구간 name으로 재는 데코레이터."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with _profiler.span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
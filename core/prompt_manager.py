@@ -22,7 +22,7 @@ class PromptManager:
             self.prompts = [
                 {
                     "id": "fallback_generic", "name": "기본 번역 (태그 보호)", "description": "가장 기본적인 번역을 수행합니다.",
-                    "template": "Translate the following English text to Korean. Preserve any special placeholders (e.g., __MNBTAG_...__) exactly.\n\nEnglish:\n{text_to_translate}\n\nKorean:"
+                    "template": "Translate the following English text to Korean. Preserve placeholder tokens such as [#0] or [#1] exactly. Output exactly one translated line for each input line, in the same order, without adding or removing lines.\n\nEnglish:\n{text_to_translate}\n\nKorean:"
                 }
             ]
 
@@ -0,0 +1,101 @@
+# core/rate_limiter.py
+import threading
+import time
+
+RATE_LIMIT_HEADROOM = 0.9 # 할당량의 90%로 유지하여 429가 나기 직전에서 처리량을 고정
+
+
+class TokenBucket:
+    """
+    분당 용량(per_minute)을 초당 속도로 채우는 토큰 버킷.
+    예약은 즉시 차감하고(잔량이 음수가 될 수 있음) 필요한 대기 시간을 돌려주는 방식이라
+    여러 스레드가 동시에 예약해도 순서대로 간격이 벌어집니다.
+    """
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate_per_second = self.capacity / 60.0
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self, now):
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_second)
+            self._updated_at = now
+
+    def reserve(self, amount, now):
+        """amount만큼 예약하고, 예약이 유효해질 때까지 기다려야 하는 시간(초)을 반환합니다."""
+        self._refill(now)
+        self._tokens -= amount
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate_per_second
+
+    def adjust(self, delta, now):
+        """예약량을 실제 사용량에 맞춰 보정합니다 (delta > 0이면 추가 차감, < 0이면 반환)."""
+        self._refill(now)
+        self._tokens = min(self.capacity, self._tokens - delta)
+
+
+class ModelRateLimiter:
+    """모델 하나의 RPM/TPM 버킷. rpm/tpm이 없거나 0이면 해당 버킷은 사용하지 않습니다."""
+    def __init__(self, rpm=None, tpm=None, headroom=RATE_LIMIT_HEADROOM):
+        self._lock = threading.Lock()
+        self.configure(rpm, tpm, headroom)
+
+    def configure(self, rpm=None, tpm=None, headroom=RATE_LIMIT_HEADROOM):
+        with self._lock:
+            self.rpm, self.tpm = rpm, tpm
+            self._request_bucket = TokenBucket(rpm * headroom) if rpm else None
+            self._token_bucket = TokenBucket(tpm * headroom) if tpm else None
+
+    @property
+    def enabled(self):
+        return self._request_bucket is not None or self._token_bucket is not None
+
+    def reserve(self, estimated_tokens=0):
+        """요청 1건과 추정 토큰만큼 예약하고, 기다려야 하는 시간(초)을 반환합니다 (직접 대기하지 않음)."""
+        if not self.enabled:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            wait = 0.0
+            if self._request_bucket:
+                wait = max(wait, self._request_bucket.reserve(1, now))
+            if self._token_bucket and estimated_tokens:
+                wait = max(wait, self._token_bucket.reserve(estimated_tokens, now))
+        return wait
+
+    def acquire(self, estimated_tokens=0, cancel_event=None):
+        """reserve 후 필요한 만큼 기다립니다. 대기 중 취소되면 False."""
+        wait = self.reserve(estimated_tokens)
+        if wait <= 0:
+            return True
+        if cancel_event:
+            return not cancel_event.wait(wait)
+        time.sleep(wait)
+        return True
+
+    def record_usage(self, estimated_tokens, actual_tokens):
+        """응답의 실제 토큰 수로 TPM 버킷을 보정합니다."""
+        if not self._token_bucket or actual_tokens is None:
+            return
+        with self._lock:
+            self._token_bucket.adjust(actual_tokens - estimated_tokens, time.monotonic())
+
+
+# 모델 ID별 공유 리미터 (모든 작업/워커가 같은 버킷을 사용)
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(model_id, rpm=None, tpm=None):
+    """모델별 리미터를 반환합니다. 설정값이 바뀌었으면 버킷을 새 값으로 다시 만듭니다."""
+    with _limiters_lock:
+        limiter = _limiters.get(model_id)
+        if limiter is None:
+            limiter = ModelRateLimiter(rpm, tpm)
+            _limiters[model_id] = limiter
+        elif (limiter.rpm, limiter.tpm) != (rpm, tpm):
+            limiter.configure(rpm, tpm)
+        return limiter
@@ -0,0 +1,55 @@
+# core/tag_codec.py
+import re
+
+# 보호 대상 M&B 플레이스홀더를 하나의 교대식으로 찾음
+#  - 중괄호 태그 전체: {s0}, {s10}, {reg3}, {reg3?her:him}, {playername}, {player_name}, {!} 등
+#  - ^ (게임 내 줄바꿈)
+#  - 원문에 이미 토큰과 같은 모양([#0])이 있으면 그것도 보호하여 복원 시 충돌하지 않게 함
+_TAG_PATTERN = re.compile(r"\{[^{}\r\n]*\}|\^|\[#\d+\]")
+
+# 모델이 토큰 안에 공백을 넣는 경우([# 0], [ #0 ])도 복원
+_TOKEN_PATTERN = re.compile(r"\[\s*#\s*(\d+)\s*\]")
+
+TAG_TOKEN_FORMAT = "[#{}]"
+
+
+def encode_tags(text):
+    """
+    텍스트의 M&B 플레이스홀더를 짧은 번호 토큰([#0], [#1], ...)으로 바꿉니다.
+    같은 태그는 같은 번호를 받습니다.
+    반환: (변환된 텍스트, 복원 맵). 복원 맵은 토큰 번호 -> 원래 태그 목록이며 태그가 없으면 빈 목록입니다.
+    """
+    restore_map = []
+    token_by_tag = {}
+
+    def _to_token(match):
+        tag = match.group(0)
+        index = token_by_tag.get(tag)
+        if index is None:
+            index = len(restore_map)
+            token_by_tag[tag] = index
+            restore_map.append(tag)
+        return TAG_TOKEN_FORMAT.format(index)
+
+    encoded = _TAG_PATTERN.sub(_to_token, text)
+    return encoded, restore_map
+
+
+def decode_tags(text, restore_map):
+    """encode_tags의 복원 맵으로 토큰을 원래 태그로 되돌립니다. 맵에 없는 번호의 토큰은 그대로 둡니다."""
+    if not restore_map or "#" not in text:
+        return text
+
+    def _to_tag(match):
+        index = int(match.group(1))
+        return restore_map[index] if index < len(restore_map) else match.group(0)
+
+    return _TOKEN_PATTERN.sub(_to_tag, text)
+
+
+
+def token_ids_in(text):
+    """텍스트에 들어 있는 태그 토큰 번호의 집합 (번역 결과의 플레이스홀더 검증용)."""
+    if "#" not in text:
+        return frozenset()
+    return frozenset(int(index) for index in _TOKEN_PATTERN.findall(text))
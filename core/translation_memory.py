@@ -0,0 +1,157 @@
+# core/translation_memory.py
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from core.config_manager import USER_DATA_DIR, DEFAULT_TRANSLATION_MEMORY_MAX_ENTRIES
+
+TRANSLATION_MEMORY_FILE_NAME = "translation_memory.sqlite3"
+TRANSLATION_MEMORY_DB_PATH = os.path.join(USER_DATA_DIR, TRANSLATION_MEMORY_FILE_NAME)
+
+# SQLite 한 문장에 바인딩할 수 있는 변수 수 제한(기본 999)보다 작게 유지
+_LOOKUP_BATCH_SIZE = 500
+# 상한 초과 시 한 번에 조금 더 지워서 매 저장마다 정리가 일어나지 않도록 함
+_EVICTION_SLACK_RATIO = 0.1
+
+
+class TranslationMemory:
+    """
+    디스크 기반 번역 메모리 (SQLite).
+    키: 전처리된 원문 줄 + 모델 ID + 프롬프트 템플릿 해시
+    값: 태그 토큰 상태의 번역 줄 (태그 복원/용어집 적용 전, 위치별 복원 맵으로 복원)
+    항목 수가 max_entries를 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다.
+    """
+    def __init__(self, db_path=TRANSLATION_MEMORY_DB_PATH, max_entries=DEFAULT_TRANSLATION_MEMORY_MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max(1, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._entry_count = 0
+        self._open()
+
+    def _open(self):
+        try:
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir and not os.path.exists(db_dir):
+                os.makedirs(db_dir)
+            # 워커 스레드들이 공유하므로 check_same_thread=False, 접근은 self._lock으로 직렬화
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tm ("
+                " key TEXT PRIMARY KEY,"
+                " translation TEXT NOT NULL,"
+                " model_id TEXT,"
+                " last_used INTEGER NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tm_last_used ON tm(last_used)")
+            self._conn.commit()
+            self._entry_count = self._conn.execute("SELECT COUNT(*) FROM tm").fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"경고: 번역 메모리를 열 수 없습니다 ({self.db_path}): {e}. 번역 메모리 없이 진행합니다.")
+            self._conn = None
+
+    @property
+    def is_available(self):
+        return self._conn is not None
+
+    @staticmethod
+    def hash_prompt(prompt_template):
+        return hashlib.sha256((prompt_template or "").encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def make_key(preprocessed_text, model_id, prompt_hash):
+        raw = f"{model_id}\x00{prompt_hash}\x00{preprocessed_text}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys):
+        """키 목록을 조회하여 {key: translation} 딕셔너리를 반환합니다. 적중/미적중 수를 누적합니다."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        found = {}
+        now = int(time.time())
+        with self._lock:
+            if self._conn is None:
+                self.misses += len(keys)
+                return {}
+            try:
+                for start in range(0, len(keys), _LOOKUP_BATCH_SIZE):
+                    batch = keys[start:start + _LOOKUP_BATCH_SIZE]
+                    placeholders = ",".join("?" * len(batch))
+                    rows = self._conn.execute(
+                        f"SELECT key, translation FROM tm WHERE key IN ({placeholders})", batch
+                    ).fetchall()
+                    found.update(rows)
+                if found:
+                    self._conn.executemany("UPDATE tm SET last_used=? WHERE key=?",
+                                           [(now, k) for k in found])
+                    self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"경고: 번역 메모리 조회 오류: {e}")
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, entries, model_id=None):
+        """[(key, translation), ...] 목록을 저장하고 필요하면 오래된 항목을 제거합니다."""
+        if not entries:
+            return
+        now = int(time.time())
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO tm (key, translation, model_id, last_used) VALUES (?, ?, ?, ?)",
+                    [(k, t, model_id, now) for k, t in entries]
+                )
+                self._conn.commit()
+                # INSERT OR REPLACE는 기존 키도 변경으로 집계하므로 상한 판단용 근사치로만 사용
+                self._entry_count += self._conn.total_changes - before
+                if self._entry_count > self.max_entries:
+                    self._evict_locked()
+            except sqlite3.Error as e:
+                print(f"경고: 번역 메모리 저장 오류: {e}")
+
+    def _evict_locked(self):
+        self._entry_count = self._conn.execute("SELECT COUNT(*) FROM tm").fetchone()[0]
+        if self._entry_count <= self.max_entries:
+            return
+        target = int(self.max_entries * (1 - _EVICTION_SLACK_RATIO))
+        excess = self._entry_count - target
+        self._conn.execute(
+            "DELETE FROM tm WHERE key IN (SELECT key FROM tm ORDER BY last_used ASC LIMIT ?)", (excess,)
+        )
+        self._conn.commit()
+        self._entry_count = target
+
+    def reset_counters(self):
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": self._entry_count}
+
+    def clear(self):
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute("DELETE FROM tm")
+                self._conn.commit()
+                self._entry_count = 0
+            except sqlite3.Error as e:
+                print(f"경고: 번역 메모리 초기화 오류: {e}")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,17 +1,40 @@
 # core/translator.py
-import re
+import asyncio
+import json
+import math
+import random
+import threading
 import time
-import google.generativeai as genai
 import google.api_core.exceptions as google_exceptions
-from concurrent.futures import ThreadPoolExecutor, as_completed, CancelledError
+from concurrent.futures import ThreadPoolExecutor, CancelledError, wait, FIRST_COMPLETED
 
 # config_manager에서 모델별 스레드 설정을 가져옴
-from core.config_manager import MODEL_THREAD_CONFIG, DEFAULT_MODEL_ID
+from core.config_manager import (
+    MODEL_THREAD_CONFIG, MODEL_MAX_CONCURRENCY, DEFAULT_MODEL_ID, MODEL_TOKEN_BUDGET,
+    CHUNK_MODE_TOKENS, CHUNK_MODE_LINES, DEFAULT_CHUNK_MODE, MAX_LINES_PER_TOKEN_CHUNK,
+    ENGINE_ASYNCIO, DEFAULT_TRANSLATION_ENGINE, REQUEST_FORMAT_JSON, DEFAULT_REQUEST_FORMAT,
+    DEFAULT_REQUEST_TIMEOUT, DEFAULT_HEDGE_BUDGET,
+    get_model_rate_limits, get_model_fallback_chain
+)
+from core.chunker import TokenEstimator, chunk_by_line_count, chunk_by_token_budget
+from core.translation_memory import TranslationMemory
+from core.tag_codec import encode_tags, decode_tags, token_ids_in
+from core.concurrency import (
+    get_concurrency_controller, OUTCOME_SUCCESS, OUTCOME_THROTTLED, OUTCOME_ERROR
+)
+from core.rate_limiter import get_rate_limiter
+from core.hedging import HedgeTracker, HEDGE_CHECK_INTERVAL
+from core.model_router import ModelRouter
+from core.profiler import profile_span
+from core.gemini_client import GeminiClient
+from core.job_journal import JobJournal
+from core.mnb_format import split_line, is_translatable
 
 # 메시지 타입
 MSG_TYPE_PROGRESS = "progress"
 MSG_TYPE_STATUS = "status"
 MSG_TYPE_ERROR = "error"
+MSG_TYPE_CONCURRENCY = "concurrency" # (현재 동시 요청 한도, 진행 중 요청 수)
 
 DEFAULT_CHUNK_SIZE_FOR_TRANSLATOR = 50
 FALLBACK_DEFAULT_MODEL_NAME = DEFAULT_MODEL_ID # config_manager의 기본 모델 ID 사용
@@ -19,33 +42,64 @@ FALLBACK_DEFAULT_MODEL_NAME = DEFAULT_MODEL_ID # config_manager의 기본 모델
 # API 호출 재시도 설정
 MAX_RETRIES = 2  # 최대 재시도 횟수
 INITIAL_RETRY_DELAY = 1  # 초기 재시도 대기 시간 (초)
+MAX_THROTTLE_RETRIES = 8  # 429/503 전용 재시도 횟수 (동시성 한도가 줄어드는 동안 청크를 버리지 않도록)
+MAX_RETRY_DELAY = 30  # 재시도 대기 시간 상한 (초)
+
+# 스레드 풀 엔진 설정
+THREAD_CANCEL_POLL_INTERVAL = 0.2  # 결과 처리 루프가 취소 이벤트를 확인하는 간격 (초)
+WORKER_SHUTDOWN_TIMEOUT = 5  # 작업 중단 시 진행 중인 요청이 끝나 슬롯을 반납하기를 기다리는 최대 시간 (초)
+
+# asyncio 엔진 설정
+ASYNC_SLOT_POLL_INTERVAL = 0.05  # 동시성 슬롯이 없을 때 다시 확인하는 간격 (초)
+ASYNC_CANCEL_POLL_INTERVAL = 0.1  # 취소 이벤트 확인 간격 (초)
+REQUEST_DEADLINE_GRACE = 5  # asyncio 엔진의 강제 제한 시간 = 요청 제한 시간 + 이 값 (초, 라이브러리 타임아웃이 먼저 동작하도록)
+
+# 검증 실패 줄 재번역 설정: 실패한 줄만 원래 청크의 1/REPAIR_SPLIT_FACTOR 크기 하위 요청으로 다시 보냄
+MAX_REPAIR_ROUNDS = 2
+REPAIR_SPLIT_FACTOR = 4
+
+# 구조화(JSON) 요청 설정: 청크를 {id, text} 배열로 보내고 응답을 줄 ID로 매핑
+MAX_MISSING_ID_REREQUESTS = 2  # 응답에서 빠진 ID만 다시 요청하는 최대 횟수
+JSON_REQUEST_INSTRUCTION = ( # 프롬프트 템플릿 앞에 붙으므로 중괄호를 쓰지 않음 (str.format)
+    'The text to translate is a JSON array of objects with "id" and "text" fields. '
+    'Translate every "text" value as instructed below and reply with only a JSON array of objects '
+    'with the same "id" and the translated "text". Return every id exactly once; '
+    'do not merge, split or reorder items.\n\n'
+)
+JSON_GENERATION_OPTIONS = {
+    "generation_config": {
+        "response_mime_type": "application/json",
+        "response_schema": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {"id": {"type": "INTEGER"}, "text": {"type": "STRING"}},
+                "required": ["id", "text"],
+            },
+        },
+    },
+}
 
 class TextProcessor:
-    def __init__(self, app_instance):
+    def __init__(self, app_instance, translation_memory=None, client_factory=None):
         self.app = app_instance # GUI 앱 인스턴스 참조
+        # api_key -> 클라이언트 (generate_content(model_name, prompt) 제공). 벤치마크 등에서 가짜 백엔드로 교체 가능
+        self.client_factory = client_factory or GeminiClient
+        self.translation_memory = translation_memory # TranslationMemory 인스턴스 (None이면 사용 안 함)
+        self.token_estimator = TokenEstimator() # usage_metadata로 보정되는 토큰 추정기 (앱 실행 동안 유지)
+        self._async_loop = None # asyncio 엔진 이벤트 루프 (처음 사용할 때 생성)
+        self._async_loop_lock = threading.Lock()
 
     def mnb_preprocess_text(self, text):
-        # ... (기존과 동일)
-        replacements = {
-            r"(\{s\d+\})": r"__MNBTAG_S\1__",
-            r"(\{reg\d+\})": r"__MNBTAG_REG\1__",
-            r"(\{player_name\})": r"__MNBTAG_PLAYERNAME__",
-        }
-        for pattern, replacement in replacements.items():
-            text = re.sub(pattern, replacement, text)
-        return text
-
-    def mnb_postprocess_text(self, text):
-        # ... (기존과 동일)
-        replacements_restore = {
-            r"__MNBTAG_S(\{s\d+\})__": r"\1",
-            r"__MNBTAG_REG(\{reg\d+\})__": r"\1",
-            r"__MNBTAG_PLAYERNAME__": r"{player_name}",
-        }
-        for pattern, replacement in replacements_restore.items():
-            text = re.sub(pattern, replacement, text)
-        text = re.sub(r"{\s*([a-zA-Z_0-9]+)\s*}", r"{\1}", text)
-        return text
+        """
+        M&B 태그({s0}, {reg3?her:him}, {playername}, ^ 등)를 한 번의 패스로 짧은 번호 토큰([#0] 등)으로 바꿉니다.
+        반환: (변환된 텍스트, 복원 맵)
+        """
+        return encode_tags(text)
+
+    def mnb_postprocess_text(self, text, restore_map):
+        """mnb_preprocess_text의 복원 맵으로 토큰을 원래 태그로 되돌립니다 (한 번의 패스)."""
+        return decode_tags(text, restore_map)
 
     def _is_retryable_error(self, exception):
         """재시도 가능한 API 오류인지 확인"""
@@ -59,168 +113,1118 @@ class TextProcessor:
         # if hasattr(exception, 'code') and exception.code() == 특정코드: return True
         return False
 
-    def _call_single_chunk_api_with_retry(self, chunk_text, api_key, model_name_to_use, prompt_template_to_use, current_chunk_index_for_debug="N/A"):
-        """API 호출 및 재시도 로직 포함"""
-        try:
-            genai.configure(api_key=api_key)
-        except Exception as e_conf:
-            # API 키 설정 실패는 재시도 대상이 아님
-            raise ConnectionError(f"청크 {current_chunk_index_for_debug}: API 키 설정 실패 - {e_conf}") from e_conf
+    def _is_throttling_error(self, exception):
+        """처리량 제한/과부하 오류인지 확인 (동시성 한도를 줄여야 하는 오류)"""
+        return isinstance(exception, (google_exceptions.TooManyRequests,    # 429 (ResourceExhausted 포함)
+                                      google_exceptions.ServiceUnavailable)) # 503
 
-        model = genai.GenerativeModel(model_name_to_use)
+    def _next_retry_delay(self, exception, attempts):
+        """
+        실패한 시도 뒤 재시도 대기 시간(초)과 표시용 시도 문자열을 반환합니다. 재시도할 수 없으면 (None, None).
+        attempts: {"retries": 일반 재시도 횟수, "throttle": 429/503 재시도 횟수} (호출 측에서 유지)
+        """
+        if self._is_throttling_error(exception):
+            if attempts["throttle"] >= MAX_THROTTLE_RETRIES:
+                return None, None
+            # 지터를 섞어 여러 워커가 동시에 다시 몰리지 않도록 함
+            delay = min(MAX_RETRY_DELAY, INITIAL_RETRY_DELAY * (2 ** attempts["throttle"])) * random.uniform(0.5, 1.0)
+            attempts["throttle"] += 1
+            return delay, f"{attempts['throttle']}/{MAX_THROTTLE_RETRIES}"
+        if self._is_retryable_error(exception) and attempts["retries"] < MAX_RETRIES:
+            delay = INITIAL_RETRY_DELAY * (2 ** attempts["retries"]) # Exponential backoff
+            attempts["retries"] += 1
+            return delay, f"{attempts['retries']}/{MAX_RETRIES}"
+        return None, None
 
+    def _build_prompt(self, prompt_template_to_use, chunk_text, current_chunk_index_for_debug):
         if "{text_to_translate}" not in prompt_template_to_use:
             raise ValueError(f"청크 {current_chunk_index_for_debug}: 잘못된 프롬프트 템플릿 형식입니다. '{'{text_to_translate}'}' 플레이스홀더가 필요합니다.")
-        
-        prompt_to_send = prompt_template_to_use.format(text_to_translate=chunk_text)
-        
-        retries = 0
-        last_exception = None
-        while retries <= MAX_RETRIES:
+        return prompt_template_to_use.format(text_to_translate=chunk_text)
+
+    def _record_response_usage(self, response, model_name_to_use, prompt_to_send, estimated_prompt_tokens, rate_limiter):
+        """usage_metadata로 토큰 추정기와 TPM 버킷을 보정합니다."""
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None and getattr(usage, "prompt_token_count", 0):
+            self.token_estimator.observe(model_name_to_use, len(prompt_to_send), usage.prompt_token_count)
+            if rate_limiter:
+                rate_limiter.record_usage(estimated_prompt_tokens, usage.prompt_token_count)
+
+    def _response_tokens(self, response, estimated_prompt_tokens):
+        """요청 크기(입력+출력 토큰). usage_metadata가 없으면 입력 추정치의 두 배로 봄 (번역은 입출력 길이가 비슷함)."""
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None and getattr(usage, "prompt_token_count", 0):
+            return usage.prompt_token_count + (getattr(usage, "candidates_token_count", 0) or 0)
+        return estimated_prompt_tokens * 2
+
+    def _record_call_stats(self, call_stats, started_at, response=None, retried=False):
+        """API 호출 한 번의 지연 시간, 재시도 여부, usage_metadata 토큰 수를 call_stats에 더합니다."""
+        if call_stats is None:
+            return
+        call_stats["api_latency"] = call_stats.get("api_latency", 0.0) + (time.monotonic() - started_at)
+        if retried:
+            call_stats["retries"] = call_stats.get("retries", 0) + 1
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            call_stats["prompt_tokens"] = call_stats.get("prompt_tokens", 0) + (getattr(usage, "prompt_token_count", 0) or 0)
+            call_stats["response_tokens"] = (call_stats.get("response_tokens", 0)
+                                             + (getattr(usage, "candidates_token_count", 0) or 0))
+
+    def _request_kwargs(self, generation_options, request_timeout):
+        """generate_content에 넘길 추가 인자 (요청 제한 시간은 request_options로 전달)."""
+        request_kwargs = dict(generation_options or {})
+        if request_timeout:
+            request_kwargs["request_options"] = {"timeout": request_timeout}
+        return request_kwargs
+
+    def _call_single_chunk_api_with_retry(self, chunk_text, client, model_name_to_use, prompt_template_to_use,
+                                          current_chunk_index_for_debug="N/A", cancel_event=None,
+                                          concurrency_controller=None, rate_limiter=None, generation_options=None,
+                                          request_timeout=None, call_stats=None):
+        """
+        API 호출 및 재시도 로직 포함. client는 작업 시작 시 한 번 만든 클라이언트를 모든 워커가 공유합니다.
+        generation_options: generate_content에 그대로 넘길 추가 인자 (JSON 요청 모드의 generation_config 등)
+        request_timeout: 요청 하나의 제한 시간(초). 넘으면 DeadlineExceeded로 재시도합니다.
+        call_stats: 주어지면 첫 호출 시각, API 지연 시간 합계, 재시도 횟수, 토큰 사용량을 기록할 딕셔너리 (작업 통계용)
+        rate_limiter가 주어지면 매 시도 전에 모델별 RPM/TPM 버킷에서 예약합니다 (슬롯을 잡기 전에 대기).
+        concurrency_controller가 주어지면 매 시도마다 슬롯을 얻고, 결과(성공/429·503/기타 오류)와 지연 시간을 보고합니다.
+        재시도 대기 중에는 슬롯을 반납하므로 다른 청크가 진행할 수 있습니다.
+        """
+        prompt_to_send = self._build_prompt(prompt_template_to_use, chunk_text, current_chunk_index_for_debug)
+        estimated_prompt_tokens = self.token_estimator.estimate(prompt_to_send, model_name_to_use)
+        request_kwargs = self._request_kwargs(generation_options, request_timeout)
+
+        attempts = {"retries": 0, "throttle": 0}
+        while True:
+            if rate_limiter and not rate_limiter.acquire(estimated_prompt_tokens, cancel_event):
+                raise CancelledError()
+            if concurrency_controller and not concurrency_controller.acquire(cancel_event):
+                raise CancelledError()
+            started_at = time.monotonic()
+            if call_stats is not None:
+                call_stats.setdefault("request_started", started_at)
             try:
-                response = model.generate_content(prompt_to_send)
-                return response.text
+                response = client.generate_content(model_name_to_use, prompt_to_send, **request_kwargs)
             except Exception as e:
-                last_exception = e
-                if self._is_retryable_error(e) and retries < MAX_RETRIES:
-                    delay = INITIAL_RETRY_DELAY * (2 ** retries) # Exponential backoff
-                    self.app.put_message_in_queue(
-                        MSG_TYPE_STATUS,
-                        f"청크 {current_chunk_index_for_debug}: API 오류 ({type(e).__name__}), {delay}초 후 재시도 ({retries + 1}/{MAX_RETRIES})..."
-                    )
-                    time.sleep(delay)
-                    retries += 1
-                else: # 재시도 불가 또는 최대 재시도 도달
+                if concurrency_controller:
+                    concurrency_controller.release(OUTCOME_THROTTLED if self._is_throttling_error(e) else OUTCOME_ERROR)
+                delay, attempt_text = self._next_retry_delay(e, attempts)
+                self._record_call_stats(call_stats, started_at, retried=delay is not None)
+                if delay is None: # 재시도 불가 또는 최대 재시도 도달
                     raise e # 원래 예외를 다시 발생시켜 상위에서 처리
-        
-        # 이 지점에 도달하면 안 되지만, 만약을 위해 (모든 재시도 실패)
-        if last_exception:
-            raise last_exception
-        return None # 이론상 도달 불가
+                self.app.put_message_in_queue(
+                    MSG_TYPE_STATUS,
+                    f"청크 {current_chunk_index_for_debug}: API 오류 ({type(e).__name__}), {delay:.1f}초 후 재시도 ({attempt_text})..."
+                )
+                if cancel_event:
+                    if cancel_event.wait(delay): # 대기 중 취소되면 즉시 중단
+                        raise CancelledError()
+                else:
+                    time.sleep(delay)
+                continue
+
+            if concurrency_controller:
+                concurrency_controller.release(OUTCOME_SUCCESS, time.monotonic() - started_at,
+                                               self._response_tokens(response, estimated_prompt_tokens))
+            self._record_call_stats(call_stats, started_at, response)
+            self._record_response_usage(response, model_name_to_use, prompt_to_send, estimated_prompt_tokens, rate_limiter)
+            return response.text
+
+    async def _call_single_chunk_api_async(self, chunk_text, client, model_name_to_use, prompt_template_to_use,
+                                           current_chunk_index_for_debug="N/A",
+                                           concurrency_controller=None, rate_limiter=None, generation_options=None,
+                                           request_timeout=None, call_stats=None):
+        """
+        _call_single_chunk_api_with_retry의 asyncio 버전 (generate_content_async 사용).
+        대기는 모두 asyncio.sleep이므로 취소는 작업(Task) 취소로 전달됩니다.
+        request_timeout이 있으면 라이브러리 타임아웃이 동작하지 않아도 조금 뒤 강제로 DeadlineExceeded 처리합니다.
+        """
+        prompt_to_send = self._build_prompt(prompt_template_to_use, chunk_text, current_chunk_index_for_debug)
+        estimated_prompt_tokens = self.token_estimator.estimate(prompt_to_send, model_name_to_use)
+        request_kwargs = self._request_kwargs(generation_options, request_timeout)
+
+        attempts = {"retries": 0, "throttle": 0}
+        while True:
+            if rate_limiter:
+                wait = rate_limiter.reserve(estimated_prompt_tokens)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            if concurrency_controller:
+                while not concurrency_controller.try_acquire():
+                    await asyncio.sleep(ASYNC_SLOT_POLL_INTERVAL)
+            started_at = time.monotonic()
+            if call_stats is not None:
+                call_stats.setdefault("request_started", started_at)
+            try:
+                response = await self._await_with_deadline(
+                    client.generate_content_async(model_name_to_use, prompt_to_send, **request_kwargs), request_timeout)
+            except Exception as e:
+                if concurrency_controller:
+                    concurrency_controller.release(OUTCOME_THROTTLED if self._is_throttling_error(e) else OUTCOME_ERROR)
+                delay, attempt_text = self._next_retry_delay(e, attempts)
+                self._record_call_stats(call_stats, started_at, retried=delay is not None)
+                if delay is None:
+                    raise e
+                self.app.put_message_in_queue(
+                    MSG_TYPE_STATUS,
+                    f"청크 {current_chunk_index_for_debug}: API 오류 ({type(e).__name__}), {delay:.1f}초 후 재시도 ({attempt_text})..."
+                )
+                await asyncio.sleep(delay)
+                continue
+            except asyncio.CancelledError:
+                if concurrency_controller: # 요청 도중 취소: 슬롯만 반납 (한도 조정 없음)
+                    concurrency_controller.release(OUTCOME_ERROR)
+                raise
+
+            if concurrency_controller:
+                concurrency_controller.release(OUTCOME_SUCCESS, time.monotonic() - started_at,
+                                               self._response_tokens(response, estimated_prompt_tokens))
+            self._record_call_stats(call_stats, started_at, response)
+            self._record_response_usage(response, model_name_to_use, prompt_to_send, estimated_prompt_tokens, rate_limiter)
+            return response.text
+
+    async def _await_with_deadline(self, awaitable, request_timeout):
+        if not request_timeout:
+            return await awaitable
+        try:
+            return await asyncio.wait_for(awaitable, request_timeout + REQUEST_DEADLINE_GRACE)
+        except asyncio.TimeoutError:
+            raise google_exceptions.DeadlineExceeded(f"요청이 {request_timeout}초 안에 끝나지 않았습니다.")
+
+    def _build_json_payload(self, chunk_texts, request_ids):
+        """청크 안 줄 번호(ID)와 전처리된 줄로 {id, text} 배열을 만듭니다."""
+        return json.dumps([{"id": i, "text": chunk_texts[i]} for i in request_ids], ensure_ascii=False, separators=(",", ":"))
+
+    def _parse_json_chunk_result(self, translated_chunk_raw, request_ids):
+        """
+        JSON 응답에서 요청한 ID의 번역 줄을 {ID: 번역 줄}로 꺼냅니다.
+        코드 블록으로 감싼 응답도 허용하며, 읽을 수 없는 응답이면 빈 딕셔너리를 반환합니다 (모든 ID 누락).
+        """
+        text = (translated_chunk_raw or "").strip()
+        start, end = text.find("["), text.rfind("]")
+        if start == -1 or end < start:
+            return {}
+        try:
+            items = json.loads(text[start:end + 1])
+        except ValueError:
+            return {}
+        requested = set(request_ids)
+        results = {}
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict) or not isinstance(item.get("text"), str):
+                continue
+            try:
+                line_id = int(item.get("id"))
+            except (TypeError, ValueError):
+                continue
+            if line_id in requested and line_id not in results:
+                results[line_id] = " ".join(item["text"].splitlines()) # 줄 정렬이 깨지지 않도록 한 줄로
+        return results
+
+    def _call_chunk_json_with_retry(self, chunk_texts, client, model_name_to_use, prompt_template_to_use,
+                                    current_chunk_index_for_debug="N/A", cancel_event=None,
+                                    concurrency_controller=None, rate_limiter=None, request_timeout=None,
+                                    call_stats=None):
+        """
+        JSON 요청 모드의 청크 번역. 응답에서 빠진 ID만 모아 MAX_MISSING_ID_REREQUESTS번까지 다시 요청합니다.
+        반환: {청크 안 줄 번호: 번역 줄} (끝까지 누락된 줄은 없음)
+        """
+        json_template = JSON_REQUEST_INSTRUCTION + prompt_template_to_use
+        results = {}
+        missing_ids = list(range(len(chunk_texts)))
+        for request_round in range(MAX_MISSING_ID_REREQUESTS + 1):
+            translated_chunk_raw = self._call_single_chunk_api_with_retry(
+                self._build_json_payload(chunk_texts, missing_ids), client, model_name_to_use, json_template,
+                current_chunk_index_for_debug, cancel_event, concurrency_controller, rate_limiter,
+                generation_options=JSON_GENERATION_OPTIONS, request_timeout=request_timeout, call_stats=call_stats)
+            missing_ids = self._merge_json_round(results, translated_chunk_raw, missing_ids,
+                                                 current_chunk_index_for_debug, request_round)
+            if not missing_ids:
+                break
+        return results
+
+    async def _call_chunk_json_async(self, chunk_texts, client, model_name_to_use, prompt_template_to_use,
+                                     current_chunk_index_for_debug="N/A",
+                                     concurrency_controller=None, rate_limiter=None, request_timeout=None,
+                                     call_stats=None):
+        """_call_chunk_json_with_retry의 asyncio 버전."""
+        json_template = JSON_REQUEST_INSTRUCTION + prompt_template_to_use
+        results = {}
+        missing_ids = list(range(len(chunk_texts)))
+        for request_round in range(MAX_MISSING_ID_REREQUESTS + 1):
+            translated_chunk_raw = await self._call_single_chunk_api_async(
+                self._build_json_payload(chunk_texts, missing_ids), client, model_name_to_use, json_template,
+                current_chunk_index_for_debug, concurrency_controller, rate_limiter,
+                generation_options=JSON_GENERATION_OPTIONS, request_timeout=request_timeout, call_stats=call_stats)
+            missing_ids = self._merge_json_round(results, translated_chunk_raw, missing_ids,
+                                                 current_chunk_index_for_debug, request_round)
+            if not missing_ids:
+                break
+        return results
 
+    def _merge_json_round(self, results, translated_chunk_raw, missing_ids, current_chunk_index_for_debug, request_round):
+        """한 번의 JSON 요청 결과를 results에 합치고 아직 누락된 ID 목록을 반환합니다."""
+        results.update(self._parse_json_chunk_result(translated_chunk_raw, missing_ids))
+        still_missing = [i for i in missing_ids if i not in results]
+        if still_missing and request_round < MAX_MISSING_ID_REREQUESTS:
+            self.app.put_message_in_queue(
+                MSG_TYPE_STATUS,
+                f"청크 {current_chunk_index_for_debug}: 응답에 없는 줄 {len(still_missing)}개만 다시 요청합니다 "
+                f"({request_round + 1}/{MAX_MISSING_ID_REREQUESTS})"
+            )
+        return still_missing
+
+    def _split_chunk_result(self, chunk_info, translated_chunk_raw):
+        """
+        청크 번역 결과를 줄 목록으로 나눕니다 (태그 토큰은 아직 복원하지 않은 상태).
+        줄 수가 청크의 원문 줄 수와 다르면 줄 정렬을 알 수 없으므로 None을 반환합니다.
+        """
+        translated_lines = translated_chunk_raw.strip("\r\n").splitlines()
+        if len(translated_lines) != len(chunk_info["unique_ids"]):
+            return None
+        return translated_lines
 
     def translate_by_chunks(self, full_text, api_key, chunk_size_lines=DEFAULT_CHUNK_SIZE_FOR_TRANSLATOR,
-                          cancel_event=None, prompt_template=None, model_name_override=None):
+                          cancel_event=None, prompt_template=None, model_name_override=None,
+                          chunk_mode=DEFAULT_CHUNK_MODE, token_budget=None, rate_limit_overrides=None,
+                          engine=DEFAULT_TRANSLATION_ENGINE, on_commit=None, journal=None, split_sizes=None,
+                          parse_id_fields=True, request_format=DEFAULT_REQUEST_FORMAT,
+                          request_timeout=DEFAULT_REQUEST_TIMEOUT, hedge_budget=DEFAULT_HEDGE_BUDGET,
+                          model_fallback_overrides=None, metrics=None):
+        """
+        full_text: 번역할 텍스트 또는 줄 시퀀스 (각 항목은 줄바꿈 문자 포함).
+                   MappedLineFile 같은 줄 보기는 복사하지 않고 필요한 줄만 읽습니다.
+        chunk_mode: CHUNK_MODE_TOKENS이면 모델별 토큰 예산(token_budget, 없으면 MODEL_TOKEN_BUDGET)에 맞춰 줄을 채우고,
+                    CHUNK_MODE_LINES이면 chunk_size_lines 줄 단위로 나눕니다.
+        rate_limit_overrides: 설정 파일의 모델별 RPM/TPM 값 (없으면 MODEL_RATE_LIMITS 기본값)
+        engine: ENGINE_THREADS(스레드 풀) 또는 ENGINE_ASYNCIO(generate_content_async). 반환값과 진행 메시지는 같습니다.
+        on_commit: 주어지면 앞에서부터 완료된 구간(줄바꿈 포함 텍스트)을 순서대로 전달하고, 전달한 줄은 버퍼에서 해제합니다.
+                   이 경우 성공 시 반환값은 빈 문자열("")이며, 취소/오류 시 반환값은 기존과 같습니다.
+        journal: JobJournal. 기록된 줄은 API 호출 없이 복원하고, 완료된 청크를 기록합니다.
+                 끝까지 완료되면 기록을 삭제하고, 취소/오류/예외 시에는 이어하기를 위해 남겨 둡니다.
+        parse_id_fields: True이면 "ID|텍스트" 줄에서 텍스트만 번역하고 ID 필드는 그대로 둡니다 ({!} 텍스트는 번역하지 않음).
+        split_sizes: 주어지면 결과를 이 줄 수들로 나눈 텍스트 목록으로 반환합니다 (translate_texts에서 사용, on_commit과 함께 쓰지 않음).
+        request_format: REQUEST_FORMAT_JSON이면 청크를 {id, text} 배열로 보내고 결과를 줄 ID로 매핑합니다.
+                        응답에서 빠진 줄만 다시 요청하므로 줄이 합쳐지거나 빠져도 청크 전체를 원본으로 되돌리지 않습니다.
+        request_timeout: 요청 하나의 제한 시간(초, None이면 제한 없음).
+        hedge_budget: 작업 끝에 느린 청크로 중복 요청을 보낼 예산 (전체 청크 수 대비 비율, 0이면 사용 안 함).
+        model_fallback_overrides: 설정 파일의 모델별 폴백 경로 (없으면 MODEL_FALLBACK_CHAINS 기본값).
+                                  할당량 소진이나 반복되는 5xx로 재시도를 모두 소진한 청크는 다음 모델로 다시 보냅니다.
+        metrics: JobMetrics. 청크별 대기/API 지연 시간, 재시도, 토큰 사용량, 후처리 시간과 작업 결과 상태를 기록합니다.
+        작업은 준비(_prepare_job) → 실행(엔진별) → 조립(_assemble_job) 단계로 진행됩니다.
+        """
+        result = None
+        if metrics:
+            metrics.start()
+        try:
+            result = self._run_translation_job(full_text, api_key, chunk_size_lines, cancel_event, prompt_template,
+                                               model_name_override, chunk_mode, token_budget, rate_limit_overrides,
+                                               engine, on_commit, journal, split_sizes, parse_id_fields, request_format,
+                                               request_timeout, hedge_budget, model_fallback_overrides, metrics)
+            return result
+        finally:
+            if metrics:
+                metrics.finish("failed" if result is None else
+                               "cancelled" if result == "CANCELLED_BY_TRANSLATOR" else "completed")
+            if journal:
+                if result is None or result == "CANCELLED_BY_TRANSLATOR":
+                    journal.close()
+                else:
+                    journal.discard()
+
+    def _run_translation_job(self, full_text, api_key, chunk_size_lines, cancel_event, prompt_template,
+                             model_name_override, chunk_mode, token_budget, rate_limit_overrides,
+                             engine, on_commit, journal, split_sizes=None, parse_id_fields=True,
+                             request_format=DEFAULT_REQUEST_FORMAT, request_timeout=DEFAULT_REQUEST_TIMEOUT,
+                             hedge_budget=DEFAULT_HEDGE_BUDGET, model_fallback_overrides=None, metrics=None):
+        with profile_span("translate.prepare"):
+            job, early_result = self._prepare_job(full_text, api_key, chunk_size_lines, cancel_event, prompt_template,
+                                                  model_name_override, chunk_mode, token_budget, rate_limit_overrides,
+                                                  journal, split_sizes, parse_id_fields, request_format,
+                                                  model_fallback_overrides)
+        if job is None:
+            if on_commit and early_result and early_result != "CANCELLED_BY_TRANSLATOR":
+                on_commit(early_result) # API 호출 없이 끝난 경우 전체를 한 번에 전달
+                return ""
+            return early_result
+        job["on_commit"] = on_commit
+        job["request_timeout"] = request_timeout
+        job["hedge_budget"] = hedge_budget
+        job["metrics"] = metrics
+        if metrics:
+            metrics.set_job_info(job["model_name"], len(job["lines"]), len(job["unique_texts"]))
+        self._advance_commit(job) # 빈 줄/번역 메모리 적중으로 이미 완성된 앞부분
+
+        with profile_span("translate.execute"):
+            if engine == ENGINE_ASYNCIO:
+                completed = self._execute_job_async(job)
+            else:
+                completed = self._execute_job_threaded(job)
+        if not completed:
+            return job["abort_result"]
+
+        with profile_span("translate.assemble"):
+            return self._assemble_job(job)
+
+    def _model_components(self, model_id, rate_limit_overrides=None):
+        """
+        모델별 (동시성 컨트롤러, RPM/TPM 리미터).
+        둘 다 프로세스 전체에서 공유되어 이전 작업에서 학습한 한도를 이어서 사용합니다.
+        """
+        # 적응형 동시성 제어: MODEL_THREAD_CONFIG 값에서 시작해 MODEL_MAX_CONCURRENCY까지 조절
+        concurrency_controller = get_concurrency_controller(
+            model_id,
+            MODEL_THREAD_CONFIG.get(model_id, MODEL_THREAD_CONFIG.get("default", 3)),
+            MODEL_MAX_CONCURRENCY.get(model_id, MODEL_MAX_CONCURRENCY.get("default", 16))
+        )
+        concurrency_controller.on_change = lambda limit, in_flight: self.app.put_message_in_queue(
+            MSG_TYPE_CONCURRENCY, (limit, in_flight))
+        # 모델별 RPM/TPM 리미터: 모든 워커가 호출 전에 예약
+        rpm_limit, tpm_limit = get_model_rate_limits(model_id, rate_limit_overrides)
+        return concurrency_controller, get_rate_limiter(model_id, rpm_limit, tpm_limit)
+
+    def _prepare_job(self, full_text, api_key, chunk_size_lines, cancel_event, prompt_template,
+                     model_name_override, chunk_mode, token_budget, rate_limit_overrides, journal=None, split_sizes=None,
+                     parse_id_fields=True, request_format=DEFAULT_REQUEST_FORMAT, model_fallback_overrides=None):
+        """
+        설정 해석, 줄 분리, 중복 제거, 작업 기록/번역 메모리 조회, 청크 분리, 클라이언트 생성까지 수행합니다.
+        반환: (작업 딕셔너리, None). API 호출 없이 끝나는 경우 (None, 최종 반환값).
+        """
         if cancel_event and cancel_event.is_set():
-            return "CANCELLED_BY_TRANSLATOR" # 작업 취소 시 특별한 문자열 반환
+            return None, "CANCELLED_BY_TRANSLATOR" # 작업 취소 시 특별한 문자열 반환
         if not api_key:
             self.app.put_message_in_queue(MSG_TYPE_ERROR, "API 키가 설정되지 않았습니다.")
-            return None # API 키 없으면 진행 불가
-        
+            return None, None # API 키 없으면 진행 불가
+
         effective_model_name = model_name_override if model_name_override else FALLBACK_DEFAULT_MODEL_NAME
-        
-        # 모델별 스레드 수 결정 (config_manager에서 가져온 MODEL_THREAD_CONFIG 사용)
-        num_workers_for_model = MODEL_THREAD_CONFIG.get(effective_model_name, MODEL_THREAD_CONFIG.get("default", 3))
-        
+
+        # 모델 폴백 경로 (첫 모델이 선택한 모델). 폴백 모델의 동시성 컨트롤러/리미터는 처음 쓸 때 만듦
+        model_router = ModelRouter(
+            get_model_fallback_chain(effective_model_name, model_fallback_overrides),
+            lambda model_id: self._model_components(model_id, rate_limit_overrides)
+        )
+        concurrency_controller, rate_limiter = model_router.components(effective_model_name)
+        rpm_limit, tpm_limit = rate_limiter.rpm, rate_limiter.tpm
+        self.app.put_message_in_queue(MSG_TYPE_CONCURRENCY, (concurrency_controller.limit, concurrency_controller.in_flight))
+
+        if chunk_mode == CHUNK_MODE_TOKENS:
+            if not token_budget:
+                token_budget = MODEL_TOKEN_BUDGET.get(effective_model_name, MODEL_TOKEN_BUDGET.get("default", 1500))
+            chunk_description = f"토큰 예산 {token_budget}"
+        else:
+            chunk_mode = CHUNK_MODE_LINES
+            chunk_description = f"{chunk_size_lines}줄"
+
         # 사용자에게 현재 작업 설정 알림
         self.app.put_message_in_queue(
             MSG_TYPE_STATUS,
-            f"번역 작업 시작 (모델: {effective_model_name}, 청크: {chunk_size_lines}줄, 최대 스레드: {num_workers_for_model})"
+            f"번역 작업 시작 (모델: {effective_model_name}, 청크: {chunk_description}, "
+            f"동시 요청: {concurrency_controller.limit} (최대 {concurrency_controller.max_limit}), "
+            f"RPM {rpm_limit or '제한 없음'} / TPM {tpm_limit or '제한 없음'}"
+            f"{', 요청 형식: JSON' if request_format == REQUEST_FORMAT_JSON else ''}"
+            f"{', 폴백: ' + ' → '.join(model_router.chain[1:]) if len(model_router.chain) > 1 else ''})"
         )
 
         if not prompt_template: # 프롬프트 템플릿이 없는 경우 기본값 사용 및 알림
             self.app.put_message_in_queue(MSG_TYPE_STATUS, "경고: 프롬프트 템플릿이 제공되지 않아 내부 기본 형식을 사용합니다.")
-            prompt_template = "Translate the following English text to Korean. Preserve any special placeholders (e.g., __MNBTAG_...__) exactly as they appear.\n\nEnglish Text:\n{text_to_translate}\n\nKorean Translation:"
+            prompt_template = "Translate the following English text to Korean. Preserve placeholder tokens such as [#0] or [#1] exactly as they appear; do not translate, renumber or remove them. Output exactly one translated line for each input line, in the same order, without adding or removing lines.\n\nEnglish Text:\n{text_to_translate}\n\nKorean Translation:"
 
-        lines = full_text.splitlines(keepends=True) # 줄바꿈 문자 유지를 위해 keepends=True
+        if isinstance(full_text, str):
+            lines = full_text.splitlines(keepends=True) # 줄바꿈 문자 유지를 위해 keepends=True
+        elif hasattr(full_text, "__getitem__") and hasattr(full_text, "__len__"):
+            lines = full_text # 리스트/줄 보기: 복사하지 않고 위치로 접근
+        else:
+            lines = list(full_text)
         if not lines: # 입력 텍스트가 비어있는 경우
             self.app.put_message_in_queue(MSG_TYPE_PROGRESS, (1, 1)) # 진행률 100%
-            return "" # 빈 문자열 반환
+            return None, self._join_line_results([], split_sizes) # 빈 문자열 반환
+
+        # 줄 단위 결과 (ID 필드 + 본문 + 원래 줄바꿈). 빈 줄/{!} 줄은 API 호출 없이 그대로 사용
+        line_results = [None] * len(lines)
+        line_endings = [None] * len(lines)
+        line_prefixes = {}      # 원래 줄 인덱스 -> "ID|" 필드 (있는 줄만, 번역하지 않고 그대로 다시 붙임)
+        id_field_chars = 0
+        body_chars = 0
+        # 중복 제거: 전처리 결과가 같은 줄은 한 번만 번역하고 모든 위치로 분배
+        # 태그 번호만 다른 줄({s0}/{s1})도 토큰화 후에는 같은 줄로 묶이며, 복원은 위치별 맵으로 함
+        unique_texts = []       # 고유 줄 ID -> 전처리된 본문
+        unique_positions = []   # 고유 줄 ID -> 원래 줄 인덱스 목록
+        unique_id_by_text = {}
+        line_tag_maps = {}      # 원래 줄 인덱스 -> 태그 복원 맵 (태그가 있는 줄만)
+        translatable_line_count = 0
+        with profile_span("translate.preprocess"): # 분리 + 태그 토큰화(mnb_preprocess_text) + 중복 제거
+            for i, line in enumerate(lines):
+                prefix, body, line_endings[i] = split_line(line, parse_id_fields)
+                if not is_translatable(body):
+                    line_results[i] = line
+                    continue
+                if prefix:
+                    line_prefixes[i] = prefix
+                    id_field_chars += len(prefix)
+                body_chars += len(body)
+                translatable_line_count += 1
+                preprocessed, tag_map = self.mnb_preprocess_text(body)
+                if tag_map:
+                    line_tag_maps[i] = tag_map
+                uid = unique_id_by_text.get(preprocessed)
+                if uid is None:
+                    uid = len(unique_texts)
+                    unique_id_by_text[preprocessed] = uid
+                    unique_texts.append(preprocessed)
+                    unique_positions.append([])
+                unique_positions[uid].append(i)
+        del unique_id_by_text
+
+        if translatable_line_count:
+            dedup_ratio = 1 - len(unique_texts) / translatable_line_count
+            self.app.put_message_in_queue(
+                MSG_TYPE_STATUS,
+                f"중복 제거: 번역 대상 {translatable_line_count}줄 → 고유 {len(unique_texts)}줄 ({dedup_ratio:.1%} 감소)"
+            )
+        if id_field_chars:
+            chars_per_token = self.token_estimator.chars_per_token(effective_model_name)
+            self.app.put_message_in_queue(
+                MSG_TYPE_STATUS,
+                f"ID 필드 제외: {len(line_prefixes)}줄, 약 {int(id_field_chars / chars_per_token)}토큰 절약 "
+                f"(원문의 {id_field_chars / (id_field_chars + body_chars):.1%})"
+            )
+        pending_uids = list(range(len(unique_texts)))
+
+        job = {
+            "cancel_event": cancel_event,
+            "worker_cancel_event": threading.Event(), # 워커 전용 중단 신호 (사용자 취소, 작업 중단, 작업 종료 시 설정)
+            "model_name": effective_model_name,
+            "prompt_template": prompt_template,
+            "concurrency_controller": concurrency_controller,
+            "rate_limiter": rate_limiter,
+            "model_router": model_router,
+            "model_usage": {}, # 모델 ID -> 그 모델로 번역된 고유 줄 수
+            "lines": lines,
+            "line_results": line_results,
+            "line_endings": line_endings,
+            "line_prefixes": line_prefixes,
+            "line_tag_maps": line_tag_maps,
+            "unique_texts": unique_texts,
+            "unique_positions": unique_positions,
+            "tm": None,
+            "unique_tm_keys": [],
+            "tm_prompt_hash": None,
+            "journal": journal,
+            "unique_journal_keys": [],
+            "chunks": [],
+            "processed_chunks": 0, # 결과를 처리한 요청 수 (다시 보낸 하위/폴백 청크 포함, 중복 요청 판단용)
+            "progress_total": 0, # 진행률 분모: API로 번역할 고유 줄 수 (다시 보낸 청크가 늘어나도 그대로)
+            "settled_lines": 0, # 진행률 분자: 번역 또는 원본으로 확정된 고유 줄 수
+            "abort_result": None,
+            "on_commit": None,
+            "commit_pos": 0, # 이 위치 앞의 줄은 on_commit으로 전달 완료
+            "split_sizes": split_sizes,
+            "request_format": request_format,
+            "requeue": [], # 검증에 실패해 다시 보낼 하위 청크 (결과 처리 루프가 꺼내서 제출)
+            "request_timeout": None,
+            "hedge_budget": 0,
+            "chunk_attempts": {}, # 청크 번호 -> 실행 중인 요청(원 요청 + 중복 요청)
+            "settled_chunks": set(), # 결과를 이미 반영한 청크 번호
+        }
+
+        # 작업 기록(이어하기) 조회: 이전 실행에서 완료된 줄은 API로 보내지 않음
+        if journal:
+            unique_journal_keys = [JobJournal.line_key(pre) for pre in unique_texts]
+            job["unique_journal_keys"] = unique_journal_keys
+            completed = journal.load() if pending_uids else {}
+            if completed:
+                still_pending = []
+                for uid in pending_uids:
+                    journaled_translation = completed.get(unique_journal_keys[uid])
+                    if journaled_translation is not None:
+                        for pos in unique_positions[uid]:
+                            line_results[pos] = self._compose_line(job, pos, journaled_translation)
+                    else:
+                        still_pending.append(uid)
+                self.app.put_message_in_queue(
+                    MSG_TYPE_STATUS,
+                    f"작업 기록에서 이어하기: 고유 {len(pending_uids) - len(still_pending)}줄 복원, {len(still_pending)}줄 남음"
+                )
+                pending_uids = still_pending
+            journal.start({"model": effective_model_name, "total_lines": len(lines)})
 
-        # 청크 분리
-        chunks_to_process = []
-        for i in range(0, len(lines), chunk_size_lines):
+        # 번역 메모리 조회: 적중한 줄은 API로 보내지 않음
+        tm = self.translation_memory if (self.translation_memory and self.translation_memory.is_available) else None
+        if tm and pending_uids:
+            job["tm"] = tm
+            tm.reset_counters()
+            prompt_hash = TranslationMemory.hash_prompt(prompt_template)
+            job["tm_prompt_hash"] = prompt_hash
+            unique_tm_keys = [TranslationMemory.make_key(pre, effective_model_name, prompt_hash) for pre in unique_texts]
+            job["unique_tm_keys"] = unique_tm_keys
+            cached = tm.get_many(unique_tm_keys)
+            still_pending = []
+            for uid in pending_uids:
+                cached_translation = cached.get(unique_tm_keys[uid])
+                if cached_translation is not None:
+                    for pos in unique_positions[uid]:
+                        line_results[pos] = self._compose_line(job, pos, cached_translation)
+                else:
+                    still_pending.append(uid)
+            self.app.put_message_in_queue(
+                MSG_TYPE_STATUS,
+                f"번역 메모리: 고유 {len(pending_uids) - len(still_pending)}줄 적중, {len(still_pending)}줄 API 번역 필요"
+            )
+            pending_uids = still_pending
+
+        # 청크 분리 (번역이 필요한 고유 줄만 모아서, 한 줄은 절대 나누지 않음)
+        if chunk_mode == CHUNK_MODE_TOKENS:
+            chunk_uid_groups = chunk_by_token_budget(pending_uids, unique_texts, token_budget,
+                                                     self.token_estimator, effective_model_name,
+                                                     max_lines=MAX_LINES_PER_TOKEN_CHUNK)
+        else:
+            chunk_uid_groups = chunk_by_line_count(pending_uids, chunk_size_lines)
+        chunks_to_process = job["chunks"]
+        for chunk_uids in chunk_uid_groups:
             if cancel_event and cancel_event.is_set(): break
-            chunk_lines = lines[i : min(i + chunk_size_lines, len(lines))]
-            chunk_text = "".join(chunk_lines)
-            if chunk_text.strip(): # 내용이 있는 청크만 전처리
-                preprocessed_chunk = self.mnb_preprocess_text(chunk_text)
-                chunks_to_process.append({"index": len(chunks_to_process), "original_text": chunk_text, "processed_text": preprocessed_chunk, "is_empty": False})
-            else: # 빈 줄로만 이루어진 청크
-                chunks_to_process.append({"index": len(chunks_to_process), "original_text": chunk_text, "processed_text": None, "is_empty": True})
-
-        # 실제 번역이 필요한 청크 수 계산
-        total_translatable_chunks = sum(1 for c in chunks_to_process if not c.get("is_empty"))
-        
-        if total_translatable_chunks == 0: # 번역할 내용이 없는 경우 (모두 빈 줄)
+            chunks_to_process.append({
+                "index": len(chunks_to_process),
+                "unique_ids": chunk_uids,
+                "processed_text": "\n".join(unique_texts[uid] for uid in chunk_uids),
+            })
+
+        if not chunks_to_process: # 번역할 내용이 없는 경우 (모두 빈 줄 또는 번역 메모리 적중)
             self.app.put_message_in_queue(MSG_TYPE_PROGRESS, (1, 1))
-            return full_text # 원본 텍스트 그대로 반환
+            return None, self._join_line_results(line_results, split_sizes)
+
+        # 작업 전체에서 공유할 클라이언트 (API 키 설정과 모델 생성은 여기서 한 번만)
+        try:
+            job["client"] = self.client_factory(api_key)
+        except Exception as e_conf:
+            # API 키 설정 실패는 재시도 대상이 아님
+            self.app.put_message_in_queue(MSG_TYPE_ERROR, f"API 키 설정 실패: {e_conf}")
+            return None, None
+
+        # 초기 진행률 설정 (청크 수가 아닌 고유 줄 수 기준: 다시 보낸 청크가 분모를 늘려 진행률이 뒤로 가지 않도록)
+        job["progress_total"] = sum(len(chunk_info["unique_ids"]) for chunk_info in chunks_to_process)
+        self.app.put_message_in_queue(MSG_TYPE_PROGRESS, (0, job["progress_total"]))
+        return job, None
+
+    def _apply_chunk_outcome(self, job, chunk_info, translated_chunk_raw=None, error=None, attempt_info=None):
+        """
+        청크 하나의 결과(번역문 또는 예외)를 검증하여 작업에 반영하고 진행률을 보냅니다. 두 엔진이 함께 사용합니다.
+        할당량 소진/5xx/타임아웃으로 재시도를 모두 소진한 청크는 폴백 경로의 다음 모델로 통째로 다시 보냅니다.
+        그 외 번역을 얻지 못한 줄(줄 수 불일치, 빈 응답, JSON 응답 누락)과 플레이스홀더 토큰이 원문과 다른 줄만
+        더 작은 하위 요청으로 다시 대기열에 넣고(_requeue_lines), 검증을 통과한 줄은 바로 확정합니다.
+        attempt_info: 이 결과를 만든 요청의 정보. "model"(번역 메모리 키, 작업 기록, 모델별 통계에 사용)과
+                      작업 통계(job["metrics"])에 기록할 제출/호출 시각, API 지연 시간, 재시도, 토큰 사용량
+        전체 작업을 중단해야 하는 오류(API 키/권한 문제)면 False를 반환합니다.
+        """
+        postprocess_started = time.monotonic()
+        attempt_info = attempt_info or {}
+        original_idx = chunk_info["index"]
+        chunk_uids = chunk_info["unique_ids"]
+        model_used = attempt_info.get("model") or job["model_name"]
+        model_router = job["model_router"]
+        translated_by_id = {}
+        problem = None          # 청크 전체가 실패한 이유 (줄 단위 문제는 아래에서 따로 셈)
+        can_requeue = True      # 다시 요청해서 나아질 수 있는 실패인지
+        fallback_level = None   # 다음 모델로 다시 보낼 때의 폴백 단계
+        if error is None:
+            if translated_chunk_raw: # 성공적인 번역 결과
+                if isinstance(translated_chunk_raw, dict): # JSON 요청 모드: 이미 줄 ID로 매핑됨
+                    translated_by_id = translated_chunk_raw
+                else:
+                    translated_lines = self._split_chunk_result(chunk_info, translated_chunk_raw)
+                    if translated_lines is None:
+                        problem = "번역 결과 줄 수가 원문과 다름"
+                    else:
+                        translated_by_id = dict(enumerate(translated_lines))
+            else: # API가 None이나 빈 문자열 반환 (비정상적)
+                problem = "API가 빈 응답을 반환함"
+        elif isinstance(error, CancelledError): # future.cancel()이 명시적으로 성공한 경우
+            self.app.put_message_in_queue(MSG_TYPE_STATUS, f"청크 {original_idx+1} 작업이 명시적으로 취소되었습니다.")
+            can_requeue = False
+        elif isinstance(error, google_exceptions.PermissionDenied):
+            # API 키 문제나 권한 문제는 심각, 전체 번역 중단
+            self.app.put_message_in_queue(MSG_TYPE_ERROR, f"청크 {original_idx+1} 처리 중 오류: {type(error).__name__} - {str(error)[:100]}. 원본을 사용합니다.")
+            self.app.put_message_in_queue(MSG_TYPE_STATUS, "API 키 또는 권한 문제로 번역을 중단합니다.")
+            self._record_chunk_metrics(job, chunk_info, attempt_info, model_used, "aborted", postprocess_started)
+            return False
+        elif isinstance(error, ValueError): # 잘못된 프롬프트 템플릿 등: 다시 요청해도 같은 오류
+            self.app.put_message_in_queue(MSG_TYPE_ERROR, f"청크 {original_idx+1} 처리 중 오류: {type(error).__name__} - {str(error)[:100]}. 원본을 사용합니다.")
+            can_requeue = False
+        else: # 재시도 후에도 실패한 API 오류, 연결 오류 등
+            problem = f"처리 중 오류: {type(error).__name__} - {str(error)[:100]}"
+            if self._is_throttling_error(error) or self._is_retryable_error(error):
+                fallback_level = self._record_model_failure(job, model_used)
+        if error is None:
+            model_router.report_success(model_used)
+
+        # 검증: 번역 줄이 있고 태그 토큰 집합이 원문과 같은 줄만 통과
+        unique_texts = job["unique_texts"]
+        accepted = []
+        bad_uids = []
+        damaged_count = 0
+        for line_id, uid in enumerate(chunk_uids):
+            translated_line = translated_by_id.get(line_id)
+            if translated_line is None:
+                bad_uids.append(uid)
+            elif token_ids_in(translated_line) != token_ids_in(unique_texts[uid]):
+                bad_uids.append(uid)
+                damaged_count += 1
+            else:
+                accepted.append((uid, translated_line))
+
+        if accepted:
+            tm = job["tm"]
+            tm_entries = []
+            journal_pairs = []
+            line_results = job["line_results"]
+            for uid, translated_line in accepted:
+                # 같은 원문을 가진 모든 위치로 번역 결과를 분배
+                for pos in job["unique_positions"][uid]:
+                    line_results[pos] = self._compose_line(job, pos, translated_line)
+                if tm:
+                    # 폴백 모델의 번역은 그 모델의 키로 저장 (다음 작업에서 선택한 모델의 번역을 대신하지 않음)
+                    tm_key = (job["unique_tm_keys"][uid] if model_used == job["model_name"] else
+                              TranslationMemory.make_key(unique_texts[uid], model_used, job["tm_prompt_hash"]))
+                    tm_entries.append((tm_key, translated_line))
+                if job["journal"]:
+                    journal_pairs.append((job["unique_journal_keys"][uid], translated_line))
+            if tm:
+                tm.put_many(tm_entries, model_id=model_used)
+            if job["journal"]:
+                job["journal"].record_chunk(original_idx, chunk_info["processed_text"], journal_pairs, model_id=model_used)
+            job["model_usage"][model_used] = job["model_usage"].get(model_used, 0) + len(accepted)
+
+        requeued_uids = set()
+        if fallback_level is not None: # 청크 전체를 다음 모델로 (줄을 나누지 않음)
+            fallback_chunk = dict(chunk_info, index=len(job["chunks"]), model_level=fallback_level)
+            job["chunks"].append(fallback_chunk)
+            job["requeue"].append(fallback_chunk)
+            requeued_uids.update(chunk_uids)
+            self.app.put_message_in_queue(
+                MSG_TYPE_STATUS,
+                f"청크 {original_idx+1}: {model_used}에서 {problem}. 모델 {model_router.chain[fallback_level]}(으)로 다시 번역합니다."
+            )
+        elif bad_uids and can_requeue:
+            if problem is None:
+                missing_count = len(bad_uids) - damaged_count
+                problem = ", ".join(part for part in (f"번역 누락 {missing_count}줄" if missing_count else "",
+                                                      f"플레이스홀더 손상 {damaged_count}줄" if damaged_count else "") if part)
+            sub_chunk_count = self._requeue_lines(job, chunk_info, bad_uids)
+            if sub_chunk_count:
+                requeued_uids.update(bad_uids)
+                self.app.put_message_in_queue(
+                    MSG_TYPE_STATUS,
+                    f"청크 {original_idx+1}: {problem}. {len(bad_uids)}줄만 {sub_chunk_count}개의 작은 요청으로 다시 번역합니다."
+                )
+            elif error is not None:
+                self.app.put_message_in_queue(MSG_TYPE_ERROR, f"청크 {original_idx+1} {problem}. 원본을 사용합니다.")
+            else:
+                self.app.put_message_in_queue(MSG_TYPE_STATUS, f"경고: 청크 {original_idx+1}: {problem}. {len(bad_uids)}줄은 원본을 사용합니다.")
+
+        # 번역 결과를 얻지 못한 줄은 이 시점에 원본으로 확정 (다시 요청한 줄 제외, 순서대로 전달하기 위함)
+        line_results, lines = job["line_results"], job["lines"]
+        for uid in chunk_uids:
+            if uid in requeued_uids:
+                continue
+            for pos in job["unique_positions"][uid]:
+                if line_results[pos] is None:
+                    line_results[pos] = lines[pos]
+        self._advance_commit(job)
+
+        if fallback_level is not None:
+            outcome = "fallback"
+        elif requeued_uids:
+            outcome = "requeued"
+        elif not bad_uids and error is None:
+            outcome = "ok"
+        else:
+            outcome = "partial" if accepted else "failed"
+        self._record_chunk_metrics(job, chunk_info, attempt_info, model_used, outcome, postprocess_started)
 
-        # 초기 진행률 설정
-        self.app.put_message_in_queue(MSG_TYPE_PROGRESS, (0, total_translatable_chunks))
-        
-        translated_results = [None] * len(chunks_to_process) # 각 청크의 번역 결과를 저장할 리스트
-        processed_api_chunks_count = 0 # API 호출로 처리된 청크 수 (진행률용)
+        job["processed_chunks"] += 1
+        job["settled_lines"] += len(chunk_uids) - len(requeued_uids)
+        self.app.put_message_in_queue(MSG_TYPE_PROGRESS, (job["settled_lines"], job["progress_total"]))
+        return True
 
-        with ThreadPoolExecutor(max_workers=num_workers_for_model) as executor:
-            future_to_chunk_info = {}
-            for chunk_info in chunks_to_process:
+    def _record_chunk_metrics(self, job, chunk_info, attempt_info, model_used, outcome, postprocess_started):
+        """청크 하나의 통계를 job["metrics"]에 기록합니다 (결과 처리 루프에서만 호출)."""
+        metrics = job.get("metrics")
+        if not metrics:
+            return
+        submitted, request_started = attempt_info.get("submitted"), attempt_info.get("request_started")
+        metrics.record_chunk(
+            chunk=chunk_info["index"] + 1,
+            model=model_used,
+            lines=len(chunk_info["unique_ids"]),
+            outcome=outcome,
+            queue_wait=request_started - submitted if submitted is not None and request_started is not None else None,
+            api_latency=attempt_info.get("api_latency"),
+            retries=attempt_info.get("retries", 0),
+            prompt_tokens=attempt_info.get("prompt_tokens"),
+            response_tokens=attempt_info.get("response_tokens"),
+            postprocess=time.monotonic() - postprocess_started,
+        )
+
+    def _record_model_failure(self, job, model_used):
+        """
+        재시도를 모두 소진한 모델 실패를 폴백 경로에 기록하고, 청크를 다시 보낼 폴백 단계를 반환합니다 (없으면 None).
+        같은 모델에서 실패가 이어져 그 모델이 차단되면 알립니다 (아직 시작하지 않은 청크도 다음 모델로 감).
+        """
+        model_router = job["model_router"]
+        cancel_event = job["cancel_event"]
+        tripped_to = model_router.report_failure(model_used)
+        if tripped_to:
+            self.app.put_message_in_queue(
+                MSG_TYPE_STATUS,
+                f"모델 {model_used}에서 실패가 계속되어 이번 작업의 남은 청크는 {tripped_to}(으)로 보냅니다."
+            )
+        if cancel_event and cancel_event.is_set():
+            return None
+        return model_router.next_level(model_used)
+
+    def _requeue_lines(self, job, chunk_info, bad_uids):
+        """
+        검증에 실패한 줄을 원래 청크보다 작은 하위 청크로 나눠 다시 대기열(job["requeue"])에 넣습니다.
+        반환: 만든 하위 청크 수 (MAX_REPAIR_ROUNDS를 넘었거나 취소된 경우 0)
+        """
+        repair_round = chunk_info.get("repair_round", 0) + 1
+        cancel_event = job["cancel_event"]
+        if repair_round > MAX_REPAIR_ROUNDS or (cancel_event and cancel_event.is_set()):
+            return 0
+        sub_chunk_size = max(1, math.ceil(len(chunk_info["unique_ids"]) / REPAIR_SPLIT_FACTOR))
+        sub_chunk_groups = chunk_by_line_count(bad_uids, sub_chunk_size)
+        for sub_uids in sub_chunk_groups:
+            sub_chunk = {
+                "index": len(job["chunks"]),
+                "unique_ids": sub_uids,
+                "processed_text": "\n".join(job["unique_texts"][uid] for uid in sub_uids),
+                "repair_round": repair_round,
+                "model_level": chunk_info.get("model_level", 0), # 폴백 모델로 넘어간 청크는 같은 모델로 다시 요청
+            }
+            job["chunks"].append(sub_chunk)
+            job["requeue"].append(sub_chunk)
+        return len(sub_chunk_groups)
+
+    def _take_requeued_chunks(self, job):
+        """_apply_chunk_outcome이 다시 대기열에 넣은 하위 청크를 꺼냅니다 (결과 처리 루프에서만 호출)."""
+        requeued, job["requeue"] = job["requeue"], []
+        return requeued
+
+    def _compose_line(self, job, pos, translated_line):
+        """토큰 상태의 번역 줄을 위치별 맵으로 태그 복원하고, ID 필드와 원래 줄바꿈을 다시 붙입니다."""
+        return (job["line_prefixes"].get(pos, "") +
+                self.mnb_postprocess_text(translated_line, job["line_tag_maps"].get(pos)) +
+                job["line_endings"][pos])
+
+    def _advance_commit(self, job):
+        """앞에서부터 연속으로 완료된 줄을 on_commit으로 전달하고 커밋 위치를 옮깁니다."""
+        on_commit = job["on_commit"]
+        if not on_commit:
+            return
+        line_results = job["line_results"]
+        start = end = job["commit_pos"]
+        while end < len(line_results) and line_results[end] is not None:
+            end += 1
+        if end == start:
+            return
+        segment = "".join(line_results[start:end])
+        line_results[start:end] = [""] * (end - start) # 전달한 줄은 버퍼에서 해제 (이후 다시 쓰이지 않음)
+        job["commit_pos"] = end
+        on_commit(segment)
+
+    def _execute_job_threaded(self, job):
+        """
+        스레드 풀 엔진. 중단되면 job["abort_result"]를 설정하고 False를 반환합니다.
+        워커는 job["worker_cancel_event"]로 중단하며, 작업이 어떻게 끝나든 설정되므로 남은 요청이 재시도하거나 새 슬롯을 잡지 않습니다.
+        """
+        cancel_event = job["cancel_event"]
+        worker_cancel_event = job["worker_cancel_event"]
+        concurrency_controller = job["concurrency_controller"]
+        hedge_tracker = HedgeTracker(len(job["chunks"]), job["hedge_budget"])
+        # 스레드는 상한만큼 두고, 실제 동시 요청 수는 컨트롤러가 제한
+        executor = ThreadPoolExecutor(max_workers=concurrency_controller.max_limit)
+        future_to_chunk_info = {}
+        attempt_infos = {} # future -> {"started": 호출 시작 시각, "model": 사용한 모델, 작업 통계 값}
+        completed = False
+
+        def _submit(chunk_info):
+            # API 호출 작업 제출 (모델과 호출 인자는 워커가 실제로 시작할 때 정함)
+            attempt_info = {"submitted": time.monotonic()}
+            future = executor.submit(self._run_chunk_attempt, job, chunk_info, attempt_info)
+            future_to_chunk_info[future] = chunk_info
+            attempt_infos[future] = attempt_info
+            job["chunk_attempts"].setdefault(chunk_info["index"], set()).add(future)
+            return future
+
+        try:
+            for chunk_info in job["chunks"]:
                 if cancel_event and cancel_event.is_set(): break # 작업 취소 감지
-                
-                if chunk_info.get("is_empty"): # 빈 청크는 API 호출 없이 원본 사용
-                    translated_results[chunk_info["index"]] = chunk_info["original_text"]
-                    continue # 다음 청크로
-
-                # API 호출 작업 제출
-                future = executor.submit(self._call_single_chunk_api_with_retry, # 재시도 로직 포함된 함수로 변경
-                                         chunk_info["processed_text"], api_key,
-                                         effective_model_name,
-                                         prompt_template,
-                                         current_chunk_index_for_debug=chunk_info["index"] + 1)
-                future_to_chunk_info[future] = chunk_info
-
-            # 완료된 작업 순서대로 결과 처리
-            for future in as_completed(future_to_chunk_info):
+                _submit(chunk_info)
+
+            # 완료된 작업 순서대로 결과 처리 (검증에 실패해 다시 대기열에 들어간 하위 청크도 이어서 제출)
+            # 중복 요청을 쓰면 주기적으로 깨어나 느린 청크를 확인, 취소 토큰이 있으면 주기적으로 취소 여부 확인
+            if hedge_tracker.enabled:
+                check_interval = HEDGE_CHECK_INTERVAL
+            else:
+                check_interval = THREAD_CANCEL_POLL_INTERVAL if cancel_event else None
+            pending = set(future_to_chunk_info)
+            while pending:
+                with profile_span("translate.executor.wait"): # 결과 처리 루프가 응답을 기다린 시간
+                    done, pending = wait(pending, timeout=check_interval, return_when=FIRST_COMPLETED)
+                if cancel_event and cancel_event.is_set(): # 작업 취소 감지 (남은 요청은 finally에서 정리)
+                    self.app.put_message_in_queue(MSG_TYPE_STATUS, "취소 요청으로 결과 처리를 중단합니다.")
+                    job["abort_result"] = "CANCELLED_BY_TRANSLATOR"
+                    return False
+                for future in done:
+                    try:
+                        translated_chunk_raw, error = future.result(), None # 예외 발생 가능성 있음
+                    except Exception as e:
+                        translated_chunk_raw, error = None, e
+                    chunk_info = future_to_chunk_info[future]
+                    attempt_info = attempt_infos.pop(future)
+                    use_result, losing_attempts = self._settle_attempt(
+                        job, hedge_tracker, chunk_info, future, error, attempt_info.get("started"))
+                    if not use_result:
+                        continue
+                    for losing_future in losing_attempts: # 중복 요청 중 늦은 쪽은 기다리지 않음
+                        losing_future.cancel()
+                        pending.discard(losing_future)
+                        attempt_infos.pop(losing_future, None)
+                    with profile_span("translate.executor.apply"): # 검증, 분배, 번역 메모리/작업 기록, 순서대로 전달
+                        applied = self._apply_chunk_outcome(job, chunk_info, translated_chunk_raw, error, attempt_info)
+                    if not applied:
+                        job["abort_result"] = None # None 반환으로 GUI에서 전체 오류 처리
+                        return False
+                    for requeued_chunk in self._take_requeued_chunks(job):
+                        pending.add(_submit(requeued_chunk))
+                if hedge_tracker.enabled and pending:
+                    running = [(future_to_chunk_info[f], attempt_infos[f].get("started")) for f in pending]
+                    for chunk_info in self._pick_hedges(job, hedge_tracker, running):
+                        pending.add(_submit(chunk_info))
+            completed = True
+            return True
+        finally:
+            # 아직 시작하지 않은 요청은 취소하고, 실행 중인 요청은 재시도/슬롯 대기 없이 끝나도록 중단 신호를 보냄
+            worker_cancel_event.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            running = [future for future in future_to_chunk_info if not future.done()]
+            if running and not completed:
+                # 중단된 작업: 진행 중인 요청이 끝나 동시성 슬롯을 반납할 때까지 잠시 기다림 (다음 작업이 같은 컨트롤러를 씀)
+                # 정상 완료 시 남은 것은 중복 요청에서 진 요청뿐이므로 기다리지 않음 (응답은 버려지고 슬롯은 요청이 끝나면 반납됨)
+                wait(running, timeout=WORKER_SHUTDOWN_TIMEOUT)
+
+    def _run_chunk_attempt(self, job, chunk_info, attempt_info):
+        """워커 스레드에서 청크 요청 하나를 실행하고, 시작 시각(중복 요청 판단용)과 사용한 모델을 기록합니다."""
+        call_function, call_args, call_kwargs, attempt_info["model"] = self._chunk_request(job, chunk_info, attempt_info)
+        attempt_info["started"] = time.monotonic()
+        with profile_span("translate.request"): # 워커별 요청 시간의 합 (슬롯/RPM 대기와 재시도 포함, 동시 실행이므로 벽시계 시간보다 큼)
+            return call_function(*call_args, **call_kwargs)
+
+    def _settle_attempt(self, job, hedge_tracker, chunk_info, attempt, error, started_at):
+        """
+        청크의 요청(원 요청 또는 중복 요청) 하나가 끝났을 때 그 결과를 사용할지 정합니다. 두 엔진이 함께 사용합니다.
+        먼저 도착한 성공 응답을 사용하고, 실패했는데 같은 청크의 다른 요청이 아직 실행 중이면 그 응답을 기다립니다.
+        반환: (결과 사용 여부, 취소할 같은 청크의 나머지 요청 목록)
+        """
+        chunk_index = chunk_info["index"]
+        in_flight = job["chunk_attempts"].get(chunk_index, set())
+        in_flight.discard(attempt)
+        if chunk_index in job["settled_chunks"] or (error is not None and in_flight):
+            return False, ()
+        job["settled_chunks"].add(chunk_index)
+        job["chunk_attempts"].pop(chunk_index, None)
+        if error is None and started_at is not None:
+            hedge_tracker.record_latency(time.monotonic() - started_at)
+        return True, tuple(in_flight)
+
+    def _pick_hedges(self, job, hedge_tracker, running):
+        """
+        running: [(청크 정보, 호출 시작 시각 또는 None)] 중 중복 요청을 보낼 청크 목록을 반환합니다.
+        작업의 마지막 구간에서 완료된 청크 지연 시간의 백분위수보다 오래 걸리는 청크만, 예산 안에서 한 번씩 고릅니다.
+        """
+        remaining_chunks = len(job["chunks"]) - job["processed_chunks"]
+        now = time.monotonic()
+        hedged = []
+        for chunk_info, started_at in running:
+            if started_at is None:
+                continue
+            if hedge_tracker.should_hedge(chunk_info["index"], now - started_at, remaining_chunks, len(job["chunks"])):
+                hedge_tracker.note_hedge(chunk_info["index"])
+                hedged.append(chunk_info)
+                self.app.put_message_in_queue(
+                    MSG_TYPE_STATUS,
+                    f"청크 {chunk_info['index']+1}: {now - started_at:.1f}초째 응답이 없어 중복 요청을 보냅니다 "
+                    f"({hedge_tracker.hedges_sent}/{hedge_tracker.max_hedges})"
+                )
+        return hedged
+
+    def _chunk_request(self, job, chunk_info, call_stats=None, use_async=False):
+        """
+        청크 요청 하나의 호출 함수와 인자를 만듭니다. 모델은 이 시점의 폴백 경로로 정하고, 그 모델의 컨트롤러/리미터를 씁니다.
+        입력은 요청 형식에 따라 줄바꿈으로 이은 텍스트(텍스트 모드) 또는 줄 목록(JSON 모드)입니다.
+        call_stats: 호출 함수가 지연 시간/재시도/토큰 사용량을 기록할 딕셔너리 (요청의 attempt_info)
+        반환: (호출 함수, 위치 인자, 키워드 인자, 모델 ID)
+        """
+        model_name = job["model_router"].model_for(chunk_info)
+        concurrency_controller, rate_limiter = job["model_router"].components(model_name)
+        if job["request_format"] == REQUEST_FORMAT_JSON:
+            call_function = self._call_chunk_json_async if use_async else self._call_chunk_json_with_retry
+            chunk_payload = [job["unique_texts"][uid] for uid in chunk_info["unique_ids"]]
+        else:
+            call_function = self._call_single_chunk_api_async if use_async else self._call_single_chunk_api_with_retry
+            chunk_payload = chunk_info["processed_text"]
+        call_kwargs = {
+            "current_chunk_index_for_debug": chunk_info["index"] + 1,
+            "concurrency_controller": concurrency_controller,
+            "rate_limiter": rate_limiter,
+            "request_timeout": job["request_timeout"],
+            "call_stats": call_stats,
+        }
+        if not use_async: # asyncio 엔진은 Task 취소로 중단
+            call_kwargs["cancel_event"] = job["worker_cancel_event"]
+        return call_function, (chunk_payload, job["client"], model_name, job["prompt_template"]), call_kwargs, model_name
+
+    def _get_async_loop(self):
+        """asyncio 엔진용 이벤트 루프 (전용 데몬 스레드에서 계속 실행, 작업 간 재사용하여 비동기 연결 유지)"""
+        with self._async_loop_lock:
+            if self._async_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="translator-asyncio", daemon=True).start()
+                self._async_loop = loop
+            return self._async_loop
+
+    def _execute_job_async(self, job):
+        """asyncio 엔진. 호출 스레드는 루프 스레드에서 작업이 끝날 때까지 기다립니다."""
+        return asyncio.run_coroutine_threadsafe(self._run_job_async(job), self._get_async_loop()).result()
+
+    async def _run_job_async(self, job):
+        cancel_event = job["cancel_event"]
+        concurrency_controller = job["concurrency_controller"]
+        # 세마포어: 동시에 슬롯을 기다리며 폴링하는 코루틴 수를 상한으로 제한 (나머지는 세마포어에서 대기)
+        semaphore = asyncio.Semaphore(concurrency_controller.max_limit)
+
+        hedge_tracker = HedgeTracker(len(job["chunks"]), job["hedge_budget"])
+        attempt_infos = {} # Task -> {"started": 호출 시작 시각, "model": 사용한 모델, 작업 통계 값}
+
+        async def _run_chunk(chunk_info, attempt_info):
+            async with semaphore:
+                call_function, call_args, call_kwargs, attempt_info["model"] = self._chunk_request(
+                    job, chunk_info, attempt_info, use_async=True)
+                attempt_info["started"] = time.monotonic()
+                with profile_span("translate.request"):
+                    return await call_function(*call_args, **call_kwargs)
+
+        def _start(chunk_info):
+            attempt_info = {"submitted": time.monotonic()}
+            task = asyncio.ensure_future(_run_chunk(chunk_info, attempt_info))
+            task_to_chunk_info[task] = chunk_info
+            attempt_infos[task] = attempt_info
+            job["chunk_attempts"].setdefault(chunk_info["index"], set()).add(task)
+            return task
+
+        async def _wait_for_cancel():
+            # 취소 토큰(threading.Event)을 감시하다가 설정되면 반환
+            while not cancel_event.is_set():
+                await asyncio.sleep(ASYNC_CANCEL_POLL_INTERVAL)
+
+        task_to_chunk_info = {}
+        pending = {_start(chunk_info) for chunk_info in job["chunks"]}
+        abandoned = set() # 중복 요청 중 늦어서 취소한 요청
+        cancel_watcher = asyncio.ensure_future(_wait_for_cancel()) if cancel_event else None
+        check_interval = HEDGE_CHECK_INTERVAL if hedge_tracker.enabled else None
+        try:
+            while pending:
+                wait_set = pending | {cancel_watcher} if cancel_watcher else pending
+                with profile_span("translate.executor.wait"):
+                    done, _ = await asyncio.wait(wait_set, timeout=check_interval, return_when=asyncio.FIRST_COMPLETED)
                 if cancel_event and cancel_event.is_set(): # 작업 취소 감지
                     self.app.put_message_in_queue(MSG_TYPE_STATUS, "취소 요청으로 결과 처리를 중단합니다.")
-                    # 이미 제출된 다른 future들을 취소 시도 (실행 중인 작업은 즉시 중단 안될 수 있음)
-                    for f_other in future_to_chunk_info.keys():
-                        if not f_other.done(): f_other.cancel()
-                    return "CANCELLED_BY_TRANSLATOR"
-
-                chunk_info_completed = future_to_chunk_info[future]
-                original_idx = chunk_info_completed["index"]
-                original_chunk_text_for_fallback = chunk_info_completed["original_text"]
-                
-                try:
-                    translated_chunk_raw = future.result() # 예외 발생 가능성 있음
-                    
-                    if translated_chunk_raw: # 성공적인 번역 결과
-                        final_translated_chunk = self.mnb_postprocess_text(translated_chunk_raw.strip())
-                        translated_results[original_idx] = final_translated_chunk
-                        # self.app.put_message_in_queue(MSG_TYPE_STATUS, f"청크 {original_idx+1} 번역 완료.") # 너무 잦은 메시지, 진행률로 대체
-                    else: # API가 None이나 빈 문자열 반환 (비정상적)
-                        translated_results[original_idx] = original_chunk_text_for_fallback
-                        self.app.put_message_in_queue(MSG_TYPE_STATUS, f"경고: 청크 {original_idx+1}에서 API가 빈 응답을 반환하여 원본을 사용합니다.")
-                
-                except CancelledError: # future.cancel()이 명시적으로 성공한 경우
-                     translated_results[original_idx] = original_chunk_text_for_fallback
-                     self.app.put_message_in_queue(MSG_TYPE_STATUS, f"청크 {original_idx+1} 작업이 명시적으로 취소되었습니다.")
-                except (google_exceptions.PermissionDenied, ConnectionError, ValueError) as e_specific:
-                    # _call_single_chunk_api_with_retry에서 재시도 후에도 실패한 특정 오류들
-                    translated_results[original_idx] = original_chunk_text_for_fallback
-                    self.app.put_message_in_queue(MSG_TYPE_ERROR, f"청크 {original_idx+1} 처리 중 오류: {type(e_specific).__name__} - {str(e_specific)[:100]}. 원본을 사용합니다.")
-                    if isinstance(e_specific, google_exceptions.PermissionDenied) or \
-                       (isinstance(e_specific, ConnectionError) and "API 키 설정 실패" in str(e_specific)):
-                        # API 키 문제나 권한 문제는 심각, 전체 번역 중단
-                        self.app.put_message_in_queue(MSG_TYPE_STATUS, "API 키 또는 권한 문제로 번역을 중단합니다.")
-                        for f_other in future_to_chunk_info.keys(): # 나머지 작업 취소
-                            if not f_other.done(): f_other.cancel()
-                        return None # None 반환으로 GUI에서 전체 오류 처리
-                except Exception as e_general: # 그 외 모든 예외 (API 호출 중 발생)
-                    translated_results[original_idx] = original_chunk_text_for_fallback
-                    self.app.put_message_in_queue(MSG_TYPE_ERROR, f"청크 {original_idx+1} 처리 중 예기치 않은 오류: {type(e_general).__name__} - {str(e_general)[:100]}. 원본을 사용합니다.")
-                
-                processed_api_chunks_count += 1
-                self.app.put_message_in_queue(MSG_TYPE_PROGRESS, (processed_api_chunks_count, total_translatable_chunks))
+                    job["abort_result"] = "CANCELLED_BY_TRANSLATOR"
+                    return False
+                for task in done:
+                    pending.discard(task)
+                    try:
+                        translated_chunk_raw, error = task.result(), None
+                    except Exception as e:
+                        translated_chunk_raw, error = None, e
+                    chunk_info = task_to_chunk_info[task]
+                    attempt_info = attempt_infos.pop(task)
+                    use_result, losing_attempts = self._settle_attempt(
+                        job, hedge_tracker, chunk_info, task, error, attempt_info.get("started"))
+                    if not use_result:
+                        continue
+                    for losing_task in losing_attempts: # 중복 요청 중 늦은 쪽은 취소 (슬롯은 코루틴이 반납)
+                        losing_task.cancel()
+                        pending.discard(losing_task)
+                        abandoned.add(losing_task)
+                        attempt_infos.pop(losing_task, None)
+                    with profile_span("translate.executor.apply"):
+                        applied = self._apply_chunk_outcome(job, chunk_info, translated_chunk_raw, error, attempt_info)
+                    if not applied:
+                        job["abort_result"] = None
+                        return False
+                    for requeued_chunk in self._take_requeued_chunks(job):
+                        pending.add(_start(requeued_chunk))
+                if hedge_tracker.enabled and pending:
+                    running = [(task_to_chunk_info[t], attempt_infos[t].get("started")) for t in pending]
+                    for chunk_info in self._pick_hedges(job, hedge_tracker, running):
+                        pending.add(_start(chunk_info))
+            return True
+        finally:
+            # 남은 요청은 Task 취소로 즉시 중단 (슬롯은 각 코루틴이 반납)
+            job["worker_cancel_event"].set()
+            for task in pending:
+                task.cancel()
+            if cancel_watcher:
+                cancel_watcher.cancel()
+            if pending or abandoned:
+                await asyncio.gather(*pending, *abandoned, return_exceptions=True)
 
+    def _assemble_job(self, job):
+        """실행이 끝난 작업의 줄 결과를 합쳐 최종 텍스트를 만듭니다."""
+        cancel_event = job["cancel_event"]
         if cancel_event and cancel_event.is_set():
             return "CANCELLED_BY_TRANSLATOR"
-        
-        # 모든 청크 결과 조합 전, 누락된 결과가 있는지 최종 확인
-        for idx in range(len(chunks_to_process)):
-            if translated_results[idx] is None: # 어떤 이유로든 결과가 None이면 원본으로 대체
-                translated_results[idx] = chunks_to_process[idx]["original_text"]
-                self.app.put_message_in_queue(MSG_TYPE_STATUS, f"경고: 청크 {idx+1}의 최종 결과가 누락되어 원본으로 대체합니다.")
-        
-        return "".join(translated_results) # 모든 청크의 (번역 또는 원본) 텍스트를 합쳐 반환
\ No newline at end of file
+
+        model_usage = job["model_usage"]
+        if len(model_usage) > 1 or (model_usage and job["model_name"] not in model_usage):
+            self.app.put_message_in_queue(
+                MSG_TYPE_STATUS,
+                "모델별 번역 줄 수 (고유 줄): " + ", ".join(f"{model_id} {count}줄" for model_id, count in model_usage.items())
+            )
+
+        tm = job["tm"]
+        if tm:
+            tm_stats = tm.stats()
+            self.app.put_message_in_queue(MSG_TYPE_STATUS, f"번역 메모리 통계: 적중 {tm_stats['hits']}, 미적중 {tm_stats['misses']}, 저장 항목 {tm_stats['entries']}")
+
+        if job["on_commit"]:
+            self._advance_commit(job) # 모든 줄이 확정되었으므로 남은 구간을 전달
+            return ""
+
+        # 결과가 없는 줄(오류, 빈 응답 등)은 원본으로 대체
+        lines, line_results = job["lines"], job["line_results"]
+        for idx in range(len(lines)):
+            if line_results[idx] is None:
+                line_results[idx] = lines[idx]
+
+        return self._join_line_results(line_results, job["split_sizes"]) # 모든 줄의 (번역 또는 원본) 텍스트를 합쳐 반환
+
+    def _join_line_results(self, line_results, split_sizes=None):
+        if split_sizes is None:
+            return "".join(line_results)
+        texts = []
+        start = 0
+        for size in split_sizes:
+            texts.append("".join(line_results[start:start + size]))
+            start += size
+        return texts
+
+    def translate_texts(self, texts, api_key, **kwargs):
+        """
+        여러 텍스트(예: 폴더 안의 파일들)를 하나의 작업으로 번역합니다.
+        모든 텍스트의 줄이 하나의 청크 대기열을 공유하므로 파일 간 중복 줄도 한 번만 번역되고,
+        작은 파일이 많아도 청크가 꽉 채워집니다. 옵션은 translate_by_chunks와 같습니다 (on_commit 제외).
+        반환: 텍스트별 번역 결과 목록, 또는 translate_by_chunks와 같은 None / "CANCELLED_BY_TRANSLATOR"
+        """
+        line_lists = [text.splitlines(keepends=True) for text in texts]
+        all_lines = [line for file_lines in line_lists for line in file_lines]
+        return self.translate_by_chunks(all_lines, api_key, split_sizes=[len(file_lines) for file_lines in line_lists], **kwargs)
@@ -1,9 +1,8 @@
 import tkinter as tk
-from tkinter import scrolledtext, messagebox, Spinbox, ttk, filedialog, Listbox, END, SINGLE, Scrollbar
+from tkinter import messagebox, Spinbox, ttk, filedialog, Listbox, END, SINGLE, Scrollbar
 from tkinter import font as tkfont # 폰트 관리를 위해
 import os
 import threading
-import queue
 import time
 import sys # PyInstaller 경로 처리를 위해
 
@@ -12,12 +11,26 @@ from core.config_manager import (
     load_config, save_config,
     API_KEY_NAME_IN_CONFIG, CHUNK_SIZE_NAME_IN_CONFIG, SELECTED_PROMPT_ID_NAME_IN_CONFIG,
     ACTIVE_GLOSSARY_FILES_NAME_IN_CONFIG, SELECTED_MODEL_ID_NAME_IN_CONFIG,
-    DEFAULT_CHUNK_SIZE, USER_DATA_DIR, AVAILABLE_MODELS, DEFAULT_MODEL_ID
+    TRANSLATION_MEMORY_ENABLED_NAME_IN_CONFIG, TRANSLATION_MEMORY_MAX_ENTRIES_NAME_IN_CONFIG,
+    CHUNK_MODE_NAME_IN_CONFIG, CHUNK_TOKEN_BUDGET_NAME_IN_CONFIG, MODEL_RATE_LIMITS_NAME_IN_CONFIG,
+    TRANSLATION_ENGINE_NAME_IN_CONFIG, DEFAULT_TRANSLATION_ENGINE,
+    REQUEST_FORMAT_NAME_IN_CONFIG, DEFAULT_REQUEST_FORMAT,
+    REQUEST_TIMEOUT_NAME_IN_CONFIG, DEFAULT_REQUEST_TIMEOUT, HEDGE_BUDGET_NAME_IN_CONFIG, DEFAULT_HEDGE_BUDGET,
+    MODEL_FALLBACK_CHAINS_NAME_IN_CONFIG, PROFILING_NAME_IN_CONFIG,
+    CHUNK_MODE_TOKENS, CHUNK_MODE_LINES, DEFAULT_CHUNK_MODE,
+    DEFAULT_CHUNK_SIZE, DEFAULT_TRANSLATION_MEMORY_MAX_ENTRIES,
+    USER_DATA_DIR, AVAILABLE_MODELS, DEFAULT_MODEL_ID
 )
 from core.prompt_manager import PromptManager
 from core.translator import TextProcessor
-from core.file_handler import FileHandler
+from core.file_handler import FileHandler, LARGE_FILE_THRESHOLD
 from core.glossary_manager import GlossaryManager
+from core.translation_memory import TranslationMemory
+from core.job_journal import JobJournal
+from core.job_metrics import JobMetrics
+from core.profiler import get_profiler, configure_profiler, profile_span
+from gui.virtual_text import VirtualTextPane
+from gui.message_pump import MessagePump
 
 # 메시지 타입 정의
 MSG_TYPE_PROGRESS = "progress"
@@ -26,6 +39,16 @@ MSG_TYPE_RESULT = "result"
 MSG_TYPE_ERROR = "error"
 MSG_TYPE_FILE_LOAD_RESULT = "file_load_result"
 MSG_TYPE_OPERATION_COMPLETE = "operation_complete"
+MSG_TYPE_CONCURRENCY = "concurrency"
+MSG_TYPE_RESULT_APPEND = "result_append" # 번역 결과 중 앞에서부터 완료된 구간 (순서대로 이어 붙임)
+MSG_TYPE_METRICS = "metrics" # 작업 통계 요약과 보고서 경로
+MSG_TYPE_RESULT_PARTIAL = "result_partial" # 번역이 취소/중단되어 번역 창에 앞부분만 있음
+MSG_TYPE_ASK_RESUME = "ask_resume" # 중단된 작업 기록이 있어 이어서 번역할지 묻기 (데이터: (응답 딕셔너리, 응답 완료 이벤트))
+
+CLOSE_POLL_INTERVAL_MS = 200 # 종료 시 취소한 작업 스레드가 끝났는지 다시 확인하는 간격 (밀리초)
+RESUME_ANSWER_POLL_INTERVAL = 0.2 # 번역 스레드가 이어하기 응답을 기다리며 취소 여부를 확인하는 간격 (초)
+
+MAX_ERRORS_IN_DIALOG = 10 # 오류 대화상자 하나에 표시할 최대 오류 수
 
 def resource_path(relative_path):
     try:
@@ -44,12 +67,20 @@ class CoreTranslatorApp:
         self.config = {}
         self.api_key = ""
         self.current_chunk_size = DEFAULT_CHUNK_SIZE
+        self.current_chunk_mode = DEFAULT_CHUNK_MODE
         self.unsaved_translation = False
+        self.translation_partial = False # 번역 창 내용이 취소/중단된 작업의 앞부분뿐인지 여부
         self.is_csv_mode = False
+        self.source_line_view = None # 원문 창 모델이 사용 중인 메모리 매핑 줄 보기 (새 파일을 불러오거나 종료할 때 닫음)
 
         self.current_operation_thread = None
         self.cancel_requested = threading.Event()
-        self.message_queue = queue.Queue()
+        # 진행률/상태는 마지막 값만 프레임당 한 번 반영, 오류는 모아서 한 번에 표시
+        self.message_pump = MessagePump(
+            self.master, self.process_message,
+            coalesce_types=(MSG_TYPE_PROGRESS, MSG_TYPE_STATUS, MSG_TYPE_CONCURRENCY),
+            batch_type=MSG_TYPE_ERROR, on_batch=self.show_error_batch
+        )
 
         default_prompts_path = resource_path(os.path.join("data", "default_prompts.json"))
         self.prompt_manager = PromptManager(prompts_file_path=default_prompts_path)
@@ -129,23 +160,35 @@ class CoreTranslatorApp:
         self.update_initial_status_message()
 
         master.protocol("WM_DELETE_WINDOW", self.on_closing)
-        self.master.after(100, self.process_message_queue)
 
     def _setup_ui(self):
         # --- 하단 상태 표시줄 및 진행률 표시줄 ---
         bottom_status_frame = tk.Frame(self.master, bg=self.color_bg_main) # tk.Frame 사용
         bottom_status_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=(5,10)) # 하단 여백 추가
 
-        self.status_label = tk.Label(bottom_status_frame, text="상태: 초기화 중...",
+        status_row_frame = tk.Frame(bottom_status_frame, bg=self.color_bg_main)
+        status_row_frame.pack(side=tk.TOP, fill=tk.X)
+        self.status_label = tk.Label(status_row_frame, text="상태: 초기화 중...",
                                      bd=1, relief=tk.SUNKEN, anchor=tk.W,
                                      font=self.small_font, bg="#D0D0D0", fg=self.color_text_main) # 약간 다른 배경
-        self.status_label.pack(side=tk.TOP, fill=tk.X)
+        self.status_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        # 적응형 동시성 제어의 현재 동시 요청 한도
+        self.concurrency_label = tk.Label(status_row_frame, text="동시 요청: -",
+                                          bd=1, relief=tk.SUNKEN, anchor=tk.CENTER, width=14,
+                                          font=self.small_font, bg="#D0D0D0", fg=self.color_text_main)
+        self.concurrency_label.pack(side=tk.RIGHT, padx=(5, 0))
 
         self.progress_var = tk.DoubleVar()
         self.progressbar = ttk.Progressbar(bottom_status_frame, variable=self.progress_var, maximum=100,
                                            style="TProgressbar") # 위에서 정의한 스타일 적용
         self.progressbar.pack(side=tk.TOP, fill=tk.X, pady=(3,0))
 
+        # 마지막 번역 작업의 통계 요약 (지연 시간 백분위수, 처리 속도, 토큰 사용량)
+        self.metrics_label = tk.Label(bottom_status_frame, text="작업 통계: -",
+                                      anchor=tk.W, justify=tk.LEFT,
+                                      font=self.small_font, bg=self.color_bg_main, fg=self.color_text_main)
+        self.metrics_label.pack(side=tk.TOP, fill=tk.X, pady=(3,0))
+
         # --- 상단 설정 영역 (전체 프레임) ---
         # relief와 borderwidth로 약간의 입체감/구분선 효과
         settings_outer_frame = tk.Frame(self.master, bg=self.color_bg_frame,
@@ -186,6 +229,14 @@ class CoreTranslatorApp:
             relief=tk.SUNKEN, borderwidth=1, buttonbackground=self.color_bg_frame # 스핀박스 버튼 배경
         )
         self.chunk_size_spinbox.pack(side=tk.LEFT)
+        # 체크 시 토큰 예산 기준으로 청크를 나누고, 해제 시 위의 줄 수 기준(대체 모드) 사용
+        self.chunk_mode_token_var = tk.BooleanVar(value=True)
+        self.chunk_mode_checkbutton = tk.Checkbutton(
+            chunk_size_frame, text="토큰 기준", variable=self.chunk_mode_token_var,
+            command=self.on_chunk_mode_changed, font=self.small_font,
+            bg=self.color_bg_frame, fg=self.color_text_label, activebackground=self.color_bg_frame
+        )
+        self.chunk_mode_checkbutton.pack(side=tk.LEFT, padx=(5, 0))
 
         # 설정 영역 - 두 번째 줄
         settings_row2_frame = tk.Frame(settings_outer_frame, bg=self.color_bg_frame) # tk.Frame
@@ -274,12 +325,11 @@ class CoreTranslatorApp:
                                    font=self.title_font, fg=self.color_text_title, # 제목 폰트/색상
                                    bg=self.color_bg_frame) # tk.Label
         original_label.pack(anchor=tk.W, padx=5, pady=(2,2))
-        self.original_text_area = scrolledtext.ScrolledText(
-            original_text_frame, wrap=tk.WORD, height=10,
-            font=self.default_font, bg=self.color_bg_input, fg=self.color_text_main,
-            relief=tk.FLAT, borderwidth=0 # 내부 테두리 제거, 프레임이 테두리 역할
+        # 원문/번역 창은 보이는 줄만 그리는 가상화된 창 (큰 파일에서도 Tk 메인 루프가 멈추지 않음)
+        self.original_pane = VirtualTextPane(
+            original_text_frame, font=self.default_font, bg=self.color_bg_input, fg=self.color_text_main
         )
-        self.original_text_area.pack(expand=True, fill=tk.BOTH, padx=5, pady=(0,5))
+        self.original_pane.pack(expand=True, fill=tk.BOTH, padx=5, pady=(0,5))
 
 
         translated_text_frame = tk.Frame(text_frame, bg=self.color_bg_frame, relief=tk.SUNKEN, borderwidth=1) # tk.Frame
@@ -288,13 +338,12 @@ class CoreTranslatorApp:
                                      font=self.title_font, fg=self.color_text_title,
                                      bg=self.color_bg_frame) # tk.Label
         translated_label.pack(anchor=tk.W, padx=5, pady=(2,2))
-        self.translated_text_area = scrolledtext.ScrolledText(
-            translated_text_frame, wrap=tk.WORD, height=10,
-            font=self.default_font, bg=self.color_bg_input, fg=self.color_text_main,
-            relief=tk.FLAT, borderwidth=0
+        self.translated_pane = VirtualTextPane(
+            translated_text_frame, readonly=True,
+            font=self.default_font, bg=self.color_bg_input, fg=self.color_text_main
         )
-        self.translated_text_area.pack(expand=True, fill=tk.BOTH, padx=5, pady=(0,5))
-        self.translated_text_area.config(state=tk.DISABLED)
+        self.translated_pane.pack(expand=True, fill=tk.BOTH, padx=5, pady=(0,5))
+        self.original_pane.link_scrolling(self.translated_pane) # 원문과 번역을 같은 줄에서 함께 스크롤
 
 
         # --- 주요 액션 버튼 영역 ---
@@ -326,59 +375,93 @@ class CoreTranslatorApp:
         self.cancel_button.pack(side=tk.RIGHT)
 
     def put_message_in_queue(self, msg_type, data=None):
-        self.message_queue.put((msg_type, data))
-
-    def process_message_queue(self):
+        self.message_pump.post(msg_type, data)
+
+    def process_message(self, msg_type, data):
+        if msg_type == MSG_TYPE_STATUS:
+            self.status_label.config(text=f"상태: {data}")
+        elif msg_type == MSG_TYPE_PROGRESS:
+            if isinstance(data, tuple):
+                current, maximum = data
+                percentage = (current / maximum) * 100 if maximum > 0 else 0
+                self.progress_var.set(percentage)
+            else:
+                self.progress_var.set(data)
+        elif msg_type == MSG_TYPE_CONCURRENCY:
+            limit, _in_flight = data
+            self.concurrency_label.config(text=f"동시 요청: {limit}")
+        elif msg_type == MSG_TYPE_RESULT:
+            final_translation = data
+            with profile_span("render.result"):
+                self.translated_pane.model.set_text(final_translation)
+            self.unsaved_translation = bool(final_translation)
+            self.translation_partial = False
+        elif msg_type == MSG_TYPE_RESULT_APPEND:
+            with profile_span("render.result"):
+                self.translated_pane.model.append_text(data)
+            self.unsaved_translation = True
+        elif msg_type == MSG_TYPE_ASK_RESUME:
+            answer, answered = data
+            answer["resume"] = messagebox.askyesno(
+                "이어서 번역",
+                "이 텍스트를 같은 모델과 프롬프트로 번역하다 중단된 작업 기록이 있습니다.\n"
+                "완료된 부분은 건너뛰고 이어서 번역하시겠습니까?\n\n(아니요: 기록을 지우고 처음부터 번역)")
+            answered.set()
+        elif msg_type == MSG_TYPE_RESULT_PARTIAL:
+            self.translation_partial = not self.translated_pane.model.is_blank()
+        elif msg_type == MSG_TYPE_METRICS:
+            summary_text, report_path = data
+            self.metrics_label.config(text=f"작업 통계: {summary_text}"
+                                           + (f"\n보고서: {report_path}" if report_path else ""))
+        elif msg_type == MSG_TYPE_FILE_LOAD_RESULT:
+            filepath, content, is_csv, line_view = data
+            if filepath and (content is not None or line_view is not None):
+                # 큰 파일은 줄 보기를 그대로 모델로 사용 (위젯에는 보이는 줄만 그려짐)
+                self.original_pane.model.set_lines(line_view if line_view is not None else content.splitlines(keepends=True))
+                self._set_source_line_view(line_view)
+                self.translated_pane.model.set_lines([])
+                self.is_csv_mode = is_csv
+                self.unsaved_translation = False
+                self.translation_partial = False
+                self.put_message_in_queue(MSG_TYPE_STATUS, f"파일 로드 완료: {os.path.basename(filepath)}")
+        elif msg_type == MSG_TYPE_OPERATION_COMPLETE:
+            self.toggle_main_buttons_state(tk.NORMAL)
+            self.cancel_button.config(state=tk.DISABLED)
+            self.progress_var.set(0)
+            if data == "cancelled":
+                 self.put_message_in_queue(MSG_TYPE_STATUS, "작업이 사용자에 의해 취소되었습니다.")
+            elif data == "error":
+                 self.put_message_in_queue(MSG_TYPE_STATUS, "작업 중 오류 발생하여 중단됨.")
+            self.current_operation_thread = None
+            self._publish_profile("operation")
+
+    def _publish_profile(self, label):
+        """프로파일링이 켜져 있으면 지금까지의 구간 집계를 콘솔에 출력하고 보고서로 저장한 뒤 초기화합니다."""
+        profiler = get_profiler()
+        if not profiler.enabled or not profiler.snapshot():
+            return
+        print(profiler.format_report())
         try:
-            while True:
-                msg_type, data = self.message_queue.get_nowait()
-                if msg_type == MSG_TYPE_STATUS:
-                    self.status_label.config(text=f"상태: {data}")
-                elif msg_type == MSG_TYPE_PROGRESS:
-                    if isinstance(data, tuple):
-                        current, maximum = data
-                        percentage = (current / maximum) * 100 if maximum > 0 else 0
-                        self.progress_var.set(percentage)
-                    else:
-                        self.progress_var.set(data)
-                elif msg_type == MSG_TYPE_RESULT:
-                    final_translation = data
-                    self.translated_text_area.config(state=tk.NORMAL)
-                    self.translated_text_area.delete("1.0", tk.END)
-                    self.translated_text_area.insert(tk.END, final_translation.strip())
-                    self.translated_text_area.config(state=tk.DISABLED)
-                    self.unsaved_translation = True
-                elif msg_type == MSG_TYPE_FILE_LOAD_RESULT:
-                    filepath, content, is_csv = data
-                    if filepath and content is not None:
-                        self.original_text_area.delete("1.0", tk.END)
-                        self.original_text_area.insert(tk.END, content)
-                        self.translated_text_area.config(state=tk.NORMAL)
-                        self.translated_text_area.delete("1.0", tk.END)
-                        self.translated_text_area.config(state=tk.DISABLED)
-                        self.is_csv_mode = is_csv
-                        self.unsaved_translation = False
-                        self.put_message_in_queue(MSG_TYPE_STATUS, f"파일 로드 완료: {os.path.basename(filepath)}")
-                elif msg_type == MSG_TYPE_ERROR:
-                    error_message = data
-                    messagebox.showerror("오류 발생", error_message)
-                    self.put_message_in_queue(MSG_TYPE_STATUS, f"오류: {str(error_message)[:70]}...")
-                elif msg_type == MSG_TYPE_OPERATION_COMPLETE:
-                    self.toggle_main_buttons_state(tk.NORMAL)
-                    self.cancel_button.config(state=tk.DISABLED)
-                    self.progress_var.set(0)
-                    if data == "cancelled":
-                         self.put_message_in_queue(MSG_TYPE_STATUS, "작업이 사용자에 의해 취소되었습니다.")
-                    elif data == "error":
-                         self.put_message_in_queue(MSG_TYPE_STATUS, "작업 중 오류 발생하여 중단됨.")
-                    self.current_operation_thread = None
-        except queue.Empty:
-            pass
-        finally:
-            self.master.after(100, self.process_message_queue)
+            print(f"프로파일 저장: {profiler.write_report(label)}")
+        except OSError as e:
+            print(f"프로파일 저장 실패: {e}")
+        profiler.reset()
+
+    def show_error_batch(self, error_messages):
+        """모인 오류 메시지를 대화상자 하나로 보여줍니다 (청크마다 대화상자를 띄우지 않음)."""
+        if len(error_messages) == 1:
+            messagebox.showerror("오류 발생", error_messages[0])
+        else:
+            shown = "\n\n".join(str(m) for m in error_messages[:MAX_ERRORS_IN_DIALOG])
+            hidden = len(error_messages) - MAX_ERRORS_IN_DIALOG
+            if hidden > 0:
+                shown += f"\n\n... 외 {hidden}건"
+            messagebox.showerror(f"오류 발생 ({len(error_messages)}건)", shown)
+        self.put_message_in_queue(MSG_TYPE_STATUS, f"오류: {str(error_messages[-1])[:70]}...")
 
     def load_initial_config_gui(self):
         self.config = load_config()
+        configure_profiler(self.config.get(PROFILING_NAME_IN_CONFIG))
         self.api_key = self.config.get(API_KEY_NAME_IN_CONFIG, "")
         self.current_chunk_size = self.config.get(CHUNK_SIZE_NAME_IN_CONFIG, DEFAULT_CHUNK_SIZE)
         
@@ -387,6 +470,14 @@ class CoreTranslatorApp:
             self.api_key_entry.insert(0, self.api_key)
         if hasattr(self, 'chunk_size_var'):
             self.chunk_size_var.set(self.current_chunk_size)
+        self.current_chunk_mode = self.config.get(CHUNK_MODE_NAME_IN_CONFIG, DEFAULT_CHUNK_MODE)
+        if hasattr(self, 'chunk_mode_token_var'):
+            self.chunk_mode_token_var.set(self.current_chunk_mode == CHUNK_MODE_TOKENS)
+
+        if self.config.get(TRANSLATION_MEMORY_ENABLED_NAME_IN_CONFIG, True) and self.text_processor.translation_memory is None:
+            self.text_processor.translation_memory = TranslationMemory(
+                max_entries=self.config.get(TRANSLATION_MEMORY_MAX_ENTRIES_NAME_IN_CONFIG, DEFAULT_TRANSLATION_MEMORY_MAX_ENTRIES)
+            )
 
         active_files_from_config = self.config.get(ACTIVE_GLOSSARY_FILES_NAME_IN_CONFIG, [])
         self.glossary_manager.set_active_glossary_files(active_files_from_config)
@@ -459,6 +550,15 @@ class CoreTranslatorApp:
             self.put_message_in_queue(MSG_TYPE_STATUS, "잘못된 청크 크기 값입니다. 숫자를 입력하세요.")
             self.chunk_size_var.set(self.current_chunk_size)
 
+    def on_chunk_mode_changed(self):
+        self.current_chunk_mode = CHUNK_MODE_TOKENS if self.chunk_mode_token_var.get() else CHUNK_MODE_LINES
+        self.config[CHUNK_MODE_NAME_IN_CONFIG] = self.current_chunk_mode
+        mode_text = "토큰 예산 기준" if self.current_chunk_mode == CHUNK_MODE_TOKENS else "줄 수 기준"
+        if save_config(self.config):
+            self.put_message_in_queue(MSG_TYPE_STATUS, f"청크 분할 방식이 {mode_text}으로 설정 및 저장되었습니다.")
+        else:
+            self.put_message_in_queue(MSG_TYPE_STATUS, f"청크 분할 방식({mode_text}) 설정 저장 실패.")
+
     def on_prompt_selected(self, event=None):
         selected_name = self.prompt_combobox_var.get()
         self.current_selected_prompt_name = selected_name
@@ -505,7 +605,7 @@ class CoreTranslatorApp:
                 messagebox.showinfo("알림", "이미 추가된 용어집 파일입니다.")
                 return
             if self.glossary_manager.load_glossary_file(filepath):
-                self.glossary_manager.active_glossary_files.append(filepath)
+                self.glossary_manager.set_active_glossary_files(self.glossary_manager.active_glossary_files + [filepath])
                 self.config[ACTIVE_GLOSSARY_FILES_NAME_IN_CONFIG] = self.glossary_manager.active_glossary_files
                 if save_config(self.config):
                     self.put_message_in_queue(MSG_TYPE_STATUS, f"용어집 '{os.path.basename(filepath)}' 추가 및 저장됨.")
@@ -550,28 +650,50 @@ class CoreTranslatorApp:
         self.toggle_main_buttons_state(tk.DISABLED)
         self.cancel_button.config(state=tk.NORMAL)
         self.progress_var.set(0)
-        self.current_operation_thread = threading.Thread(
-            target=target_function, args=args_tuple, daemon=True
-        )
+        # 프로파일링에서 cProfile/tracemalloc이 켜져 있으면 작업 스레드 전체를 기록
+        capture_label = target_function.__name__.replace("_thread_target", "")
+        def _run_operation():
+            with get_profiler().capture(capture_label):
+                target_function(*args_tuple)
+        self.current_operation_thread = threading.Thread(target=_run_operation, daemon=True)
         self.current_operation_thread.start()
         return True
     
     def translate_action_gui(self):
-        original_content = self.original_text_area.get("1.0", tk.END).strip()
+        # 위젯 내용을 꺼내지 않고 모델의 줄 시퀀스를 그대로 번역 (큰 파일은 메모리 매핑 줄 보기 그대로)
+        self.original_pane.sync_to_model()
         if not self.api_key:
             messagebox.showwarning("API 키 필요", "API 키를 입력하고 저장 버튼을 눌러주세요.")
             return
-        if not original_content:
+        if self.original_pane.model.is_blank():
             messagebox.showwarning("입력 필요", "번역할 텍스트를 입력하거나 파일을 불러오세요.")
             return
+        original_content = self.original_pane.model.snapshot()
         self.put_message_in_queue(MSG_TYPE_STATUS, "번역 시작... (스레드 준비 중)")
         chunk_size_to_use = self.current_chunk_size
         if self._start_operation_thread(self.translate_thread_target,
                                      (original_content, self.api_key, chunk_size_to_use)):
             self.put_message_in_queue(MSG_TYPE_STATUS, "번역 스레드 시작됨.")
 
+    def _open_job_journal(self, original_content, prompt_template):
+        """
+        같은 원문/모델/프롬프트의 작업 기록을 엽니다 (번역 스레드에서 호출, 큰 파일은 모든 줄을 해시하므로 GUI 스레드를 막지 않도록).
+        중단된 기록이 있으면 GUI 스레드에 이어서 번역할지 묻고, 아니요면 기록을 지웁니다.
+        """
+        journal = JobJournal(JobJournal.job_id_for(original_content, self.current_selected_model_id, prompt_template))
+        if journal.exists():
+            answer, answered = {}, threading.Event()
+            self.put_message_in_queue(MSG_TYPE_ASK_RESUME, (answer, answered))
+            while not answered.wait(RESUME_ANSWER_POLL_INTERVAL):
+                if self.cancel_requested.is_set(): # 응답 전에 취소되면 기록은 그대로 두고 번역 작업에서 취소 처리
+                    return journal
+            if not answer.get("resume"):
+                journal.discard()
+        return journal
+
     def translate_thread_target(self, original_content, api_key, chunk_size):
         operation_status = None # 작업 성공/실패/취소 상태 기록
+        metrics = JobMetrics(label=self.current_selected_prompt_name)
         try:
             # 사용자 알림은 TextProcessor 내부에서 처리하므로 여기서는 제거 또는 간소화
             # model_display = AVAILABLE_MODELS.get(self.current_selected_model_id, self.current_selected_model_id)
@@ -581,33 +703,63 @@ class CoreTranslatorApp:
             prompt_template = self.prompt_manager.get_prompt_template_by_name(self.current_selected_prompt_name)
             # 프롬프트 템플릿이 없는 경우 TextProcessor 내부에서 기본값 처리 및 알림
 
+            # 같은 원문/모델/프롬프트로 중단된 작업 기록이 있으면 이어서 번역할지 확인
+            journal = self._open_job_journal(original_content, prompt_template)
+
+            # 완료된 앞부분부터 용어집을 적용해 바로 번역 창에 이어 붙임 (전체 완료를 기다리지 않음)
+            self.put_message_in_queue(MSG_TYPE_RESULT, "")
+            def on_commit(segment):
+                glossary_started = time.monotonic()
+                segment = self.glossary_manager.apply_glossary_to_text(segment)
+                metrics.add_stage_time("glossary", time.monotonic() - glossary_started)
+                self.put_message_in_queue(MSG_TYPE_RESULT_APPEND, segment)
+
             final_translation_raw = self.text_processor.translate_by_chunks(
                 original_content, api_key, chunk_size, 
                 self.cancel_requested, prompt_template,
-                model_name_override=self.current_selected_model_id # 항상 모델 ID 전달
+                model_name_override=self.current_selected_model_id, # 항상 모델 ID 전달
+                chunk_mode=self.current_chunk_mode,
+                token_budget=self.config.get(CHUNK_TOKEN_BUDGET_NAME_IN_CONFIG),
+                rate_limit_overrides=self.config.get(MODEL_RATE_LIMITS_NAME_IN_CONFIG),
+                engine=self.config.get(TRANSLATION_ENGINE_NAME_IN_CONFIG, DEFAULT_TRANSLATION_ENGINE),
+                request_format=self.config.get(REQUEST_FORMAT_NAME_IN_CONFIG, DEFAULT_REQUEST_FORMAT),
+                request_timeout=self.config.get(REQUEST_TIMEOUT_NAME_IN_CONFIG, DEFAULT_REQUEST_TIMEOUT),
+                hedge_budget=self.config.get(HEDGE_BUDGET_NAME_IN_CONFIG, DEFAULT_HEDGE_BUDGET),
+                model_fallback_overrides=self.config.get(MODEL_FALLBACK_CHAINS_NAME_IN_CONFIG),
+                on_commit=on_commit,
+                journal=journal,
+                metrics=metrics
             )
 
             if final_translation_raw == "CANCELLED_BY_TRANSLATOR": # 취소 시 특별 문자열 확인
                 operation_status = "cancelled"
-            elif final_translation_raw is not None: # None이 아니면 (성공 또는 부분 성공)
-                self.put_message_in_queue(MSG_TYPE_STATUS, "번역 결과에 용어집 적용 중...")
-                final_translation_with_glossary = self.glossary_manager.apply_glossary_to_text(
-                    final_translation_raw
-                )
-                self.put_message_in_queue(MSG_TYPE_RESULT, final_translation_with_glossary)
+            elif final_translation_raw is not None: # None이 아니면 (성공 또는 부분 성공, 결과는 on_commit으로 전달됨)
                 self.put_message_in_queue(MSG_TYPE_STATUS, "번역 및 용어집 적용 완료!") # 최종 완료 메시지
             else: # final_translation_raw가 None인 경우 (심각한 오류로 전체 번역 실패)
                 operation_status = "error"
                 # TextProcessor 내부에서 이미 오류 메시지를 큐에 넣었을 것이므로, 여기서는 상태만 업데이트
-                self.put_message_in_queue(MSG_TYPE_STATUS, "번역 작업 중 심각한 오류가 발생하여 중단되었습니다.")
+                self.put_message_in_queue(MSG_TYPE_STATUS, "번역 작업 중 심각한 오류가 발생하여 중단되었습니다. (완료된 부분은 작업 기록에 남아 다시 번역하면 이어서 진행합니다)")
         
         except Exception as e: # GUI 스레드에서 예상치 못한 예외 발생 시
             operation_status = "error"
             self.put_message_in_queue(MSG_TYPE_ERROR, f"번역 처리 스레드 외부에서 예외 발생: {e}")
         finally:
+            if metrics.status is not None: # 번역 작업이 실행된 경우에만 통계 보고서 저장
+                self._publish_job_metrics(metrics)
+            if operation_status in ("cancelled", "error"): # 번역 창에 남은 앞부분은 저장 시 경고
+                self.put_message_in_queue(MSG_TYPE_RESULT_PARTIAL)
             # 작업 완료 메시지를 큐에 넣어 GUI 스레드에서 버튼 상태 등을 복구하도록 함
             self.put_message_in_queue(MSG_TYPE_OPERATION_COMPLETE, operation_status)
 
+    def _publish_job_metrics(self, metrics):
+        """작업 통계를 보고서(JSON)로 저장하고 요약을 통계 패널로 보냅니다."""
+        report_path = None
+        try:
+            report_path = metrics.write_report()
+        except OSError as e:
+            print(f"작업 통계 보고서 저장 실패: {e}")
+        self.put_message_in_queue(MSG_TYPE_METRICS, (metrics.format_summary(), report_path))
+
     def load_file_action_gui(self):
         if self.unsaved_translation:
             if not messagebox.askokcancel("확인", "저장되지 않은 번역 내용이 있습니다. 계속 진행하시겠습니까?"):
@@ -626,11 +778,19 @@ class CoreTranslatorApp:
     def load_file_thread_target(self, filepath_from_gui):
         operation_status = None
         try:
-            _fp, content, is_csv = self.file_handler.load_file_core(self.cancel_requested, filepath_from_gui)
+            line_view = None
+            if os.path.getsize(filepath_from_gui) >= LARGE_FILE_THRESHOLD:
+                line_view = self.file_handler.open_line_view(filepath_from_gui, self.cancel_requested)
+            if line_view is not None: # 줄 보기는 합치지 않고 그대로 원문 창 모델로 사용
+                _fp, content, is_csv = filepath_from_gui, None, filepath_from_gui.lower().endswith(".csv")
+            else:
+                _fp, content, is_csv = self.file_handler.load_file_core(self.cancel_requested, filepath_from_gui)
             if self.cancel_requested.is_set():
                 operation_status = "cancelled"
+                if line_view is not None:
+                    line_view.close()
             elif _fp is not None:
-                self.put_message_in_queue(MSG_TYPE_FILE_LOAD_RESULT, (_fp, content, is_csv))
+                self.put_message_in_queue(MSG_TYPE_FILE_LOAD_RESULT, (_fp, content, is_csv, line_view))
             else:
                 operation_status = "error"
         except Exception as e:
@@ -640,10 +800,17 @@ class CoreTranslatorApp:
             self.put_message_in_queue(MSG_TYPE_OPERATION_COMPLETE, operation_status)
 
     def save_file_action_gui(self):
-        content_to_save = self.translated_text_area.get("1.0", tk.END).strip()
-        if not content_to_save:
+        content_to_save = self.translated_pane.model # 위젯이 아닌 모델에서 줄 단위로 저장
+        if content_to_save.is_blank():
             messagebox.showwarning("저장 불가", "저장할 번역된 내용이 없습니다.")
             return
+        if self.translation_partial and not messagebox.askyesno(
+                "일부만 번역됨",
+                "번역이 취소되거나 오류로 중단되어 번역 창에는 앞부분만 있습니다.\n"
+                "이대로 저장하면 원문보다 짧은 파일이 만들어집니다. 그래도 저장하시겠습니까?\n\n"
+                "(다시 번역하면 작업 기록에서 이어서 번역합니다)"):
+            self.put_message_in_queue(MSG_TYPE_STATUS, "파일 저장 취소됨.")
+            return
 
         initial_filename = "translated_output.txt"
         if self.is_csv_mode:
@@ -660,15 +827,37 @@ class CoreTranslatorApp:
 
         if self.file_handler.save_file(content_to_save, initial_filename, filepath_to_save):
             self.unsaved_translation = False
+        self._publish_profile("save")
 
     def on_closing(self):
         if self.current_operation_thread and self.current_operation_thread.is_alive():
             if messagebox.askokcancel("작업 중 종료", "진행 중인 작업이 있습니다. 정말로 종료하시겠습니까?\n(작업이 즉시 중단되지 않을 수 있습니다.)"):
                 self.request_cancel_operation()
-                self.master.after(500, self.master.destroy) 
+                self.put_message_in_queue(MSG_TYPE_STATUS, "작업이 중단되면 종료합니다...")
+                self._destroy_when_idle()
             return
         if self.unsaved_translation:
             if messagebox.askokcancel("종료 확인", "저장되지 않은 번역 내용이 있습니다. 정말로 종료하시겠습니까?"):
-                self.master.destroy()
+                self._destroy_app()
         else:
-            self.master.destroy()
\ No newline at end of file
+            self._destroy_app()
+
+    def _set_source_line_view(self, line_view):
+        """원문 줄 보기를 교체합니다 (이전 보기는 닫음)."""
+        if self.source_line_view is not None and self.source_line_view is not line_view:
+            self.source_line_view.close()
+        self.source_line_view = line_view
+
+    def _destroy_when_idle(self):
+        """작업 스레드가 끝난 뒤 종료합니다 (끝나기 전에는 원문 줄 보기와 번역 메모리를 아직 읽고 씀)."""
+        if self.current_operation_thread and self.current_operation_thread.is_alive():
+            self.master.after(CLOSE_POLL_INTERVAL_MS, self._destroy_when_idle)
+            return
+        self._destroy_app()
+
+    def _destroy_app(self):
+        self.message_pump.close()
+        self._set_source_line_view(None)
+        if self.text_processor.translation_memory is not None:
+            self.text_processor.translation_memory.close()
+        self.master.destroy()
\ No newline at end of file
@@ -0,0 +1,114 @@
+# gui/message_pump.py
+import threading
+import time
+import tkinter as tk
+from collections import deque
+
+WAKE_EVENT = "<<MessagePumpWake>>"
+FRAME_INTERVAL = 0.016   # 초. 화면 갱신은 한 프레임(약 60Hz)에 한 번까지
+FALLBACK_POLL_MS = 500   # 깨우기 이벤트를 보낼 수 없을 때(스레드 미지원 Tcl 등)를 대비한 느린 폴링
+
+
+class MessagePump:
+    """
+    작업 스레드 -> Tk 메인 스레드 메시지 전달기.
+    - coalesce_types의 메시지(진행률/상태 등)는 종류별로 마지막 값만 남겨 한 번만 화면에 반영합니다.
+    - batch_type 메시지(오류)는 모아 두었다가 on_batch(메시지 목록)로 한 번에 전달합니다.
+      on_batch가 대화상자를 띄운 동안 도착한 오류는 다음 묶음으로 넘어갑니다.
+    - 나머지 메시지는 도착 순서대로 dispatch(msg_type, data)로 전달합니다.
+    고정 주기로 큐를 확인하지 않고, 메시지가 들어올 때 가상 이벤트로 메인 루프를 깨웁니다.
+    """
+    def __init__(self, widget, dispatch, coalesce_types=(), batch_type=None, on_batch=None):
+        self.widget = widget
+        self.dispatch = dispatch
+        self.coalesce_types = frozenset(coalesce_types)
+        self.batch_type = batch_type
+        self.on_batch = on_batch
+        self._lock = threading.Lock()
+        self._latest = {}        # 합쳐지는 메시지: 종류 -> 마지막 값
+        self._ordered = deque()  # 순서가 중요한 메시지 (결과, 파일 로드, 작업 완료 등)
+        self._batched = []       # 모아서 한 번에 보여줄 메시지 (오류)
+        self._wake_pending = False
+        self._in_batch_callback = False
+        self._last_drain = 0.0
+        self._fallback_id = None
+        widget.bind(WAKE_EVENT, self._on_wake, add="+")
+        self._schedule_fallback()
+
+    def post(self, msg_type, data=None):
+        """어느 스레드에서나 호출할 수 있습니다."""
+        with self._lock:
+            if msg_type in self.coalesce_types:
+                self._latest[msg_type] = data
+            elif msg_type == self.batch_type:
+                self._batched.append(data)
+            else:
+                self._ordered.append((msg_type, data))
+            if self._wake_pending: # 이미 깨우기 요청됨: 다음 처리 때 함께 반영
+                return
+            self._wake_pending = True
+        try:
+            self.widget.event_generate(WAKE_EVENT, when="tail")
+        except (tk.TclError, RuntimeError):
+            pass # 폴백 폴링이 처리함
+
+    def _on_wake(self, _event=None):
+        wait = FRAME_INTERVAL - (time.monotonic() - self._last_drain)
+        if wait > 0: # 직전 처리 후 한 프레임이 지나지 않았으면 남은 시간 뒤에 처리
+            self.widget.after(max(1, int(wait * 1000)), self.drain)
+        else:
+            self.drain()
+
+    def _has_pending(self):
+        with self._lock:
+            return bool(self._latest or self._ordered or (self._batched and not self._in_batch_callback))
+
+    def drain(self):
+        """쌓인 메시지를 한 번에 처리합니다 (메인 스레드에서만 호출)."""
+        with self._lock:
+            latest, self._latest = self._latest, {}
+            ordered, self._ordered = self._ordered, deque()
+            self._wake_pending = False
+        self._last_drain = time.monotonic()
+        # 합쳐진 진행률/상태를 먼저 반영하고, 작업 완료 같은 순서 메시지가 그 뒤에 최종 상태를 정함
+        for msg_type, data in latest.items():
+            self._dispatch_safely(msg_type, data)
+        for msg_type, data in ordered:
+            self._dispatch_safely(msg_type, data)
+        self._deliver_batches()
+
+    def _dispatch_safely(self, msg_type, data):
+        try:
+            self.dispatch(msg_type, data)
+        except Exception as e: # 메시지 하나의 오류로 나머지 메시지를 잃지 않도록 함
+            print(f"메시지 처리 중 오류 ({msg_type}): {e}")
+
+    def _deliver_batches(self):
+        if self._in_batch_callback or self.on_batch is None: # 대화상자가 열려 있는 동안 다시 들어온 경우
+            return
+        self._in_batch_callback = True
+        try:
+            while True:
+                with self._lock:
+                    batch, self._batched = self._batched, []
+                if not batch:
+                    break
+                self.on_batch(batch)
+        finally:
+            self._in_batch_callback = False
+
+    def _schedule_fallback(self):
+        self._fallback_id = self.widget.after(FALLBACK_POLL_MS, self._fallback_poll)
+
+    def _fallback_poll(self):
+        if self._has_pending():
+            self.drain()
+        self._schedule_fallback()
+
+    def close(self):
+        if self._fallback_id is not None:
+            try:
+                self.widget.after_cancel(self._fallback_id)
+            except tk.TclError:
+                pass
+            self._fallback_id = None
@@ -0,0 +1,206 @@
+# gui/virtual_text.py
+import tkinter as tk
+import tkinter.font as tkfont
+
+RENDER_OVERSCAN_LINES = 2 # 보이는 줄 수보다 조금 더 그려서 부분적으로 보이는 줄도 표시
+
+
+class LineModel:
+    """
+    텍스트 창의 내용을 줄 단위로 보관하는 모델 (각 줄은 줄바꿈 문자 포함).
+    기본 줄 시퀀스(리스트 또는 메모리 매핑 줄 보기)는 복사하지 않고 그대로 사용하다가,
+    처음 편집될 때만 리스트로 바꿉니다. snapshot()으로 넘긴 시퀀스는 이후 편집에 영향받지 않습니다.
+    """
+    def __init__(self, lines=None):
+        self._lines = lines if lines is not None else []
+        self._owned = isinstance(self._lines, list) # True이면 제자리 수정 가능
+        self.modified = False
+        self.listeners = [] # 내용이 바뀌면 호출되는 콜백 (인자 없음)
+
+    def _notify(self):
+        for listener in self.listeners:
+            listener()
+
+    def set_lines(self, lines):
+        self._lines = lines if lines is not None else []
+        self._owned = False
+        self.modified = False
+        self._notify()
+
+    def set_text(self, text):
+        self.set_lines(text.splitlines(keepends=True))
+
+    def __len__(self):
+        return len(self._lines)
+
+    def __getitem__(self, index):
+        return self._lines[index]
+
+    def __iter__(self):
+        return iter(self._lines)
+
+    def snapshot(self):
+        """현재 줄 시퀀스를 반환합니다 (번역 스레드 등에 넘겨도 이후 편집은 복사본에 적용됨)."""
+        self._owned = False
+        return self._lines
+
+    def _writable_lines(self):
+        if not self._owned:
+            self._lines = list(self._lines)
+            self._owned = True
+        return self._lines
+
+    def replace_range(self, start, end, new_lines):
+        """[start, end) 줄을 new_lines로 바꿉니다 (편집 반영)."""
+        self._writable_lines()[start:end] = new_lines
+        self.modified = True
+        self._notify()
+
+    def append_text(self, text):
+        """텍스트를 끝에 이어 붙입니다. 마지막 줄이 줄바꿈 없이 끝나 있으면 그 줄에 이어집니다."""
+        if not text:
+            return
+        new_lines = text.splitlines(keepends=True)
+        lines = self._writable_lines()
+        if lines and not lines[-1].endswith(("\n", "\r")):
+            lines[-1] += new_lines.pop(0)
+        lines.extend(new_lines)
+        self._notify()
+
+    def is_blank(self):
+        return not any(line.strip() for line in self._lines)
+
+
+class VirtualTextPane(tk.Frame):
+    """
+    LineModel의 보이는 구간만 Text 위젯에 그리는 가상화된 텍스트 창.
+    스크롤할 때 이전 구간의 편집 내용을 모델에 반영하고(페이지 아웃) 새 구간을 그립니다(페이지 인).
+    link_scrolling으로 연결한 창끼리는 같은 줄 번호에서 함께 스크롤됩니다 (원문/번역 줄 정렬).
+    """
+    def __init__(self, master, model=None, readonly=False, font=None, bg=None, fg=None, **frame_options):
+        super().__init__(master, **frame_options)
+        self.model = model or LineModel()
+        self.readonly = readonly
+        self.top = 0               # 창 맨 위에 보이는 모델 줄 번호
+        self._rendered_count = 0   # 현재 Text 위젯에 그려진 모델 줄 수
+        self._linked_panes = []
+
+        self.text = tk.Text(self, wrap=tk.NONE, font=font, bg=bg, fg=fg, relief=tk.FLAT, borderwidth=0,
+                            undo=False, height=10)
+        self.v_scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.h_scrollbar = tk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.text.xview)
+        self.text.configure(xscrollcommand=self.h_scrollbar.set)
+        self.v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.text.pack(side=tk.LEFT, expand=True, fill=tk.BOTH)
+        self._line_height = tkfont.Font(font=self.text.cget("font")).metrics("linespace") or 16
+
+        self.text.bind("<Configure>", self._on_configure)
+        self.text.bind("<MouseWheel>", self._on_mousewheel)
+        self.text.bind("<Button-4>", lambda _event: self._scroll_by(-3))
+        self.text.bind("<Button-5>", lambda _event: self._scroll_by(3))
+        self.text.bind("<Prior>", lambda _event: self._scroll_by(-self._visible_line_count()))
+        self.text.bind("<Next>", lambda _event: self._scroll_by(self._visible_line_count()))
+        self.text.bind("<Up>", self._on_arrow_up)
+        self.text.bind("<Down>", self._on_arrow_down)
+        self.text.bind("<Control-Home>", lambda _event: self.scroll_to(0))
+        self.text.bind("<Control-End>", lambda _event: self.scroll_to(len(self.model)))
+        if readonly:
+            self.text.config(state=tk.DISABLED)
+        self.model.listeners.append(self._on_model_changed)
+
+    # --- 스크롤 ---
+    def _visible_line_count(self):
+        return max(1, self.text.winfo_height() // self._line_height)
+
+    def _max_top(self):
+        return max(0, len(self.model) - self._visible_line_count())
+
+    def scroll_to(self, top, propagate=True):
+        top = max(0, min(int(top), self._max_top()))
+        if top != self.top:
+            self._page_out()
+            self.top = top
+            self.render()
+        if propagate:
+            for pane in self._linked_panes:
+                pane.scroll_to(top, propagate=False)
+        return "break"
+
+    def _scroll_by(self, delta_lines):
+        return self.scroll_to(self.top + delta_lines)
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.scroll_to(float(args[0]) * len(self.model))
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1]
+            self._scroll_by(amount * (self._visible_line_count() if unit == "pages" else 1))
+
+    def _on_mousewheel(self, event):
+        return self._scroll_by(-3 if event.delta > 0 else 3)
+
+    def _on_arrow_up(self, _event):
+        if int(self.text.index(tk.INSERT).split(".")[0]) == 1 and self.top > 0:
+            return self._scroll_by(-1)
+        return None
+
+    def _on_arrow_down(self, _event):
+        if int(self.text.index(tk.INSERT).split(".")[0]) >= self._visible_line_count() and self.top < self._max_top():
+            return self._scroll_by(1)
+        return None
+
+    def link_scrolling(self, other_pane):
+        """두 창이 같은 줄 번호로 함께 스크롤되도록 연결합니다."""
+        if other_pane not in self._linked_panes:
+            self._linked_panes.append(other_pane)
+        if self not in other_pane._linked_panes:
+            other_pane._linked_panes.append(self)
+
+    # --- 그리기 / 편집 반영 ---
+    def _page_out(self):
+        """보이는 구간에서 사용자가 편집한 내용을 모델에 반영합니다."""
+        if self.readonly or not self.text.edit_modified():
+            return
+        edited = self.text.get("1.0", "end-1c")
+        self.text.edit_modified(False)
+        self.model.listeners.remove(self._on_model_changed) # 자기 편집으로 다시 그리지 않음
+        try:
+            self.model.replace_range(self.top, self.top + self._rendered_count, edited.splitlines(keepends=True))
+        finally:
+            self.model.listeners.append(self._on_model_changed)
+
+    def render(self):
+        """모델의 [top, top + 보이는 줄 수) 구간을 Text 위젯에 그립니다."""
+        self.top = min(self.top, self._max_top())
+        end = min(len(self.model), self.top + self._visible_line_count() + RENDER_OVERSCAN_LINES)
+        insert_index = self.text.index(tk.INSERT)
+        if self.readonly:
+            self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", "".join(self.model[i] for i in range(self.top, end)))
+        self.text.mark_set(tk.INSERT, insert_index)
+        if self.readonly:
+            self.text.config(state=tk.DISABLED)
+        self.text.edit_modified(False)
+        self._rendered_count = end - self.top
+        total = len(self.model)
+        if total:
+            self.v_scrollbar.set(self.top / total, min(1.0, (self.top + self._visible_line_count()) / total))
+        else:
+            self.v_scrollbar.set(0.0, 1.0)
+
+    def _on_configure(self, _event):
+        self._page_out() # 창 크기가 바뀌어 다시 그리기 전에 편집 내용 보존
+        self.render()
+
+    def _on_model_changed(self):
+        self.render()
+
+    def sync_to_model(self):
+        """저장/번역 전에 보이는 구간의 편집 내용을 모델에 반영합니다."""
+        self._page_out()
+
+    def set_readonly(self, readonly):
+        self.readonly = readonly
+        self.text.config(state=tk.DISABLED if readonly else tk.NORMAL)